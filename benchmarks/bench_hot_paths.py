@@ -0,0 +1,197 @@
+"""Benchmark the hot paths of the ingest pipeline.
+
+Covers ServiceEnvelope parsing, try_encrypt_envelope, convert_envelope_to_json
+per packet kind, Coordinator._async_process_message and
+Platform.async_put_data with 1, 100 and 1000 stored nodes. Inputs come from
+the synthetic traffic generator. Each benchmark runs for a fixed time a few
+times; the best mean time per operation is reported.
+
+Usage: python benchmarks/bench_hot_paths.py [--save results.json]
+       [--filter convert] [--min-time 0.2] [--repeats 5]
+
+Compare results with a stored baseline with benchmarks/compare.py.
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+from traffic import DEFAULT_MIX, TrafficGenerator  # noqa: E402
+
+from google.protobuf import __version__ as protobuf_version  # noqa: E402
+from google.protobuf.internal import api_implementation  # noqa: E402
+
+from custom_components.mtastic_mqtt.proto import (  # noqa: E402
+    convert_envelope_to_json,
+    try_encrypt_envelope,
+)
+from custom_components.mtastic_mqtt.protobuf import mqtt_pb2  # noqa: E402
+
+STORED_NODES = (1, 100, 1000)
+
+
+def _measure(func: Callable[[], Any], min_time: float, repeats: int) -> float:
+    """Return the best mean time of func in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        count = 0
+        start = time.perf_counter_ns()
+        deadline = start + int(min_time * 1e9)
+        while True:
+            func()
+            count += 1
+            now = time.perf_counter_ns()
+            if now >= deadline:
+                break
+        best = min(best, (now - start) / count)
+    return best
+
+
+async def _async_measure(
+    func: Callable[[], Awaitable[Any]], min_time: float, repeats: int
+) -> float:
+    """Return the best mean time of an async function in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        count = 0
+        start = time.perf_counter_ns()
+        deadline = start + int(min_time * 1e9)
+        while True:
+            await func()
+            count += 1
+            now = time.perf_counter_ns()
+            if now >= deadline:
+                break
+        best = min(best, (now - start) / count)
+    return best
+
+
+def _sample(kind: str, key: str | None) -> bytes:
+    """Return a single-uplink envelope of a packet kind."""
+    generator = TrafficGenerator(
+        nodes=1, gateways=1, mix={kind: 1.0}, key=key, duplicates=0, relays=0
+    )
+    return generator.packet()[0].payload
+
+
+def _parsed(payload: bytes) -> mqtt_pb2.ServiceEnvelope:
+    envelope = mqtt_pb2.ServiceEnvelope()
+    envelope.ParseFromString(payload)
+    return envelope
+
+
+def _sync_benchmarks() -> dict[str, Callable[[], Any]]:
+    """Return benchmarks that don't need Home Assistant."""
+    benchmarks: dict[str, Callable[[], Any]] = {}
+    for kind in DEFAULT_MIX:
+        plain = _sample(kind, None)
+        benchmarks[f"parse[{kind}]"] = lambda plain=plain: mqtt_pb2.ServiceEnvelope().ParseFromString(plain)
+        envelope = _parsed(plain)
+        benchmarks[f"convert[{kind}]"] = lambda envelope=envelope: convert_envelope_to_json(envelope)
+
+    for name, key in (("default", "AQ=="), ("custom", "dGhpc2lzYWN1c3RvbWtleQ==")):
+        envelope = _parsed(_sample("telemetry", key))
+        encrypted = envelope.packet.encrypted
+
+        def _decrypt(envelope=envelope, encrypted=encrypted, key=key) -> None:
+            # Assigning the ciphertext clears the decoded payload again
+            envelope.packet.encrypted = encrypted
+            try_encrypt_envelope(envelope, key)
+
+        benchmarks[f"decrypt[{name}_key]"] = _decrypt
+    return benchmarks
+
+
+async def _async_run_hass_benchmarks(
+    results: dict[str, float], selected: Callable[[str], bool], min_time: float, repeats: int
+) -> None:
+    """Run benchmarks of the coordinator and platform storage."""
+    harness.install(harness.InMemoryMqtt())
+    hass = await harness.async_create_hass()
+    platform_ = hass.data[harness.DOMAIN]
+
+    envelope = _parsed(_sample("telemetry", None))
+    node = getattr(envelope.packet, "from")
+    coordinator = await harness.async_add_coordinator(hass, node, "msh/#")
+    for kind in ("telemetry", "nodeinfo", "text"):
+        name = f"process_message[{kind}]"
+        if selected(name):
+            envelope = _parsed(_sample(kind, None))
+            setattr(envelope.packet, "from", node)
+            obj = convert_envelope_to_json(envelope)
+            results[name] = await _async_measure(
+                lambda obj=obj: coordinator._async_process_message(obj), min_time, repeats
+            )
+
+    data = dict(coordinator.data)
+    for count in STORED_NODES:
+        name = f"put_data[{count}_nodes]"
+        if not selected(name):
+            continue
+        platform_._storage_data = {f"entry_{index}": dict(data) for index in range(count)}
+        results[name] = await _async_measure(
+            lambda: platform_.async_put_data("entry_0", data), min_time, repeats
+        )
+
+    await coordinator.async_unload()
+    await hass.async_stop(force=True)
+
+
+def run(name_filter: str = "", min_time: float = 0.2, repeats: int = 5) -> dict[str, Any]:
+    """Run all benchmarks matching a filter, return results and environment."""
+    def selected(name: str) -> bool:
+        return name_filter in name
+
+    results: dict[str, float] = {}
+    for name, func in _sync_benchmarks().items():
+        if selected(name):
+            results[name] = _measure(func, min_time, repeats)
+    asyncio.run(_async_run_hass_benchmarks(results, selected, min_time, repeats))
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "protobuf": protobuf_version,
+            "protobuf_backend": api_implementation.Type(),
+        },
+        "results": {name: round(ns, 1) for name, ns in results.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", help="write results to a JSON file")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    report = run(args.filter, args.min_time, args.repeats)
+    environment = report["environment"]
+    print(
+        f"Python {environment['python']} ({environment['machine']}), "
+        f"protobuf {environment['protobuf']} ({environment['protobuf_backend']})"
+    )
+    for name, ns in report["results"].items():
+        print(f"{name:<32}{ns / 1000:>12.2f} us")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        print(f"Saved to {args.save}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure the import time of the integration.
+
+Imports the Home Assistant modules the integration builds on first, then
+the integration itself under python -X importtime in a fresh interpreter,
+and reports the integration's cumulative import time, the slowest modules
+it pulls in and the protobuf backend. With --max-ms it exits with status 1
+when the import takes longer, so regressions are visible in CI.
+
+Usage: python benchmarks/bench_import.py [--runs 5] [--top 15] [--max-ms 100]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.mtastic_mqtt"
+
+# Modules Home Assistant has loaded before any custom integration
+_PRELOAD = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.components.mqtt",
+)
+
+_SCRIPT = (
+    "import sys\n"
+    "{preload}\n"
+    "sys.stderr.write('--- integration ---\\n')\n"
+    "import {package}\n"
+    "from {package}.proto import protobuf_info\n"
+    "print(protobuf_info()['backend'], protobuf_info()['version'])\n"
+)
+
+
+def _run_once() -> tuple[float, list[tuple[int, int, str]], str]:
+    """Import the integration once, return cumulative us, module times and backend."""
+    script = _SCRIPT.format(
+        preload="\n".join(f"import {module}" for module in _PRELOAD), package=PACKAGE
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True, cwd=ROOT, check=True,
+    )
+    modules: list[tuple[int, int, str]] = []
+    seen_marker = False
+    total = 0
+    for line in result.stderr.splitlines():
+        if line.startswith("--- integration"):
+            seen_marker = True
+            continue
+        if not seen_marker or not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+        if name.strip() == PACKAGE:
+            total = int(cumulative_us)
+    return total, modules, result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules shown")
+    parser.add_argument("--max-ms", type=float, help="fail if the median import is slower")
+    args = parser.parse_args()
+
+    totals = []
+    modules: list[tuple[int, int, str]] = []
+    runtime = ""
+    for _ in range(args.runs):
+        total, modules, runtime = _run_once()
+        totals.append(total / 1000)
+    backend, version = runtime.split()
+    median = statistics.median(totals)
+
+    print(f"protobuf {version}, {backend} backend")
+    print(f"import {PACKAGE}: median {median:.1f} ms, min {min(totals):.1f} ms "
+          f"over {args.runs} runs")
+    print(f"{'self ms':>9}{'cumulative ms':>15}  module (last run)")
+    for self_us, cumulative_us, name in sorted(modules, key=lambda item: -item[0])[:args.top]:
+        print(f"{self_us / 1000:>9.1f}{cumulative_us / 1000:>15.1f}  {name}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"Import takes {median:.1f} ms, more than {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
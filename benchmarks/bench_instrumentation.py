@@ -0,0 +1,190 @@
+"""Measure the overhead of pipeline instrumentation on the real callback.
+
+Feeds the same synthetic uplinks (with copies from several gateways) to
+Coordinator._async_on_pb_message and to a bare copy of its work, with
+the same call layering, callables and debug logging but without the
+instrumentation: counters, sampled stage timers, the flight recorder,
+the watchdog and the profiler hooks. The instrumented callback runs with
+the default configuration and with the watchdog and the flight recorder
+turned off. Bare and instrumented passes alternate on one Home Assistant
+instance with in-memory storage, forgetting seen packets before each pass
+so both fold the same copies; the overhead is the median difference of
+the paired passes, which share the noise of the moment.
+
+Reports the cost per uplink with dispatch stubbed out (parse, fold,
+decrypt and convert; the stub only records copies for folding) and with
+full dispatch to indexes and coordinators. Hooks inside dispatch (the
+sampled state update timer, the storage save timer and the watchdog of
+entity writes) run in both variants of a configuration.
+
+Usage: python benchmarks/bench_instrumentation.py [--packets 1000]
+       [--nodes 50] [--coordinators 10] [--rounds 30]
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import argparse
+import asyncio
+import gc
+import logging
+import statistics
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+from traffic import TrafficGenerator  # noqa: E402
+
+from google.protobuf.message import DecodeError  # noqa: E402
+from homeassistant.components.mqtt.models import ReceiveMessage  # noqa: E402
+
+from custom_components.mtastic_mqtt.constants import DOMAIN  # noqa: E402
+from custom_components.mtastic_mqtt.coordinator import (  # noqa: E402
+    Coordinator,
+    Platform,
+    _convert_envelope,
+    _parse_envelope,
+)
+
+_LOGGER = logging.getLogger("custom_components.mtastic_mqtt.coordinator")
+
+TOPIC = "msh/EU_868/2/e/LongFast/#"
+
+
+async def _async_bare_ingest(
+    platform: Platform,
+    message: ReceiveMessage,
+    parse: Callable[[ReceiveMessage], tuple[Any, Any]],
+    convert: Callable[[Any, Any], dict[str, Any] | None],
+    decrypt: Callable[[Any], None] | None = None,
+) -> None:
+    """Do the work of Platform.async_ingest without its instrumentation."""
+    try:
+        try:
+            packet, env = parse(message)
+        except (DecodeError, ValueError):
+            return
+        if platform.fold_duplicate(env):
+            _LOGGER.debug("Folded duplicate packet %d from %s", env.packet.id, env.gateway_id)
+            return
+        if decrypt is not None and env.packet.HasField("encrypted"):
+            try:
+                decrypt(env)
+                _LOGGER.debug("Decrypted packet successfully")
+            except Exception:  # noqa: BLE001
+                return
+        if (obj := convert(packet, env)) is None:
+            return
+        _LOGGER.debug("Converted packet: %s", obj)
+        await platform.async_dispatch(env, obj)
+    except Exception:  # noqa: BLE001
+        return
+
+
+async def _async_bare(platform: Platform, coordinator: Coordinator, message: ReceiveMessage) -> None:
+    """Stand in for the protobuf callback, which delegates to the ingest wrapper."""
+    _LOGGER.debug("Received protobuf message on topic %s", message.topic)
+    await _async_bare_ingest(
+        platform, message, _parse_envelope, _convert_envelope, coordinator._decrypt
+    )
+
+
+def _record_only(platform: Platform) -> Any:
+    """Return a stand-in for dispatch that only records copies for folding."""
+
+    async def _async_dispatch(env: Any, _obj: Any) -> None:
+        platform._record_reception(env)
+
+    return _async_dispatch
+
+
+# Configurations of the instrumented callback
+CONFIGS = (
+    ("defaults", {}),
+    ("watchdog and flight recorder off", {"watchdog": False, "flight_recorder": False}),
+)
+
+
+async def _async_time(
+    platform: Platform, coordinator: Coordinator, messages: list[ReceiveMessage], instrumented: bool
+) -> float:
+    """Return the mean time per uplink of one pass in nanoseconds."""
+    # Forget seen packets, so every pass folds the same copies
+    platform._reception.clear()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        if instrumented:
+            for message in messages:
+                await coordinator._async_on_pb_message(message)
+        else:
+            for message in messages:
+                await _async_bare(platform, coordinator, message)
+        return (time.perf_counter_ns() - start) / len(messages)
+    finally:
+        gc.enable()
+
+
+async def async_run(
+    messages: list[ReceiveMessage],
+    nodes: list[int],
+    config: dict[str, Any],
+    dispatch: bool,
+    rounds: int,
+) -> tuple[list[float], list[float]]:
+    """Return times per uplink of bare and instrumented passes, in pairs."""
+    harness.install(harness.InMemoryMqtt())
+    hass = await harness.async_create_hass(config=config)
+    platform: Platform = hass.data[DOMAIN]
+    coordinators = [await harness.async_add_coordinator(hass, node, TOPIC) for node in nodes]
+    coordinator = coordinators[0]
+    if not dispatch:
+        platform.async_dispatch = _record_only(platform)  # type: ignore[method-assign]
+
+    bare: list[float] = []
+    instrumented: list[float] = []
+    # Alternate which variant runs first to even out drift
+    for index in range(rounds):
+        for variant in (False, True) if index % 2 else (True, False):
+            result = await _async_time(platform, coordinator, messages, variant)
+            (instrumented if variant else bare).append(result)
+    await hass.async_stop(force=True)
+    return bare, instrumented
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packets", type=int, default=1000)
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--coordinators", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    harness.install_memory_storage()
+
+    generator = TrafficGenerator(nodes=args.nodes)
+    messages = [
+        ReceiveMessage(record.topic, record.payload, 0, False, TOPIC, record.timestamp)
+        for record in generator.records(args.packets)
+    ]
+    nodes = generator.nodes[: args.coordinators]
+    print(f"uplinks: {len(messages)}, {args.rounds} paired rounds")
+
+    for dispatch in (False, True):
+        print("with dispatch:" if dispatch else "dispatch stubbed:")
+        for name, config in CONFIGS:
+            bare, instrumented = asyncio.run(
+                async_run(messages, nodes, config, dispatch, args.rounds)
+            )
+            # Median of paired differences, rounds share the noise of the moment
+            overhead = statistics.median(i - b for i, b in zip(instrumented, bare))
+            base = statistics.median(bare)
+            print(f"  {name}:")
+            print(f"    bare:         median {base:8.0f} ns/uplink, min {min(bare):8.0f}")
+            print(f"    instrumented: median {statistics.median(instrumented):8.0f} ns/uplink, "
+                  f"min {min(instrumented):8.0f}")
+            print(f"    overhead:     {overhead:8.0f} ns/uplink ({overhead / base:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Compare ingestion of JSON topic packets with protobuf packets.
+
+Generates synthetic traffic, renders every uplink the way the firmware's
+JSON output does (decoded payload, msh/.../2/json/... topic) and checks
+that both paths produce the same internal dicts. Then replays both
+captures through coordinators like benchmarks/replay.py and reports
+throughput and stage latencies, plus the decode time of the JSON payloads
+with the stdlib json module against orjson (homeassistant.util.json).
+
+Usage: python benchmarks/bench_json.py [--packets 5000] [--nodes 50]
+       [--coordinators 10]
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+from replay import async_replay  # noqa: E402
+from traffic import TrafficGenerator  # noqa: E402
+
+from homeassistant.util.json import json_loads  # noqa: E402
+
+from custom_components.mtastic_mqtt.capture import CaptureRecord  # noqa: E402
+from custom_components.mtastic_mqtt.meshjson import (  # noqa: E402
+    convert_json_packet,
+    parse_json_packet,
+)
+from custom_components.mtastic_mqtt.proto import (  # noqa: E402
+    convert_envelope_to_json,
+    try_encrypt_envelope,
+)
+from custom_components.mtastic_mqtt.protobuf import (  # noqa: E402
+    mesh_pb2,
+    mqtt_pb2,
+    portnums_pb2,
+    telemetry_pb2,
+)
+
+PB_TOPIC = "msh/EU_868/2/e/LongFast/#"
+JSON_TOPIC = "msh/EU_868/2/json/LongFast/#"
+
+
+def _fields(message: Any) -> dict[str, Any]:
+    return {field.name: value for field, value in message.ListFields()}
+
+
+def _json_payload(data: mesh_pb2.Data) -> tuple[str, Any] | None:
+    """Return type and payload of the JSON output of a decoded packet."""
+    portnum = data.portnum
+    if portnum == portnums_pb2.TEXT_MESSAGE_APP:
+        return "text", {"text": data.payload.decode("utf-8")}
+    if portnum == portnums_pb2.POSITION_APP:
+        return "position", _fields(mesh_pb2.Position.FromString(data.payload))
+    if portnum == portnums_pb2.TELEMETRY_APP:
+        telemetry = telemetry_pb2.Telemetry.FromString(data.payload)
+        variant = telemetry.WhichOneof("variant")
+        return "telemetry", {"time": telemetry.time, **_fields(getattr(telemetry, variant))}
+    if portnum == portnums_pb2.NODEINFO_APP:
+        user = mesh_pb2.User.FromString(data.payload)
+        return "nodeinfo", {
+            "id": user.id,
+            "longname": user.long_name,
+            "shortname": user.short_name,
+            "hardware": user.hw_model,
+        }
+    if portnum == portnums_pb2.NEIGHBORINFO_APP:
+        info = mesh_pb2.NeighborInfo.FromString(data.payload)
+        return "neighborinfo", {
+            "node_id": info.node_id,
+            "node_broadcast_interval_secs": info.node_broadcast_interval_secs,
+            "neighbors": [{"node_id": n.node_id, "snr": n.snr} for n in info.neighbors],
+        }
+    return None
+
+
+def to_json_record(record: CaptureRecord, key: str) -> tuple[CaptureRecord, mqtt_pb2.ServiceEnvelope]:
+    """Render an uplink like the firmware's JSON output, return it and the decoded envelope."""
+    envelope = mqtt_pb2.ServiceEnvelope.FromString(record.payload)
+    if envelope.packet.HasField("encrypted"):
+        try_encrypt_envelope(envelope, key)
+    packet = envelope.packet
+    type_, payload = _json_payload(packet.decoded)
+    document = {
+        "channel": packet.channel,
+        "from": getattr(packet, "from"),
+        "id": packet.id,
+        "payload": payload,
+        "sender": envelope.gateway_id,
+        "timestamp": packet.rx_time,
+        "to": packet.to,
+        "type": type_,
+        "rssi": packet.rx_rssi,
+        "snr": packet.rx_snr,
+    }
+    if packet.hop_start and packet.hop_limit <= packet.hop_start:
+        document["hop_start"] = packet.hop_start
+        document["hops_away"] = packet.hop_start - packet.hop_limit
+    topic = record.topic.replace("/2/e/", "/2/json/").replace("/2/c/", "/2/json/")
+    return CaptureRecord(record.timestamp, topic, json.dumps(document).encode("utf-8")), envelope
+
+
+def _decode_time(payloads: list[bytes], loads: Any, repeats: int = 5) -> float:
+    """Return the best mean decode time per payload in microseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for payload in payloads:
+            loads(payload)
+        best = min(best, (time.perf_counter_ns() - start) / len(payloads))
+    return best / 1000
+
+
+def _print_replay(name: str, report: dict[str, Any]) -> None:
+    print(f"{name}: {report['throughput_msg_s']} msg/s, {report['elapsed_s']} s")
+    print("  " + ", ".join(f"{k}={v}" for k, v in report["counters"].items()))
+    for stage, item in report["stages"].items():
+        print(f"  {stage:<14}mean {item['mean_ms']:.4f} ms  p95 {item['p95_ms']:.4f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packets", type=int, default=5000)
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--coordinators", type=int, default=10)
+    parser.add_argument("--key", default="AQ==")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    generator = TrafficGenerator(nodes=args.nodes, key=args.key)
+    records = list(generator.records(args.packets))
+    json_records = []
+    mismatches = 0
+    for record in records:
+        json_record, envelope = to_json_record(record, args.key)
+        json_records.append(json_record)
+        packet, header = parse_json_packet(json_record.payload)
+        if convert_json_packet(packet, header) != convert_envelope_to_json(envelope):
+            mismatches += 1
+    print(f"records:      {len(records)}")
+    print(f"mismatches:   {mismatches}")
+
+    payloads = [record.payload for record in json_records]
+    print(f"json.loads:   {_decode_time(payloads, json.loads):.2f} us/payload")
+    print(f"orjson:       {_decode_time(payloads, json_loads):.2f} us/payload")
+
+    nodes = generator.nodes[: args.coordinators]
+    _print_replay("protobuf", asyncio.run(async_replay(records, nodes, None, PB_TOPIC, args.key)))
+    _print_replay("json", asyncio.run(async_replay(json_records, nodes, None, JSON_TOPIC, args.key)))
+
+
+if __name__ == "__main__":
+    main()
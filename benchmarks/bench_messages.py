@@ -0,0 +1,123 @@
+"""Benchmark the text message log under a burst of messages.
+
+Publishes a burst of text packets, with copies uplinked by several
+gateways, through a coordinator and counts the bus events fired against
+the messages logged. Then pages through the log with the get_messages
+service and restarts Home Assistant to load the saved segments.
+
+Usage: python benchmarks/bench_messages.py [--packets 2000] [--nodes 50]
+       [--gateways 3]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+from traffic import TrafficGenerator  # noqa: E402
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE  # noqa: E402
+from homeassistant.core import CoreState, Event  # noqa: E402
+
+from custom_components.mtastic_mqtt.constants import (  # noqa: E402
+    DOMAIN,
+    EVENT_TEXT_MESSAGES,
+    MESSAGE_EVENT_WINDOW,
+    SERVICE_GET_MESSAGES,
+)
+
+PB_TOPIC = "msh/EU_868/2/e/LongFast/#"
+
+
+async def _async_stop(hass) -> None:
+    hass.set_state(CoreState.stopping)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    await hass.async_stop(force=True)
+
+
+async def async_run(args: argparse.Namespace) -> None:
+    generator = TrafficGenerator(
+        nodes=args.nodes, gateways=args.gateways, mix={"text": 1.0}, duplicates=0.8
+    )
+    records = list(generator.records(args.packets))
+    config_dir = tempfile.mkdtemp(prefix="mtastic_bench_")
+
+    mqtt = harness.InMemoryMqtt()
+    harness.install(mqtt)
+    hass = await harness.async_create_hass(config_dir)
+    platform = hass.data[DOMAIN]
+    await harness.async_add_coordinator(hass, generator.nodes[0], PB_TOPIC)
+    events: list[int] = []
+
+    def _on_messages(event: Event) -> None:
+        events.append(len(event.data["messages"]))
+
+    hass.bus.async_listen(EVENT_TEXT_MESSAGES, _on_messages)
+
+    start = time.perf_counter()
+    for record in records:
+        await mqtt.async_publish(record.topic, record.payload)
+    await hass.async_block_till_done()
+    publish_s = time.perf_counter() - start
+    await asyncio.sleep(MESSAGE_EVENT_WINDOW + 0.5)
+    await hass.async_block_till_done()
+
+    pages = 0
+    paged = 0
+    before = None
+    start = time.perf_counter()
+    while True:
+        data = {"limit": 100} if before is None else {"limit": 100, "before": before}
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_GET_MESSAGES, data, blocking=True, return_response=True
+        )
+        pages += 1
+        paged += len(response["messages"])
+        if (before := response["next_before"]) is None:
+            break
+    page_ms = (time.perf_counter() - start) * 1000 / pages
+    logged = len(platform.messages.log)
+    await _async_stop(hass)
+
+    path = platform.messages._segments.path
+    segments = sorted(os.listdir(path))
+    size = sum(os.path.getsize(os.path.join(path, name)) for name in segments)
+
+    harness.install(harness.InMemoryMqtt())
+    start = time.perf_counter()
+    hass = await harness.async_create_hass(config_dir)
+    load_ms = (time.perf_counter() - start) * 1000
+    loaded = len(hass.data[DOMAIN].messages.log)
+    await _async_stop(hass)
+
+    print(f"{'uplinks':<24}{len(records)}")
+    print(f"{'messages':<24}{platform.messages.received}")
+    print(f"{'events':<24}{len(events)}")
+    print(f"{'event_messages':<24}{sum(events)}")
+    print(f"{'publish_s':<24}{publish_s:.2f}")
+    print(f"{'logged':<24}{logged}")
+    print(f"{'paged':<24}{paged} in {pages} pages")
+    print(f"{'page_ms':<24}{page_ms:.2f}")
+    print(f"{'segments':<24}{len(segments)}")
+    print(f"{'saved_kb':<24}{size / 1024:.0f}")
+    print(f"{'setup_ms':<24}{load_ms:.1f}")
+    print(f"{'loaded':<24}{loaded}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packets", type=int, default=2000)
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--gateways", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    main()
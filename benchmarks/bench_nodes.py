@@ -0,0 +1,91 @@
+"""Benchmark the node index at public mesh scale.
+
+Feeds packets from N distinct nodes (more than the index holds, to
+exercise eviction) into NodeIndex and reports memory per node, the cost
+of recording a packet and of resolving a name, and the size of the saved
+index with the time to build its rows and to load it again.
+
+Usage: python benchmarks/bench_nodes.py [--nodes 40000] [--packets 200000]
+       [--max-nodes 30000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import harness  # noqa: E402, F401  (sets up sys.path)
+
+from custom_components.mtastic_mqtt.constants import (  # noqa: E402
+    NODE_INDEX_MAX_AGE,
+    NODE_INDEX_MAX_NODES,
+)
+from custom_components.mtastic_mqtt.nodes import NodeIndex  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=40000)
+    parser.add_argument("--packets", type=int, default=200000)
+    parser.add_argument("--max-nodes", type=int, default=NODE_INDEX_MAX_NODES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    nodes = [0x10000000 + rng.getrandbits(28) for _ in range(args.nodes)]
+    gateways = nodes[:200]
+    packets = [(rng.choice(nodes), rng.choice(gateways)) for _ in range(args.packets)]
+    now = time.time()
+
+    def fill() -> NodeIndex:
+        index = NodeIndex(args.max_nodes, NODE_INDEX_MAX_AGE)
+        for offset, (node, gateway) in enumerate(packets):
+            index.seen(node, gateway, now + offset * 0.01)
+            index.set_names(node, f"Meshtastic {node & 0xFFFF:04x}", f"{node & 0xFFFF:04x}")
+        return index
+
+    tracemalloc.start()
+    index = fill()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    index = NodeIndex(args.max_nodes, NODE_INDEX_MAX_AGE)
+    start = time.perf_counter_ns()
+    for offset, (node, gateway) in enumerate(packets):
+        index.seen(node, gateway, now + offset * 0.01)
+    seen_ns = (time.perf_counter_ns() - start) / len(packets)
+    index = fill()
+
+    start = time.perf_counter_ns()
+    for node, _ in packets:
+        index.name(node)
+    name_ns = (time.perf_counter_ns() - start) / len(packets)
+
+    # Rows are built in the event loop, JSON is written in the executor
+    rows_ms = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        rows = index.as_rows()
+        rows_ms = min(rows_ms, (time.perf_counter() - start) * 1000)
+    saved = json.dumps({"nodes": rows}, separators=(",", ":"))
+    start = time.perf_counter()
+    loaded = NodeIndex(args.max_nodes, NODE_INDEX_MAX_AGE)
+    loaded.load_rows(json.loads(saved)["nodes"], now)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{'nodes_heard':<24}{args.nodes}")
+    print(f"{'indexed':<24}{len(index)}")
+    print(f"{'evicted':<24}{index.evicted}")
+    print(f"{'bytes_per_node':<24}{memory / len(index):.0f}")
+    print(f"{'seen_ns':<24}{seen_ns:.0f}")
+    print(f"{'name_ns':<24}{name_ns:.0f}")
+    print(f"{'saved_kb':<24}{len(saved) / 1024:.0f}")
+    print(f"{'rows_ms':<24}{rows_ms:.1f}")
+    print(f"{'load_ms':<24}{load_ms:.1f}")
+    print(f"{'loaded':<24}{len(loaded)}")
+
+
+if __name__ == "__main__":
+    main()
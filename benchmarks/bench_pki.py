@@ -0,0 +1,191 @@
+"""Benchmark PKI direct message decryption with and without cached keys.
+
+Generates X25519 keypairs for a gateway and N peers, encrypts direct
+messages from random peers to the gateway like the firmware does and
+reports the mean decryption time per packet of PkiKeyring with its shared
+key cache against deriving the shared key for every packet (cache size 0).
+A round trip through a coordinator configured with the gateway's private
+key checks that public keys are learned from node info and that a direct
+message is decoded and dispatched to the coordinator of its sender.
+
+Usage: python benchmarks/bench_pki.py [--peers 50] [--packets 2000]
+       [--cache-size 256]
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import argparse
+import asyncio
+import base64
+import logging
+import random
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+from traffic import channel_key, encrypt, encrypt_pki  # noqa: E402
+
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey  # noqa: E402
+from cryptography.hazmat.primitives.serialization import (  # noqa: E402
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+from custom_components.mtastic_mqtt.constants import DOMAIN  # noqa: E402
+from custom_components.mtastic_mqtt.pki import PkiKeyring, shared_key  # noqa: E402
+from custom_components.mtastic_mqtt.protobuf import (  # noqa: E402
+    mesh_pb2,
+    mqtt_pb2,
+    portnums_pb2,
+)
+
+GATEWAY = 0x11223344
+PEER_BASE = 0x50000000
+TOPIC = "msh/EU_868/2/e/LongFast"
+
+
+def _private_bytes(key: X25519PrivateKey) -> bytes:
+    return key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
+
+
+def _public_bytes(key: X25519PrivateKey) -> bytes:
+    return key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+
+
+def _text_data(text: str) -> bytes:
+    data = mesh_pb2.Data()
+    data.portnum = portnums_pb2.TEXT_MESSAGE_APP
+    data.payload = text.encode("utf-8")
+    return data.SerializeToString()
+
+
+def direct_message(
+    gateway_key: X25519PrivateKey, peer: int, peer_public: bytes, text: str, rng: random.Random
+) -> mqtt_pb2.ServiceEnvelope:
+    """Build a PKI encrypted direct message from a peer to the gateway."""
+    envelope = mqtt_pb2.ServiceEnvelope()
+    packet = envelope.packet
+    setattr(packet, "from", peer)
+    packet.to = GATEWAY
+    packet.id = rng.getrandbits(32)
+    packet.channel = 0
+    packet.hop_limit = packet.hop_start = 3
+    # Both sides derive the same key: the gateway's private and the peer's public key
+    key = shared_key(gateway_key, peer_public)
+    packet.encrypted = encrypt_pki(
+        _text_data(text), key, packet.id, peer, rng.getrandbits(32)
+    )
+    envelope.channel_id = "PKI"
+    envelope.gateway_id = f"!{GATEWAY:08x}"
+    return envelope
+
+
+def node_info(peer: int, public_key: bytes, packet_id: int) -> mqtt_pb2.ServiceEnvelope:
+    """Build a channel encrypted nodeinfo packet announcing a public key."""
+    user = mesh_pb2.User()
+    user.id = f"!{peer:08x}"
+    user.long_name = f"Peer {peer:08x}"
+    user.short_name = f"{peer & 0xFFFF:04x}"
+    user.public_key = public_key
+    data = mesh_pb2.Data()
+    data.portnum = portnums_pb2.NODEINFO_APP
+    data.payload = user.SerializeToString()
+
+    envelope = mqtt_pb2.ServiceEnvelope()
+    packet = envelope.packet
+    setattr(packet, "from", peer)
+    packet.to = 0xFFFFFFFF
+    packet.id = packet_id
+    packet.channel = 8
+    packet.encrypted = encrypt(data.SerializeToString(), channel_key("AQ=="), packet_id, peer)
+    envelope.channel_id = "LongFast"
+    envelope.gateway_id = f"!{GATEWAY:08x}"
+    return envelope
+
+
+def measure(
+    gateway_key: X25519PrivateKey,
+    peers: dict[int, bytes],
+    packets: list[bytes],
+    cache_size: int,
+) -> tuple[float, PkiKeyring]:
+    """Return mean decryption time per packet in microseconds."""
+    keyring = PkiKeyring(len(peers), cache_size)
+    keyring.set_private_key(GATEWAY, _private_bytes(gateway_key))
+    for peer, public_key in peers.items():
+        keyring.learn_public_key(peer, public_key)
+    envelopes = []
+    for payload in packets:
+        envelope = mqtt_pb2.ServiceEnvelope()
+        envelope.ParseFromString(payload)
+        envelopes.append(envelope)
+
+    start = time.perf_counter_ns()
+    for envelope in envelopes:
+        if not keyring.try_decrypt(envelope.packet):
+            raise RuntimeError("Direct message failed to decrypt")
+    elapsed = time.perf_counter_ns() - start
+    return elapsed / len(envelopes) / 1000, keyring
+
+
+async def async_round_trip(gateway_key: X25519PrivateKey, peer: int, peer_key: X25519PrivateKey) -> dict[str, Any]:
+    """Deliver node info and a direct message through a coordinator."""
+    mqtt = harness.InMemoryMqtt()
+    harness.install(mqtt)
+    hass = await harness.async_create_hass()
+    private_key = base64.b64encode(_private_bytes(gateway_key)).decode("ascii")
+    await harness.async_add_coordinator(hass, GATEWAY, f"{TOPIC}/#", private_key=private_key)
+    # Messages are dispatched to the coordinator of their sender
+    sender = await harness.async_add_coordinator(hass, peer, f"{TOPIC}/#")
+    rng = random.Random(1)
+    topic = f"{TOPIC}/!{GATEWAY:08x}"
+    await mqtt.async_publish(topic, node_info(peer, _public_bytes(peer_key), 1).SerializeToString())
+    message = direct_message(gateway_key, peer, _public_bytes(peer_key), "Secret hello", rng)
+    await mqtt.async_publish(topic, message.SerializeToString())
+    await hass.async_block_till_done()
+
+    pki = hass.data[DOMAIN].pki.as_dict()
+    text = (sender.data.get("text_message") or {}).get("text")
+    await hass.async_stop(force=True)
+    return {"decoded_text": text, **pki}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--peers", type=int, default=50)
+    parser.add_argument("--packets", type=int, default=2000)
+    parser.add_argument("--cache-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    rng = random.Random(args.seed)
+    gateway_key = X25519PrivateKey.generate()
+    peer_keys = {PEER_BASE + index: X25519PrivateKey.generate() for index in range(args.peers)}
+    peers = {peer: _public_bytes(key) for peer, key in peer_keys.items()}
+    nodes = list(peers)
+    packets = [
+        direct_message(gateway_key, peer, peers[peer], f"Message {index}", rng).SerializeToString()
+        for index, peer in ((index, rng.choice(nodes)) for index in range(args.packets))
+    ]
+
+    cached, keyring = measure(gateway_key, peers, packets, args.cache_size)
+    uncached, _ = measure(gateway_key, peers, packets, 0)
+    print(f"{'packets':<24}{args.packets}")
+    print(f"{'peers':<24}{args.peers}")
+    print(f"{'cached_us':<24}{cached:.1f}")
+    print(f"{'uncached_us':<24}{uncached:.1f}")
+    print(f"{'speedup':<24}{uncached / cached:.1f}x")
+    print(f"{'cache_hits':<24}{keyring.hits}")
+    print(f"{'cache_misses':<24}{keyring.misses}")
+
+    peer = nodes[0]
+    report = asyncio.run(async_round_trip(gateway_key, peer, peer_keys[peer]))
+    for key, value in report.items():
+        print(f"{key:<24}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Estimate recorder rows written per hour for a simulated mesh.
+
+Sets up one entry per node with all entities enabled, pushes an hour of
+synthetic traffic at typical Meshtastic broadcast intervals and counts
+what the recorder would store: a states row per state change, and a
+state_attributes row per distinct set of recorded attributes (the
+recorder deduplicates attributes by content and leaves out attributes an
+entity declares unrecorded). --record-all ignores those declarations to
+show their effect.
+
+Usage: python benchmarks/bench_recorder.py [--nodes 100] [--hours 1]
+       [--record-all]
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+import argparse
+import asyncio
+import json
+import logging
+
+import harness  # noqa: E402  (sets up sys.path)
+from traffic import TrafficGenerator  # noqa: E402
+
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import Event, callback  # noqa: E402
+from homeassistant.helpers import entity_registry  # noqa: E402
+
+from custom_components.mtastic_mqtt.constants import PLATFORMS  # noqa: E402
+
+# Packets per node and hour with default Meshtastic broadcast intervals:
+# position every 15 min, device telemetry every 30 min plus environment
+# telemetry on some nodes, node info every 3 h, neighbor info every 6 h
+PACKETS_PER_NODE_HOUR = {
+    "position": 4.0,
+    "telemetry": 3.0,
+    "nodeinfo": 1 / 3,
+    "neighborinfo": 1 / 6,
+    "text": 0.2,
+}
+
+
+async def async_run(nodes: int, hours: float, record_all: bool) -> dict[str, Any]:
+    """Set up entries, push traffic and count recorder rows."""
+    mqtt = harness.InMemoryMqtt()
+    harness.install(mqtt)
+    harness.install_memory_storage()
+    hass = await harness.async_create_entity_hass()
+
+    rate = nodes * sum(PACKETS_PER_NODE_HOUR.values()) / 3600
+    generator = TrafficGenerator(
+        nodes=nodes, gateways=min(3, nodes), rate=rate, mix=PACKETS_PER_NODE_HOUR
+    )
+    entries = [harness.make_entry(node, "msh/#") for node in generator.nodes]
+    for entry in entries:
+        await harness.async_setup_entry(hass, entry)
+    await hass.async_block_till_done()
+
+    # Enable entities that are disabled by default and add them again
+    registry = entity_registry.async_get(hass)
+    for registry_entry in list(registry.entities.values()):
+        if registry_entry.disabled_by is not None:
+            registry.async_update_entity(registry_entry.entity_id, disabled_by=None)
+    for entry in entries:
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.async_block_till_done()
+
+    states_rows: Counter[str] = Counter()
+    attribute_sets: set[str] = set()
+    attribute_bytes = 0
+
+    @callback
+    def _record(event: Event) -> None:
+        nonlocal attribute_bytes
+        if (state := event.data.get("new_state")) is None:
+            return
+        states_rows[state.domain] += 1
+        unrecorded: frozenset[str] = frozenset()
+        if not record_all and state.state_info:
+            unrecorded = state.state_info["unrecorded_attributes"]
+        shared = json.dumps(
+            {k: v for k, v in state.attributes.items() if k not in unrecorded},
+            sort_keys=True,
+            default=str,
+        )
+        if shared not in attribute_sets:
+            attribute_sets.add(shared)
+            attribute_bytes += len(shared)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _record, run_immediately=True)
+
+    packets = round(rate * 3600 * hours)
+    for record in generator.records(packets):
+        await mqtt.async_publish(record.topic, record.payload)
+    await hass.async_block_till_done()
+    await hass.async_stop(force=True)
+
+    return {
+        "nodes": nodes,
+        "entities": sum(1 for entry in registry.entities.values() if not entry.disabled_by),
+        "packets": packets,
+        "states_rows_per_hour": round(sum(states_rows.values()) / hours),
+        "states_rows_by_domain": dict(states_rows),
+        "attribute_rows_per_hour": round(len(attribute_sets) / hours),
+        "attribute_kb_per_hour": round(attribute_bytes / hours / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--record-all", action="store_true",
+                        help="ignore unrecorded attribute declarations")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    report = asyncio.run(async_run(args.nodes, args.hours, args.record_all))
+    for key, value in report.items():
+        print(f"{key:<26}{value}")
+
+
+if __name__ == "__main__":
+    main()
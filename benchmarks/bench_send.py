@@ -0,0 +1,137 @@
+"""Exercise the send_text scheduler against the in-memory MQTT stand-in.
+
+Configures a node on a channel, calls mtastic_mqtt.send_text at a fixed
+rate like a chatty automation and reports published packets, merged
+messages, airtime and the largest airtime sent in any interval beyond the
+duty cycle, which the budget bounds by the burst airtime plus one packet.
+A second node configured for the sender decodes the looped-back packets
+to check the encryption.
+
+Usage: python benchmarks/bench_send.py [--messages 60] [--rate 20]
+       [--channel ShortFast] [--duty-cycle 5] [--burst 0.5] [--to !11223344]
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import argparse
+import asyncio
+import logging
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+from custom_components.mtastic_mqtt.constants import DOMAIN, SERVICE_SEND_TEXT  # noqa: E402
+from custom_components.mtastic_mqtt.protobuf import mqtt_pb2  # noqa: E402
+from custom_components.mtastic_mqtt.sender import (  # noqa: E402
+    MESH_HEADER_BYTES,
+    MODEM_PRESETS,
+    airtime,
+    preset_name,
+)
+
+GATEWAY = 0x11223344
+SENDER = 0x48410001
+
+
+def _max_excess(sent: list[tuple[float, float]], duty_cycle: float) -> float:
+    """Return the most airtime sent in any interval beyond the duty cycle."""
+    excess = 0.0
+    for start in range(len(sent)):
+        total = 0.0
+        for end in range(start, len(sent)):
+            total += sent[end][1]
+            excess = max(excess, total - duty_cycle * (sent[end][0] - sent[start][0]))
+    return excess
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Send messages through the service and wait for the queue to drain."""
+    mqtt = harness.InMemoryMqtt()
+    harness.install(mqtt)
+    hass = await harness.async_create_hass(config={
+        "sender_id": f"!{SENDER:08x}",
+        "send_duty_cycle": args.duty_cycle,
+        "send_burst_airtime": args.burst,
+    })
+    platform = hass.data[DOMAIN]
+    topic = f"msh/EU_868/2/e/{args.channel}/#"
+    await harness.async_add_coordinator(hass, GATEWAY, topic)
+    receiver = await harness.async_add_coordinator(hass, SENDER, topic)
+
+    preset = MODEM_PRESETS[preset_name(args.channel)]
+    sent: list[tuple[float, float]] = []
+    publish = harness.sender_module.mqtt_client.async_publish
+
+    async def _async_publish(hass_: Any, topic_: str, payload: bytes, *rest: Any) -> None:
+        envelope = mqtt_pb2.ServiceEnvelope()
+        envelope.ParseFromString(payload)
+        sent.append((time.monotonic(), airtime(MESH_HEADER_BYTES + len(envelope.packet.encrypted), preset)))
+        await publish(hass_, topic_, payload, *rest)
+
+    harness.sender_module.mqtt_client = SimpleNamespace(async_publish=_async_publish)
+
+    max_queue = 0
+    max_delay = 0.0
+    rejected = 0
+    start = time.monotonic()
+    for index in range(args.messages):
+        try:
+            response = await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SEND_TEXT,
+                {"node_id": f"!{GATEWAY:08x}", "text": f"Message {index}", "to": args.to},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError:
+            rejected += 1
+        else:
+            max_queue = max(max_queue, response["queued"])
+            max_delay = max(max_delay, response["delay"])
+        await asyncio.sleep(1 / args.rate)
+    while platform.sender.queue_depth():
+        await asyncio.sleep(0.05)
+    await hass.async_block_till_done()
+    elapsed = time.monotonic() - start
+
+    total_airtime = sum(cost for _, cost in sent)
+    report = {
+        "preset": preset_name(args.channel),
+        "messages": platform.sender.messages,
+        "rejected": rejected,
+        "packets": platform.sender.packets,
+        "elapsed_s": round(elapsed, 2),
+        "airtime_s": round(total_airtime, 3),
+        "duty_cycle_pct": round(total_airtime / elapsed * 100, 2) if elapsed else None,
+        "max_excess_airtime_s": round(_max_excess(sent, args.duty_cycle / 100), 3),
+        "bound_s": round(args.burst + max((cost for _, cost in sent), default=0), 3),
+        "max_queue": max_queue,
+        "max_estimated_delay_s": max_delay,
+        "decoded_text": (receiver.data.get("text_message") or {}).get("text", "").splitlines()[-1:],
+    }
+    await hass.async_stop(force=True)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=60)
+    parser.add_argument("--rate", type=float, default=20.0, help="service calls per second")
+    parser.add_argument("--channel", default="ShortFast")
+    parser.add_argument("--duty-cycle", type=float, default=5.0, help="percent of airtime")
+    parser.add_argument("--burst", type=float, default=0.5, help="burst airtime in seconds")
+    parser.add_argument("--to", default="^all")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    report = asyncio.run(async_run(args))
+    for key, value in report.items():
+        print(f"{key:<24}{value}")
+
+
+if __name__ == "__main__":
+    main()
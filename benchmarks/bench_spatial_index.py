@@ -0,0 +1,101 @@
+"""Benchmark the node spatial index against a full scan.
+
+Usage: python benchmarks/bench_spatial_index.py [--nodes 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.mtastic_mqtt.geo import (  # noqa: E402
+    LAT_LON_SCALE,
+    SpatialIndex,
+    haversine_m,
+)
+
+
+def _timed(func, repeat: int) -> float:
+    """Return mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--radius", type=float, default=5000.0)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    # Nodes scattered over a ~300 x 300 km region
+    center_lat, center_lon = 52.0, 5.0
+    positions = {
+        0x10000000 + i: (
+            int((center_lat + rnd.uniform(-1.5, 1.5)) * LAT_LON_SCALE),
+            int((center_lon + rnd.uniform(-2.5, 2.5)) * LAT_LON_SCALE),
+        )
+        for i in range(args.nodes)
+    }
+
+    index = SpatialIndex()
+    start = time.perf_counter()
+    for node, (lat_i, lon_i) in positions.items():
+        index.update(node, lat_i, lon_i)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    moves = [
+        (node, lat_i + rnd.randint(-5000, 5000), lon_i + rnd.randint(-5000, 5000))
+        for node, (lat_i, lon_i) in rnd.sample(sorted(positions.items()), min(1000, args.nodes))
+    ]
+    start = time.perf_counter()
+    for node, lat_i, lon_i in moves:
+        index.update(node, lat_i, lon_i)
+        positions[node] = (lat_i, lon_i)
+    update_us = (time.perf_counter() - start) / len(moves) * 1e6
+
+    centers = [
+        (center_lat + rnd.uniform(-1.5, 1.5), center_lon + rnd.uniform(-2.5, 2.5))
+        for _ in range(args.queries)
+    ]
+
+    def full_scan(lat: float, lon: float) -> list[int]:
+        lat_i, lon_i = int(lat * LAT_LON_SCALE), int(lon * LAT_LON_SCALE)
+        return sorted(
+            node for node, (n_lat, n_lon) in positions.items()
+            if haversine_m(lat_i, lon_i, n_lat, n_lon) <= args.radius
+        )
+
+    for lat, lon in centers[:20]:
+        found = sorted(node for node, _ in index.query_radius(lat, lon, args.radius))
+        assert found == full_scan(lat, lon), "index and full scan disagree"
+
+    queries = iter(centers * 10)
+    radius_us = _timed(lambda: index.query_radius(*next(queries), args.radius), args.queries)
+    queries = iter(centers * 10)
+    scan_us = _timed(lambda: full_scan(*next(queries)), min(args.queries, 20))
+    queries = iter(centers * 10)
+    box_us = _timed(
+        lambda: (lambda c: index.query_box(c[0] - 0.05, c[0] + 0.05, c[1] - 0.08, c[1] + 0.08))(next(queries)),
+        args.queries,
+    )
+
+    print(f"nodes:            {args.nodes}")
+    print(f"build:            {build_ms:.1f} ms")
+    print(f"update:           {update_us:.2f} us/node")
+    print(f"radius query:     {radius_us:.1f} us ({args.radius:.0f} m)")
+    print(f"box query:        {box_us:.1f} us")
+    print(f"full scan:        {scan_us:.1f} us")
+    print(f"speedup:          {scan_us / radius_us:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
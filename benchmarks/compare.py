@@ -0,0 +1,80 @@
+"""Compare benchmark results with a stored baseline.
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than the tolerance (twice the tolerance for benchmarks writing storage).
+Without a results file the benchmarks are run first. Baselines are only
+comparable on the same machine and environment; record one with
+bench_hot_paths.py --save.
+
+Usage: python benchmarks/compare.py BASELINE [RESULTS] [--tolerance 0.25]
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import argparse
+import json
+import sys
+
+import bench_hot_paths
+
+# Benchmarks that write the storage file also measure disk and executor
+# latency; they get twice the tolerance
+_NOISY_PREFIXES = ("process_message[", "put_data[")
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Print a comparison table, return names of regressed benchmarks."""
+    regressions: list[str] = []
+    base_results = baseline["results"]
+    results = current["results"]
+    if baseline.get("environment") != current.get("environment"):
+        print("warning: baseline was recorded in a different environment:", file=sys.stderr)
+        print(f"  baseline: {baseline.get('environment')}", file=sys.stderr)
+        print(f"  current:  {current.get('environment')}", file=sys.stderr)
+    print(f"{'benchmark':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name in sorted(base_results.keys() | results.keys()):
+        if name not in results:
+            print(f"{name:<32}{base_results[name] / 1000:>10.2f}us{'missing':>12}")
+            continue
+        if name not in base_results:
+            print(f"{name:<32}{'new':>12}{results[name] / 1000:>10.2f}us")
+            continue
+        change = results[name] / base_results[name] - 1
+        limit = tolerance * 2 if name.startswith(_NOISY_PREFIXES) else tolerance
+        regressed = change > limit
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<32}{base_results[name] / 1000:>10.2f}us{results[name] / 1000:>10.2f}us"
+            f"{change:>+10.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("results", nargs="?")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if args.results:
+        with open(args.results, encoding="utf-8") as file:
+            current = json.load(file)
+    else:
+        current = bench_hot_paths.run()
+
+    if regressions := compare(baseline, current, args.tolerance):
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
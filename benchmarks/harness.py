@@ -0,0 +1,300 @@
+"""Shared helpers for running the integration without a broker.
+
+InMemoryMqtt stands in for homeassistant.components.mqtt.client: it keeps
+subscriptions in a list and delivers published payloads to matching
+callbacks in subscription order, passing the same payload object to every
+subscriber like the real client does. MemoryStore and ConfigEntriesStandIn
+replace the platform storage and the config entry manager, so entries can
+be set up through async_setup_entry with real entity platforms but without
+loading other integrations.
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import timedelta
+from types import MappingProxyType, SimpleNamespace
+from typing import Any
+
+import importlib
+import inspect
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.components.mqtt.models import ReceiveMessage  # noqa: E402
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry, entity, entity_registry, storage  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+from homeassistant.util import dt  # noqa: E402
+
+import custom_components.mtastic_mqtt as integration  # noqa: E402
+from custom_components.mtastic_mqtt import coordinator as coordinator_module  # noqa: E402
+from custom_components.mtastic_mqtt import sender as sender_module  # noqa: E402
+from custom_components.mtastic_mqtt.constants import DOMAIN  # noqa: E402
+from custom_components.mtastic_mqtt.coordinator import Coordinator, Platform  # noqa: E402
+from custom_components.mtastic_mqtt.stats import STAGES, LatencyHistogram  # noqa: E402
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Return whether an MQTT topic matches a filter with + and # wildcards."""
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for index, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[index]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+class InMemoryMqtt:
+    """In-memory stand-in for the MQTT client module."""
+
+    def __init__(self) -> None:
+        """Initialize without subscriptions."""
+        self._subscriptions: list[tuple[str, Callable[[ReceiveMessage], Any], str | None]] = []
+        self.subscribes = 0
+        self.published = 0
+        self.delivered = 0
+        self.outbound: list[tuple[str, bytes]] = []
+
+    async def async_subscribe(
+        self,
+        hass: HomeAssistant,
+        topic: str,
+        msg_callback: Callable[[ReceiveMessage], Awaitable[None] | None],
+        qos: int = 0,
+        encoding: str | None = "utf-8",
+    ) -> Callable[[], None]:
+        """Subscribe to a topic, return a function to unsubscribe."""
+        subscription = (topic, msg_callback, encoding)
+        self._subscriptions.append(subscription)
+        self.subscribes += 1
+
+        def _unsubscribe() -> None:
+            self._subscriptions.remove(subscription)
+
+        return _unsubscribe
+
+    @property
+    def subscriptions(self) -> int:
+        """Return number of active subscriptions."""
+        return len(self._subscriptions)
+
+    async def async_publish(self, topic: str, payload: bytes) -> None:
+        """Deliver a payload to all matching subscriptions."""
+        self.published += 1
+        timestamp = dt.utcnow()
+        for topic_filter, msg_callback, encoding in list(self._subscriptions):
+            if not topic_matches(topic_filter, topic):
+                continue
+            data: Any = payload
+            if encoding is not None:
+                try:
+                    data = payload.decode(encoding)
+                except UnicodeDecodeError:
+                    continue
+            self.delivered += 1
+            result = msg_callback(ReceiveMessage(topic, data, 0, False, topic_filter, timestamp))
+            if inspect.isawaitable(result):
+                await result
+
+
+    async def async_client_publish(
+        self,
+        hass: HomeAssistant,
+        topic: str,
+        payload: bytes,
+        qos: int = 0,
+        retain: bool = False,
+        encoding: str | None = "utf-8",
+    ) -> None:
+        """Publish like the MQTT client module, delivering back to subscribers."""
+        self.outbound.append((topic, payload))
+        hass.async_create_task(self.async_publish(topic, payload))
+
+
+def install(mqtt: InMemoryMqtt) -> None:
+    """Route the integration's MQTT subscriptions and publishes to the stand-in."""
+    coordinator_module.mqtt_client = mqtt  # type: ignore[assignment]
+    sender_module.mqtt_client = SimpleNamespace(  # type: ignore[assignment]
+        async_publish=mqtt.async_client_publish
+    )
+
+
+class MemoryStore:
+    """In-memory stand-in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, hass: HomeAssistant, version: int, key: str, **kwargs: Any) -> None:
+        """Initialize an empty store."""
+        self.hass = hass
+        self.key = key
+        self.path = os.devnull
+        self.data: Any = None
+        self.saves = 0
+
+    async def async_load(self) -> Any:
+        """Return saved data."""
+        return self.data
+
+    async def async_save(self, data: Any) -> None:
+        """Keep data in memory."""
+        self.data = data
+        self.saves += 1
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        """Keep data returned by a function in memory after a delay."""
+
+        def _write() -> None:
+            self.data = data_func()
+            self.saves += 1
+
+        self.hass.loop.call_later(delay, _write)
+
+
+def install_memory_storage() -> None:
+    """Keep the integration's platform storage in memory.
+
+    The stand-in has everything of the storage helper module but Store.
+    """
+    coordinator_module.storage = SimpleNamespace(  # type: ignore[assignment]
+        **{**vars(storage), "Store": MemoryStore}
+    )
+
+
+class ConfigEntriesStandIn:
+    """Stand-in for the config entry manager of Home Assistant.
+
+    Forwards entry setups to the integration's entity platforms without
+    setting up the entity component integrations themselves.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize without entries."""
+        self.hass = hass
+        self._entries: dict[str, ConfigEntry] = {}
+        self._platforms: dict[str, list[EntityPlatform]] = {}
+
+    def add(self, entry: ConfigEntry) -> None:
+        """Register an entry without setting it up."""
+        self._entries[entry.entry_id] = entry
+
+    def async_get_entry(self, entry_id: str) -> ConfigEntry | None:
+        """Return an entry by ID."""
+        return self._entries.get(entry_id)
+
+    def async_entries(self, domain: str | None = None) -> list[ConfigEntry]:
+        """Return all entries."""
+        return list(self._entries.values())
+
+    def async_update_entry(self, entry: ConfigEntry, *, options: dict[str, Any]) -> bool:
+        """Replace the options of an entry and schedule its update listeners."""
+        if entry.options == options:
+            return False
+        object.__setattr__(entry, "options", MappingProxyType(options))
+        entry.clear_cache()
+        for listener in entry.update_listeners:
+            self.hass.async_create_task(listener(self.hass, entry))
+        return True
+
+    async def async_forward_entry_setups(self, entry: ConfigEntry, platforms: Iterable[str]) -> None:
+        """Set up the entity platforms of an entry."""
+        for domain in platforms:
+            platform = EntityPlatform(
+                hass=self.hass,
+                logger=logging.getLogger(f"{DOMAIN}.{domain}"),
+                domain=str(domain),
+                platform_name=DOMAIN,
+                platform=importlib.import_module(f"custom_components.{DOMAIN}.{domain}"),
+                scan_interval=timedelta(seconds=30),
+                entity_namespace=None,
+            )
+            self._platforms.setdefault(entry.entry_id, []).append(platform)
+            await platform.async_setup_entry(entry)
+
+    async def async_unload_platforms(self, entry: ConfigEntry, platforms: Iterable[str]) -> bool:
+        """Remove the entities of an entry."""
+        for platform in self._platforms.pop(entry.entry_id, []):
+            await platform.async_reset()
+        return True
+
+
+async def async_create_entity_hass(config_dir: str | None = None) -> HomeAssistant:
+    """Create a Home Assistant instance for setting up entries with entities."""
+    hass = HomeAssistant(config_dir or tempfile.mkdtemp(prefix="mtastic_bench_"))
+    hass.config.set_time_zone("UTC")
+    entity.async_setup(hass)
+    await device_registry.async_load(hass)
+    await entity_registry.async_load(hass)
+    hass.config_entries = ConfigEntriesStandIn(hass)  # type: ignore[assignment]
+    await integration.async_setup(hass, {})
+    return hass
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Add an entry and set it up through the integration's async_setup_entry."""
+    hass.config_entries.add(entry)
+    return await integration.async_setup_entry(hass, entry)
+
+
+async def async_create_hass(
+    config_dir: str | None = None, config: dict[str, Any] | None = None
+) -> HomeAssistant:
+    """Create a Home Assistant instance with the integration set up."""
+    hass = HomeAssistant(config_dir or tempfile.mkdtemp(prefix="mtastic_bench_"))
+    hass.config.set_time_zone("UTC")
+    await integration.async_setup(hass, integration.CONFIG_SCHEMA({DOMAIN: config or {}}))
+    return hass
+
+
+def make_entry(node: int, pb_topic: str, key: str = "AQ==", **options: Any) -> ConfigEntry:
+    """Build a config entry for a node."""
+    node_id = f"!{node:08x}"
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=node_id,
+        data={},
+        source="user",
+        options={"id": node_id, "pb_topic": pb_topic, "key": key, **options},
+        unique_id=node_id,
+    )
+
+
+async def async_add_coordinator(
+    hass: HomeAssistant, node: int, pb_topic: str, key: str = "AQ==", **options: Any
+) -> Coordinator:
+    """Load a coordinator for a node without the config entry machinery."""
+    entry = make_entry(node, pb_topic, key, **options)
+    coordinator = Coordinator(hass.data[DOMAIN], entry)
+    entry.runtime_data = coordinator
+    await coordinator.async_load()
+    await coordinator.async_config_entry_first_refresh()
+    return coordinator
+
+
+def merged_stages(platform: Platform) -> dict[str, LatencyHistogram]:
+    """Return stage histograms merged across the platform and coordinators."""
+    merged = {stage: LatencyHistogram() for stage in STAGES}
+    for stats in [platform.stats, *(c.stats for c in platform.coordinators)]:
+        for stage, histogram in stats.stages.items():
+            merged[stage].merge(histogram)
+    return merged
+
+
+def merged_counters(platform: Platform) -> dict[str, int]:
+    """Return pipeline counters summed across coordinators."""
+    counters = dict.fromkeys(
+        ("messages", "duplicates", "decrypt_failures", "parse_errors", "errors"), 0
+    )
+    for coordinator in platform.coordinators:
+        for name in counters:
+            counters[name] += getattr(coordinator.stats, name)
+    return counters
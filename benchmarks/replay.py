@@ -0,0 +1,155 @@
+"""Replay a capture file through the integration.
+
+Reads a capture file (see custom_components/mtastic_mqtt/capture.py), for
+example one written by the dump_flight_recorder service, sets up a
+coordinator for the most frequent senders and publishes every record
+through an in-memory MQTT stand-in, without a broker or network. Replay
+is deterministic: callbacks run one at a time in capture order.
+
+Usage: python benchmarks/replay.py CAPTURE [--speed 1] [--max-speed]
+       [--nodes 10] [--node !aabbccdd ...] [--key AQ==] [--topic '#']
+       [--tracemalloc]
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+import argparse
+import asyncio
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+
+import harness  # noqa: E402  (sets up sys.path)
+
+from google.protobuf.message import DecodeError  # noqa: E402
+
+from custom_components.mtastic_mqtt.capture import CaptureRecord, read_capture  # noqa: E402
+from custom_components.mtastic_mqtt.protobuf import mqtt_pb2  # noqa: E402
+
+
+def _parse_node(value: str) -> int:
+    return int(value[1:], 16) if value.startswith("!") else int(value)
+
+
+def _top_senders(records: list[CaptureRecord], count: int) -> list[int]:
+    """Return the most frequent packet senders in a capture."""
+    senders: Counter[int] = Counter()
+    env = mqtt_pb2.ServiceEnvelope()
+    for record in records:
+        try:
+            env.ParseFromString(record.payload)
+        except DecodeError:
+            continue
+        senders[getattr(env.packet, "from")] += 1
+    return [node for node, _ in senders.most_common(count)]
+
+
+async def async_replay(
+    records: list[CaptureRecord],
+    nodes: list[int],
+    speed: float | None,
+    topic: str,
+    key: str,
+) -> dict[str, Any]:
+    """Replay records, return a report; speed None replays as fast as possible."""
+    mqtt = harness.InMemoryMqtt()
+    harness.install(mqtt)
+    hass = await harness.async_create_hass()
+    platform = hass.data[harness.DOMAIN]
+    coordinators = [
+        await harness.async_add_coordinator(hass, node, topic, key) for node in nodes
+    ]
+    # Only measure the replay itself
+    platform.stats.reset()
+
+    start = time.perf_counter()
+    first = records[0].timestamp if records else 0.0
+    lag = 0.0
+    for record in records:
+        if speed is not None:
+            delay = (record.timestamp - first) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                lag = max(lag, -delay)
+        await mqtt.async_publish(record.topic, record.payload)
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "records": len(records),
+        "coordinators": len(coordinators),
+        "deliveries": mqtt.delivered,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_msg_s": round(len(records) / elapsed, 1) if elapsed else None,
+        "max_lag_s": round(lag, 3) if speed is not None else None,
+        "counters": harness.merged_counters(platform),
+        "stages": {
+            stage: histogram.as_dict()
+            for stage, histogram in harness.merged_stages(platform).items()
+            if histogram.count
+        },
+    }
+    for coordinator in coordinators:
+        await coordinator.async_unload()
+    await hass.async_stop(force=True)
+    return report
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"records:      {report['records']}")
+    print(f"coordinators: {report['coordinators']} ({report['deliveries']} deliveries)")
+    print(f"elapsed:      {report['elapsed_s']} s")
+    print(f"throughput:   {report['throughput_msg_s']} msg/s")
+    if report["max_lag_s"] is not None:
+        print(f"max lag:      {report['max_lag_s']} s")
+    print("counters:     " + ", ".join(f"{k}={v}" for k, v in report["counters"].items()))
+    print(f"{'stage':<14}{'count':>9}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for stage, item in report["stages"].items():
+        print(
+            f"{stage:<14}{item['count']:>9}{item['mean_ms']:>10.4f}{item['p50_ms']:>10.4f}"
+            f"{item['p95_ms']:>10.4f}{item['p99_ms']:>10.4f}{item['max_ms']:>10.4f}"
+        )
+    if "peak_traced_mb" in report:
+        print(f"peak traced:  {report['peak_traced_mb']} MB")
+    print(f"peak RSS:     {report['peak_rss_mb']} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor")
+    parser.add_argument("--max-speed", action="store_true", help="replay without pacing")
+    parser.add_argument("--nodes", type=int, default=10, help="number of senders to configure")
+    parser.add_argument("--node", action="append", type=_parse_node, help="node to configure")
+    parser.add_argument("--key", default="AQ==", help="channel key of the coordinators")
+    parser.add_argument("--topic", default="#", help="protobuf topic of the coordinators")
+    parser.add_argument("--tracemalloc", action="store_true", help="trace peak Python memory")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    logging.basicConfig(level=logging.ERROR)
+
+    with open(args.capture, "rb") as file:
+        records = list(read_capture(file))
+    nodes = args.node or _top_senders(records, args.nodes)
+    if args.tracemalloc:
+        tracemalloc.start()
+    report = asyncio.run(
+        async_replay(records, nodes, None if args.max_speed else args.speed, args.topic, args.key)
+    )
+    if args.tracemalloc:
+        report["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        tracemalloc.stop()
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+    _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
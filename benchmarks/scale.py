@@ -0,0 +1,179 @@
+"""Measure how the integration scales with the number of configured nodes.
+
+For every node count, a fresh process sets up a Home Assistant core with
+in-memory MQTT and storage stand-ins, creates one config entry per node
+through async_setup_entry (with real entity platforms), pushes synthetic
+traffic and reports setup time, CPU time per packet, state writes per
+second and memory.
+
+Usage: python benchmarks/scale.py [--nodes 10,100,500,1000,2000]
+       [--packets-per-node 5] [--gateways 3] [--topic 'msh/#'] [--plain]
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import harness  # noqa: E402  (sets up sys.path)
+from traffic import TrafficGenerator  # noqa: E402
+
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import Event, callback  # noqa: E402
+
+
+def _cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _rss_mb() -> float:
+    """Return current resident memory, falling back to the peak."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            pages = int(file.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except OSError:
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+async def async_run(
+    nodes: int, packets_per_node: int, gateways: int, topic: str, key: str | None
+) -> dict[str, Any]:
+    """Set up entries for a node count, push traffic and measure."""
+    mqtt = harness.InMemoryMqtt()
+    harness.install(mqtt)
+    harness.install_memory_storage()
+    rss_start = _rss_mb()
+    hass = await harness.async_create_entity_hass()
+
+    state_writes = 0
+
+    @callback
+    def _count_state_write(event: Event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write, run_immediately=True)
+
+    generator = TrafficGenerator(
+        nodes=nodes, gateways=min(gateways, nodes), rate=max(5.0, nodes / 10), key=key
+    )
+    start = time.perf_counter()
+    failed = 0
+    for node in generator.nodes:
+        if not await harness.async_setup_entry(hass, harness.make_entry(node, topic, key or "AQ==")):
+            failed += 1
+    await hass.async_block_till_done()
+    setup_s = time.perf_counter() - start
+    setup_writes = state_writes
+    rss_setup = _rss_mb()
+
+    records = list(generator.records(nodes * packets_per_node))
+    state_writes = 0
+    cpu_start = _cpu_time()
+    start = time.perf_counter()
+    for record in records:
+        await mqtt.async_publish(record.topic, record.payload)
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+    cpu = _cpu_time() - cpu_start
+
+    report = {
+        "nodes": nodes,
+        "failed_entries": failed,
+        "entities": len(hass.states.async_all()),
+        "subscriptions": mqtt.subscriptions,
+        "setup_s": round(setup_s, 3),
+        "setup_ms_per_entry": round(setup_s / nodes * 1000, 3),
+        "setup_state_writes": setup_writes,
+        "uplinks": len(records),
+        "deliveries": mqtt.delivered,
+        "elapsed_s": round(elapsed, 3),
+        "cpu_us_per_uplink": round(cpu / len(records) * 1e6, 1) if records else None,
+        "uplinks_per_s": round(len(records) / elapsed, 1) if elapsed else None,
+        "state_writes": state_writes,
+        "state_writes_per_s": round(state_writes / elapsed, 1) if elapsed else None,
+        "rss_start_mb": rss_start,
+        "rss_setup_mb": rss_setup,
+        "rss_end_mb": _rss_mb(),
+    }
+    await hass.async_stop(force=True)
+    return report
+
+
+def _print_table(reports: list[dict[str, Any]]) -> None:
+    columns = (
+        ("nodes", "nodes"),
+        ("entities", "entities"),
+        ("setup_s", "setup s"),
+        ("setup_ms_per_entry", "ms/entry"),
+        ("uplinks", "uplinks"),
+        ("cpu_us_per_uplink", "cpu us/upl"),
+        ("uplinks_per_s", "upl/s"),
+        ("state_writes_per_s", "writes/s"),
+        ("rss_setup_mb", "RSS setup"),
+        ("rss_end_mb", "RSS end"),
+    )
+    print("".join(f"{title:>12}" for _, title in columns))
+    for report in reports:
+        print("".join(f"{report[key]!s:>12}" for key, _ in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", default="10,100,500,1000,2000",
+                        help="comma separated node counts")
+    parser.add_argument("--packets-per-node", type=int, default=5)
+    parser.add_argument("--gateways", type=int, default=3)
+    parser.add_argument("--topic", default="msh/#", help="protobuf topic of every entry")
+    parser.add_argument("--plain", action="store_true", help="don't encrypt packets")
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    key = None if args.plain else "AQ=="
+
+    if args.run:
+        report = asyncio.run(
+            async_run(args.run, args.packets_per_node, args.gateways, args.topic, key)
+        )
+        print(json.dumps(report))
+        return
+
+    reports = []
+    for nodes in (int(value) for value in args.nodes.split(",")):
+        # A fresh process per node count keeps memory figures independent
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            "--run", str(nodes),
+            "--packets-per-node", str(args.packets_per_node),
+            "--gateways", str(args.gateways),
+            "--topic", args.topic,
+        ]
+        if args.plain:
+            command.append("--plain")
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode:
+            print(f"Run with {nodes} nodes failed:\n{result.stderr}", file=sys.stderr)
+            break
+        reports.append(json.loads(result.stdout.splitlines()[-1]))
+        if not args.json:
+            print(f"{nodes} nodes done", file=sys.stderr)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        _print_table(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Synthetic Meshtastic MQTT traffic.
+
+TrafficGenerator produces ServiceEnvelope payloads for a mix of position,
+telemetry, nodeinfo, neighborinfo and text packets sent by N nodes and
+uplinked by M gateways. Packets may be encrypted with the default or a
+custom channel key exactly as try_encrypt_envelope expects (AES-CTR with
+a nonce built from the packet id and sender), heard by several gateways
+(duplicates) and rebroadcast by other nodes with fewer hops left
+(relays). Output is deterministic for a given seed.
+
+As a script it writes a capture file for benchmarks/replay.py:
+
+Usage: python benchmarks/traffic.py OUTPUT [--packets 10000] [--nodes 50]
+       [--gateways 3] [--rate 5] [--key AQ==] [--plain] [--seed 0]
+       [--duplicates 0.5] [--relays 0.2]
+       [--mix position=3,telemetry=3,nodeinfo=1,neighborinfo=1,text=1]
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import argparse
+import base64
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes  # noqa: E402
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM  # noqa: E402
+
+from custom_components.mtastic_mqtt.capture import CaptureRecord, write_capture  # noqa: E402
+from custom_components.mtastic_mqtt.pki import PKI_TAG_SIZE, pki_nonce  # noqa: E402
+from custom_components.mtastic_mqtt.proto import DEFAULT_ENC_KEY  # noqa: E402
+from custom_components.mtastic_mqtt.protobuf import (  # noqa: E402
+    mesh_pb2,
+    mqtt_pb2,
+    portnums_pb2,
+    telemetry_pb2,
+)
+
+BROADCAST = 0xFFFFFFFF
+
+DEFAULT_MIX = {
+    "position": 3.0,
+    "telemetry": 3.0,
+    "nodeinfo": 1.0,
+    "neighborinfo": 1.0,
+    "text": 1.0,
+}
+
+_HW_MODELS = ("TBEAM", "HELTEC_V3", "RAK4631", "T_ECHO", "STATION_G2")
+_WORDS = ("hello", "mesh", "test", "anyone", "copy", "weather", "on", "the", "hill", "73")
+
+
+def channel_key(key_b64: str) -> bytes:
+    """Return AES key bytes for a channel key as configured in an entry."""
+    key = base64.b64decode(key_b64.replace("_", "/").replace("-", "+").encode("ascii"))
+    if key == b"\x01":
+        key = base64.b64decode(DEFAULT_ENC_KEY.encode("ascii"))
+    if len(key) != 16:
+        raise ValueError(f"Invalid key length: {len(key)}, expected 16 bytes")
+    return key
+
+
+def encrypt(data: bytes, key: bytes, packet_id: int, sender: int) -> bytes:
+    """Encrypt a serialized Data message for a packet."""
+    nonce = packet_id.to_bytes(8, "little") + sender.to_bytes(8, "little")
+    encryptor = Cipher(algorithms.AES(key), modes.CTR(nonce)).encryptor()
+    return encryptor.update(data) + encryptor.finalize()
+
+
+def encrypt_pki(
+    data: bytes, key: bytes, packet_id: int, sender: int, extra_nonce: int
+) -> bytes:
+    """Encrypt a serialized Data message of a direct message with a shared key."""
+    nonce = pki_nonce(packet_id, sender, extra_nonce)
+    sealed = AESCCM(key, PKI_TAG_SIZE).encrypt(nonce, data, None)
+    return sealed + extra_nonce.to_bytes(4, "little")
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse a packet mix like position=3,text=1."""
+    mix: dict[str, float] = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown packet kind: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class TrafficGenerator:
+    """Deterministic generator of synthetic mesh traffic."""
+
+    def __init__(
+        self,
+        nodes: int = 50,
+        gateways: int = 3,
+        rate: float = 5.0,
+        mix: dict[str, float] | None = None,
+        key: str | None = "AQ==",
+        duplicates: float = 0.5,
+        relays: float = 0.2,
+        seed: int = 0,
+        start: float = 1_700_000_000.0,
+        channel: str = "LongFast",
+        root: str = "msh/EU_868",
+    ) -> None:
+        """Initialize nodes, gateways and their positions."""
+        if gateways > nodes:
+            raise ValueError("Gateways must not outnumber nodes")
+        self._random = random.Random(seed)
+        self._rate = rate
+        self._key = channel_key(key) if key is not None else None
+        self._duplicates = duplicates
+        self._relays = relays
+        self._channel = channel
+        self._time = start
+        mix = mix or DEFAULT_MIX
+        self._kinds = list(mix)
+        self._weights = [mix[kind] for kind in self._kinds]
+        self._packet_id = self._random.getrandbits(31)
+        self.nodes = [0x10000000 + self._random.getrandbits(27) for _ in range(nodes)]
+        self.gateways = self.nodes[:gateways]
+        self._topics = {
+            gateway: f"{root}/2/{'e' if key is not None else 'c'}/{channel}/!{gateway:08x}"
+            for gateway in self.gateways
+        }
+        # Nodes start scattered over roughly 20 km and move in a random walk
+        self._positions = {
+            node: [
+                515000000 + self._random.randint(-900000, 900000),
+                -1000000 + self._random.randint(-1400000, 1400000),
+            ]
+            for node in self.nodes
+        }
+
+    @property
+    def topics(self) -> list[str]:
+        """Return the uplink topic of every gateway."""
+        return list(self._topics.values())
+
+    def _neighbors(self, node: int, count: int) -> list[int]:
+        lat, lon = self._positions[node]
+
+        def distance(other: int) -> float:
+            other_lat, other_lon = self._positions[other]
+            return math.hypot(other_lat - lat, (other_lon - lon) * 0.62)
+
+        return sorted((n for n in self.nodes if n != node), key=distance)[:count]
+
+    def _data(self, kind: str, node: int) -> mesh_pb2.Data:
+        rnd = self._random
+        data = mesh_pb2.Data()
+        if kind == "position":
+            position = self._positions[node]
+            position[0] += rnd.randint(-3000, 3000)
+            position[1] += rnd.randint(-5000, 5000)
+            data.portnum = portnums_pb2.POSITION_APP
+            data.payload = mesh_pb2.Position(
+                latitude_i=position[0],
+                longitude_i=position[1],
+                altitude=rnd.randint(0, 300),
+                time=int(self._time),
+                sats_in_view=rnd.randint(4, 14),
+            ).SerializeToString()
+        elif kind == "telemetry":
+            telemetry = telemetry_pb2.Telemetry(time=int(self._time))
+            if rnd.random() < 0.7:
+                metrics = telemetry.device_metrics
+                metrics.battery_level = rnd.randint(5, 101)
+                metrics.voltage = round(rnd.uniform(3.3, 4.2), 2)
+                metrics.channel_utilization = round(rnd.uniform(0, 40), 2)
+                metrics.air_util_tx = round(rnd.uniform(0, 5), 2)
+                metrics.uptime_seconds = rnd.randint(0, 10**6)
+            else:
+                metrics = telemetry.environment_metrics
+                metrics.temperature = round(rnd.uniform(-10, 35), 1)
+                metrics.relative_humidity = round(rnd.uniform(20, 100), 1)
+                metrics.barometric_pressure = round(rnd.uniform(980, 1040), 1)
+            data.portnum = portnums_pb2.TELEMETRY_APP
+            data.payload = telemetry.SerializeToString()
+        elif kind == "nodeinfo":
+            data.portnum = portnums_pb2.NODEINFO_APP
+            data.payload = mesh_pb2.User(
+                id=f"!{node:08x}",
+                long_name=f"Node {node & 0xFFFF:04x}",
+                short_name=f"{node & 0xFFFF:04x}",
+                hw_model=mesh_pb2.HardwareModel.Value(_HW_MODELS[node % len(_HW_MODELS)]),
+            ).SerializeToString()
+        elif kind == "neighborinfo":
+            info = mesh_pb2.NeighborInfo(node_id=node, node_broadcast_interval_secs=900)
+            for neighbor in self._neighbors(node, rnd.randint(1, 6)):
+                info.neighbors.add(node_id=neighbor, snr=round(rnd.uniform(-15, 10), 2))
+            data.portnum = portnums_pb2.NEIGHBORINFO_APP
+            data.payload = info.SerializeToString()
+        else:
+            data.portnum = portnums_pb2.TEXT_MESSAGE_APP
+            data.payload = " ".join(rnd.choices(_WORDS, k=rnd.randint(1, 8))).encode("utf-8")
+        return data
+
+    def _uplink(
+        self, packet: mesh_pb2.MeshPacket, gateway: int, hop_limit: int, timestamp: float
+    ) -> CaptureRecord:
+        rnd = self._random
+        envelope = mqtt_pb2.ServiceEnvelope(channel_id=self._channel, gateway_id=f"!{gateway:08x}")
+        envelope.packet.CopyFrom(packet)
+        envelope.packet.hop_limit = hop_limit
+        envelope.packet.rx_time = int(timestamp)
+        envelope.packet.rx_snr = round(rnd.uniform(-18, 12), 2)
+        envelope.packet.rx_rssi = rnd.randint(-125, -40)
+        return CaptureRecord(timestamp, self._topics[gateway], envelope.SerializeToString())
+
+    def packet(self) -> list[CaptureRecord]:
+        """Return all uplinks of the next packet, in time order."""
+        rnd = self._random
+        self._time += rnd.expovariate(self._rate)
+        sender = rnd.choice(self.nodes)
+        kind = rnd.choices(self._kinds, self._weights)[0]
+        self._packet_id = (self._packet_id + 1) & 0xFFFFFFFF or 1
+
+        packet = mesh_pb2.MeshPacket(to=BROADCAST, id=self._packet_id, hop_start=3)
+        setattr(packet, "from", sender)
+        data = self._data(kind, sender)
+        if self._key is not None:
+            packet.encrypted = encrypt(data.SerializeToString(), self._key, packet.id, sender)
+        else:
+            packet.decoded.CopyFrom(data)
+
+        heard = [rnd.choice(self.gateways)]
+        if len(self.gateways) > 1 and rnd.random() < self._duplicates:
+            others = [g for g in self.gateways if g != heard[0]]
+            heard += rnd.sample(others, rnd.randint(1, len(others)))
+        records = [
+            self._uplink(packet, gateway, 3, self._time + rnd.uniform(0, 0.5))
+            for gateway in heard
+        ]
+        if rnd.random() < self._relays:
+            records.append(self._uplink(
+                packet, rnd.choice(self.gateways), rnd.randint(0, 2), self._time + rnd.uniform(1, 3)
+            ))
+        records.sort(key=lambda record: record.timestamp)
+        return records
+
+    def records(self, packets: int) -> Iterator[CaptureRecord]:
+        """Yield uplinks of the given number of packets in time order."""
+        pending: list[CaptureRecord] = []
+        for _ in range(packets):
+            new = self.packet()
+            # Uplinks of a packet arrive at most 3 seconds after it was sent
+            ready = [r for r in pending if r.timestamp <= self._time]
+            pending = [r for r in pending if r.timestamp > self._time] + new
+            yield from sorted(ready, key=lambda record: record.timestamp)
+        yield from sorted(pending, key=lambda record: record.timestamp)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--packets", type=int, default=10000)
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--gateways", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=5.0, help="packets per second")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument("--key", default="AQ==", help="channel key, AQ== is the default key")
+    parser.add_argument("--plain", action="store_true", help="don't encrypt packets")
+    parser.add_argument("--duplicates", type=float, default=0.5,
+                        help="probability a packet is heard by several gateways")
+    parser.add_argument("--relays", type=float, default=0.2,
+                        help="probability a packet is also uplinked after a relay")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = TrafficGenerator(
+        nodes=args.nodes,
+        gateways=args.gateways,
+        rate=args.rate,
+        mix=args.mix,
+        key=None if args.plain else args.key,
+        duplicates=args.duplicates,
+        relays=args.relays,
+        seed=args.seed,
+    )
+    with open(args.output, "wb") as file:
+        count = write_capture(file, generator.records(args.packets))
+    print(f"Wrote {count} uplinks of {args.packets} packets to {args.output}")
+    print(f"Gateway topics: {', '.join(generator.topics)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,19 @@ from __future__ import annotations
 from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .constants import DOMAIN, PLATFORMS
+from .constants import (
+    DOMAIN,
+    PLATFORMS,
+    SEND_BURST_AIRTIME,
+    SEND_DUTY_CYCLE,
+    STALL_THRESHOLD_MS,
+)
 from .coordinator import Coordinator, Platform
+from .proto import PROTOBUF_BACKEND_PYTHON, protobuf_info
+from .services import async_setup_services, node_num
 
 import voluptuous as vol
 import logging
@@ -16,7 +25,24 @@ _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = vol.Schema(
     {
-        DOMAIN: vol.Schema({}, extra=vol.ALLOW_EXTRA),
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional("stall_threshold", default=STALL_THRESHOLD_MS): vol.All(
+                    vol.Coerce(float), vol.Range(min=1)
+                ),
+                vol.Optional("watchdog", default=True): cv.boolean,
+                vol.Optional("flight_recorder", default=True): cv.boolean,
+                vol.Optional("sender_id"): node_num,
+                vol.Optional("map_topic"): cv.string,
+                vol.Optional("send_duty_cycle", default=SEND_DUTY_CYCLE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.01, max=100)
+                ),
+                vol.Optional("send_burst_airtime", default=SEND_BURST_AIRTIME): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.5)
+                ),
+            },
+            extra=vol.ALLOW_EXTRA,
+        ),
     },
     extra=vol.ALLOW_EXTRA,
 )
@@ -24,9 +50,29 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Meshtastic MQTT integration."""
-    platform = Platform(hass)
+    conf = config.get(DOMAIN, {})
+    platform = Platform(
+        hass,
+        conf.get("stall_threshold", STALL_THRESHOLD_MS),
+        conf.get("send_duty_cycle", SEND_DUTY_CYCLE),
+        conf.get("send_burst_airtime", SEND_BURST_AIRTIME),
+        conf.get("sender_id"),
+        conf.get("map_topic"),
+        conf.get("watchdog", True),
+        conf.get("flight_recorder", True),
+    )
     await platform.async_load()
     hass.data[DOMAIN] = platform
+    await async_setup_services(hass, platform)
+    protobuf = protobuf_info()
+    _LOGGER.info(
+        "Using protobuf %s with the %s backend", protobuf["version"], protobuf["backend"]
+    )
+    if protobuf["backend"] == PROTOBUF_BACKEND_PYTHON:
+        _LOGGER.warning(
+            "The pure Python protobuf backend is active, decoding packets is about "
+            "10x slower; install a protobuf release with the upb backend"
+        )
     _LOGGER.debug("Platform initialized")
     return True
 
@@ -84,8 +130,7 @@ async def _async_update_entry(
     coordinator: Coordinator = entry.runtime_data
     
     try:
-        await coordinator.async_unload()
-        await coordinator.async_load()
+        await coordinator.async_update_options()
         _LOGGER.debug("Entry updated successfully")
     except Exception as err:
         _LOGGER.error("Failed to update entry: %s", err)
@@ -0,0 +1,65 @@
+"""Binary capture format for raw MQTT traffic.
+
+A capture file starts with MAGIC followed by records. Each record is a
+little-endian uint32 length of the rest of the record, a float64 receive
+timestamp, a uint16 topic length, the UTF-8 topic and the raw payload.
+"""
+from __future__ import annotations
+
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+import struct
+
+MAGIC = b"MTCAP\x00\x01\x00"
+
+_HEADER = struct.Struct("<IdH")
+_PREFIX = struct.Struct("<I")
+
+
+class CaptureRecord(NamedTuple):
+    """One captured MQTT message."""
+
+    timestamp: float
+    topic: str
+    payload: bytes
+
+
+def encode_record(timestamp: float, topic: str, payload: bytes) -> bytes:
+    """Encode one record."""
+    topic_bytes = topic.encode("utf-8")
+    return b"".join((
+        _HEADER.pack(
+            _HEADER.size - _PREFIX.size + len(topic_bytes) + len(payload),
+            timestamp,
+            len(topic_bytes),
+        ),
+        topic_bytes,
+        payload,
+    ))
+
+
+def write_capture(file: BinaryIO, records: Iterable[tuple[float, str, bytes]]) -> int:
+    """Write a capture file, return number of records."""
+    file.write(MAGIC)
+    count = 0
+    for timestamp, topic, payload in records:
+        file.write(encode_record(timestamp, topic, payload))
+        count += 1
+    return count
+
+
+def read_capture(file: BinaryIO) -> Iterator[CaptureRecord]:
+    """Read records from a capture file."""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a capture file")
+    while prefix := file.read(_PREFIX.size):
+        if len(prefix) < _PREFIX.size:
+            raise ValueError("Truncated capture record")
+        (length,) = _PREFIX.unpack(prefix)
+        body = file.read(length)
+        if len(body) < length:
+            raise ValueError("Truncated capture record")
+        timestamp, topic_len = struct.unpack_from("<dH", body)
+        offset = _HEADER.size - _PREFIX.size
+        topic = body[offset:offset + topic_len].decode("utf-8")
+        yield CaptureRecord(timestamp, topic, body[offset + topic_len:])
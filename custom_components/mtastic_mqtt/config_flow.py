@@ -6,9 +6,25 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
-
-from .constants import DOMAIN
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+)
+
+from .constants import (
+    CONF_PRIVATE_KEY,
+    CONF_WRITE_DEADBAND,
+    CONF_WRITE_MAX_INTERVAL,
+    CONF_WRITE_MIN_INTERVAL,
+    CONF_WRITE_RELATIVE_DEADBAND,
+    DOMAIN,
+    WRITE_MAX_INTERVAL,
+)
+from .pki import decode_key
 
 import voluptuous as vol
 import logging
@@ -51,6 +67,18 @@ async def _validate_input(hass: HomeAssistant, user_input: dict[str, Any]) -> tu
         except Exception:
             errors["key"] = "invalid_key_format"
     
+    # Validate PKI private key if provided
+    if private_key := user_input.get(CONF_PRIVATE_KEY, "").strip():
+        try:
+            decode_key(private_key)
+        except ValueError:
+            errors[CONF_PRIVATE_KEY] = "invalid_private_key"
+
+    # Validate state write policy
+    max_interval = user_input.get(CONF_WRITE_MAX_INTERVAL, WRITE_MAX_INTERVAL)
+    if max_interval and user_input.get(CONF_WRITE_MIN_INTERVAL, 0) > max_interval:
+        errors[CONF_WRITE_MIN_INTERVAL] = "invalid_write_interval"
+
     if errors:
         return list(errors.values())[0], None
     
@@ -85,10 +113,42 @@ def _create_schema(
         TextSelectorConfig(type="password", autocomplete="off")
     )
     
+    schema_dict[vol.Optional(
+        CONF_PRIVATE_KEY, default=user_input.get(CONF_PRIVATE_KEY, "")
+    )] = TextSelector(TextSelectorConfig(type="password", autocomplete="off"))
+
     schema_dict[vol.Optional("stat_topic", default=user_input.get("stat_topic", ""))] = TextSelector(
         TextSelectorConfig(type="text", placeholder="msh/EU_868/2/stat/!aabbccdd")
     )
-    
+
+    if flow == "options":
+        schema_dict[vol.Optional(
+            CONF_WRITE_DEADBAND, default=user_input.get(CONF_WRITE_DEADBAND, False)
+        )] = BooleanSelector()
+        schema_dict[vol.Optional(
+            CONF_WRITE_RELATIVE_DEADBAND,
+            default=user_input.get(CONF_WRITE_RELATIVE_DEADBAND, 0),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=0, max=50, step=0.5, unit_of_measurement="%", mode=NumberSelectorMode.BOX
+            )
+        )
+        schema_dict[vol.Optional(
+            CONF_WRITE_MIN_INTERVAL, default=user_input.get(CONF_WRITE_MIN_INTERVAL, 0)
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=0, max=3600, step=1, unit_of_measurement="s", mode=NumberSelectorMode.BOX
+            )
+        )
+        schema_dict[vol.Optional(
+            CONF_WRITE_MAX_INTERVAL,
+            default=user_input.get(CONF_WRITE_MAX_INTERVAL, WRITE_MAX_INTERVAL),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=0, max=86400, step=1, unit_of_measurement="s", mode=NumberSelectorMode.BOX
+            )
+        )
+
     return vol.Schema(schema_dict)
 
 
@@ -107,7 +167,7 @@ class ConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 data_schema=_create_schema(self.hass),
             )
         
-        _LOGGER.debug("User input received: %s", {k: v for k, v in user_input.items() if k != "key"})
+        _LOGGER.debug("User input received: %s", {k: v for k, v in user_input.items() if k not in ("key", CONF_PRIVATE_KEY)})
         
         error, validated_data = await _validate_input(self.hass, user_input)
         
@@ -152,9 +212,12 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                 data_schema=_create_schema(self.hass, self.config_entry.options, flow="options"),
             )
         
-        _LOGGER.debug("Options input received: %s", {k: v for k, v in user_input.items() if k != "key"})
+        _LOGGER.debug("Options input received: %s", {k: v for k, v in user_input.items() if k not in ("key", CONF_PRIVATE_KEY)})
         
         error, validated_data = await _validate_input(self.hass, user_input)
+        if not error and validated_data["id"] != self.config_entry.options.get("id"):
+            # The entry, its device and its data belong to one node
+            error = "node_id_changed"
         
         if error:
             _LOGGER.warning("Validation error: %s", error)
@@ -3,3 +3,93 @@ from typing import Final
 
 DOMAIN: Final = "mtastic_mqtt"
 PLATFORMS: Final = ["binary_sensor", "sensor", "device_tracker"]
+
+# Minimum movement before a new position is written to the tracker state
+POSITION_DEADBAND_M: Final = 25.0
+# Maximum number of points kept in a node's position track
+TRACK_MAX_POINTS: Final = 1024
+# Default Douglas-Peucker tolerance for returned tracks
+TRACK_TOLERANCE_M: Final = 10.0
+
+# Neighbor info reports older than this are dropped from the mesh topology
+TOPOLOGY_MAX_AGE: Final = 6 * 3600
+# Maximum number of (from, to) routes kept from traceroute and routing packets
+ROUTE_CACHE_SIZE: Final = 256
+# Copies of a packet uplinked by other gateways within this window are folded
+RECEPTION_WINDOW: Final = 20.0
+# Number of recent packets aggregated per node
+RECEPTION_SLOTS: Final = 8
+# Maximum number of nodes with reception statistics
+RECEPTION_MAX_NODES: Final = 2048
+# Default time a single callback may block the event loop before a warning
+STALL_THRESHOLD_MS: Final = 50.0
+# Number of slowest callbacks kept by the watchdog
+STALL_TOP_N: Final = 10
+# Minimum interval between stall warnings in the log
+STALL_WARN_INTERVAL: Final = 300.0
+# Number of raw messages kept by the flight recorder
+FLIGHT_RECORDER_SLOTS: Final = 1024
+# Largest payload kept by the flight recorder, in bytes
+FLIGHT_RECORDER_SLOT_SIZE: Final = 512
+
+# Default share of a channel's airtime used by sent messages, in percent
+SEND_DUTY_CYCLE: Final = 1.0
+# Airtime that may be sent in a burst before pacing starts, in seconds
+SEND_BURST_AIRTIME: Final = 5.0
+# Maximum number of messages waiting per channel
+SEND_QUEUE_MAX: Final = 32
+# Longest text of a sent message, in UTF-8 bytes
+SEND_MAX_TEXT_BYTES: Final = 200
+# Hop limit of sent packets, the Meshtastic default
+SEND_HOP_LIMIT: Final = 3
+# Destination of broadcast packets
+BROADCAST_NUM: Final = 0xFFFFFFFF
+
+# Maximum number of heard nodes in the node index
+NODE_INDEX_MAX_NODES: Final = 30000
+# Nodes not heard for this long are dropped from the node index
+NODE_INDEX_MAX_AGE: Final = 7 * 86400
+# Delay before a changed node index is saved
+NODE_INDEX_SAVE_DELAY: Final = 300
+
+# Maximum number of nodes whose latest map report is kept
+MAP_REPORT_MAX_NODES: Final = 4096
+# Changed map reports of a node are accepted at most this often
+MAP_REPORT_MIN_INTERVAL: Final = 600
+
+# Number of text messages kept per channel
+MESSAGE_LOG_SIZE: Final = 200
+# Maximum number of channels with logged text messages
+MESSAGE_LOG_MAX_CHANNELS: Final = 16
+# Messages per append-only segment of the saved text message log
+MESSAGE_SEGMENT_LINES: Final = 1000
+# Number of newest segments kept of the saved text message log
+MESSAGE_SEGMENTS: Final = 4
+# Text messages received within this window are fired as one event
+MESSAGE_EVENT_WINDOW: Final = 2.0
+# Event with a batch of received text messages
+EVENT_TEXT_MESSAGES: Final = f"{DOMAIN}_text_messages"
+
+# Maximum number of public keys learned from node info
+PKI_MAX_PUBLIC_KEYS: Final = 2048
+# Maximum number of cached shared keys of (node, peer) pairs
+PKI_MAX_SHARED_KEYS: Final = 256
+# Option with the Base64 PKI private key of a configured node
+CONF_PRIVATE_KEY: Final = "private_key"
+
+# Options of the state write policy of measurement sensors
+CONF_WRITE_DEADBAND: Final = "write_deadband"
+CONF_WRITE_RELATIVE_DEADBAND: Final = "write_relative_deadband"
+CONF_WRITE_MIN_INTERVAL: Final = "write_min_interval"
+CONF_WRITE_MAX_INTERVAL: Final = "write_max_interval"
+# Default time after which a throttled sensor state is written anyway
+WRITE_MAX_INTERVAL: Final = 3600
+
+SERVICE_GET_TRACK: Final = "get_track"
+SERVICE_QUERY_NODES: Final = "query_nodes"
+SERVICE_GET_TOPOLOGY: Final = "get_topology"
+SERVICE_GET_ROUTES: Final = "get_routes"
+SERVICE_START_PROFILE: Final = "start_profile"
+SERVICE_DUMP_FLIGHT_RECORDER: Final = "dump_flight_recorder"
+SERVICE_SEND_TEXT: Final = "send_text"
+SERVICE_GET_MESSAGES: Final = "get_messages"
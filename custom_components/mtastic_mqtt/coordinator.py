@@ -1,11 +1,14 @@
 """Data coordinator for Meshtastic MQTT integration."""
 from __future__ import annotations
 
+from collections import OrderedDict
+from contextvars import ContextVar
 from typing import Any, Callable
 from datetime import datetime
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
@@ -14,31 +17,490 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.components.mqtt import client as mqtt_client
 from homeassistant.components.mqtt.models import ReceiveMessage
 from homeassistant.util import dt
-from homeassistant.helpers import storage
-
-from .protobuf import mesh_pb2, mqtt_pb2, portnums_pb2, telemetry_pb2
-from .constants import DOMAIN
+from homeassistant.helpers import device_registry as dr, storage
+from google.protobuf.message import DecodeError
+
+from .protobuf import mesh_pb2, mqtt_pb2, portnums_pb2
+from .constants import (
+    CONF_PRIVATE_KEY,
+    DOMAIN,
+    FLIGHT_RECORDER_SLOT_SIZE,
+    FLIGHT_RECORDER_SLOTS,
+    MAP_REPORT_MAX_NODES,
+    MAP_REPORT_MIN_INTERVAL,
+    MESSAGE_EVENT_WINDOW,
+    MESSAGE_LOG_MAX_CHANNELS,
+    MESSAGE_LOG_SIZE,
+    MESSAGE_SEGMENT_LINES,
+    MESSAGE_SEGMENTS,
+    NODE_INDEX_MAX_AGE,
+    NODE_INDEX_MAX_NODES,
+    NODE_INDEX_SAVE_DELAY,
+    POSITION_DEADBAND_M,
+    RECEPTION_MAX_NODES,
+    RECEPTION_SLOTS,
+    RECEPTION_WINDOW,
+    PKI_MAX_PUBLIC_KEYS,
+    PKI_MAX_SHARED_KEYS,
+    ROUTE_CACHE_SIZE,
+    SEND_BURST_AIRTIME,
+    SEND_DUTY_CYCLE,
+    SEND_QUEUE_MAX,
+    STALL_THRESHOLD_MS,
+    STALL_TOP_N,
+    STALL_WARN_INTERVAL,
+    TOPOLOGY_MAX_AGE,
+    TRACK_MAX_POINTS,
+)
+from .flight_recorder import FlightRecorder
+from .geo import SpatialIndex
+from .mapreport import MapReports
+from .messages import TextMessages
+from .meshjson import convert_json_packet, is_json_topic, json_channel, parse_json_packet
+from .nodes import NodeIndex, gateway_num
+from .pki import PkiKeyring, decode_key
 from .proto import convert_envelope_to_json, try_encrypt_envelope
+from .profiler import IngestProfiler
+from .reception import ReceptionStats
+from .routes import RouteCache
+from .sender import SendScheduler
+from .stats import (
+    STAGE_CONVERT,
+    STAGE_DECRYPT,
+    STAGE_PARSE,
+    STAGE_RECEIVE,
+    STAGE_STATE_UPDATE,
+    STAGE_STORAGE_SAVE,
+    SAMPLE_INTERVAL,
+    PipelineStats,
+)
+from .throttle import SUPPRESS, WRITE_NOW, WritePolicy, WriteThrottle
+from .topology import MeshTopology
+from .track import PositionTrack
+from .watchdog import CallbackWatchdog
 
+import base64
 import logging
+import time
 
 _LOGGER = logging.getLogger(__name__)
 
+_PORTNUMS = frozenset(portnums_pb2.PortNum.values())
+
+# Total time the current task awaited storage writes, when the loop was free
+_storage_wait: ContextVar[int] = ContextVar("storage_wait", default=0)
+
+
+def _hops_used(packet: mesh_pb2.MeshPacket) -> int:
+    """Return number of hops a packet took, or -1 if unknown."""
+    if packet.hop_start:
+        return max(0, packet.hop_start - packet.hop_limit)
+    return -1
+
+
+def _is_decoded(packet: mesh_pb2.MeshPacket) -> bool:
+    """Return whether a packet was decoded, not garbled by a wrong key."""
+    if packet.HasField("decoded"):
+        return packet.decoded.portnum in _PORTNUMS
+    # Headers of JSON packets carry no payload
+    return not packet.HasField("encrypted")
+
+
+def _parse_envelope(message: ReceiveMessage) -> tuple[None, mqtt_pb2.ServiceEnvelope]:
+    """Parse a protobuf ServiceEnvelope message."""
+    env = mqtt_pb2.ServiceEnvelope()
+    env.ParseFromString(message.payload)
+    return None, env
+
+
+def _convert_envelope(_packet: None, env: mqtt_pb2.ServiceEnvelope) -> dict[str, Any]:
+    """Convert a parsed ServiceEnvelope."""
+    return convert_envelope_to_json(env)
+
+
+def _convert_map_report(_packet: None, env: mqtt_pb2.ServiceEnvelope) -> dict[str, Any] | None:
+    """Convert a map topic envelope, None if it isn't a map report."""
+    obj = convert_envelope_to_json(env)
+    if obj.get("type") != "mapreport":
+        _LOGGER.debug("Ignoring packet of type %s on map topic", obj.get("type"))
+        return None
+    return obj
+
+
+def _parse_json(message: ReceiveMessage) -> tuple[dict[str, Any], mqtt_pb2.ServiceEnvelope]:
+    """Parse a JSON packet message, taking its channel from the topic."""
+    packet, env = parse_json_packet(message.payload)
+    env.channel_id = json_channel(message.topic)
+    return packet, env
+
 
 class Platform:
     """Platform data storage manager."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        stall_threshold_ms: float = STALL_THRESHOLD_MS,
+        send_duty_cycle: float = SEND_DUTY_CYCLE,
+        send_burst: float = SEND_BURST_AIRTIME,
+        sender_id: int | None = None,
+        map_topic: str | None = None,
+        watchdog: bool = True,
+        flight_recorder: bool = True,
+    ) -> None:
         """Initialize platform storage."""
         self.hass = hass
         self._storage = storage.Store(hass, 1, DOMAIN)
         self._storage_data: dict[str, Any] = {}
+        self._coordinators: dict[int, Coordinator] = {}
+        self._positions = SpatialIndex()
+        # Positions of nodes dropped from the node index are dropped too
+        self._nodes = NodeIndex(NODE_INDEX_MAX_NODES, NODE_INDEX_MAX_AGE, self._positions.remove)
+        self._node_storage = storage.Store(hass, 1, f"{DOMAIN}.nodes")
+        self._node_save_pending = False
+        self._topology = MeshTopology(TOPOLOGY_MAX_AGE)
+        self._routes = RouteCache(ROUTE_CACHE_SIZE)
+        self._reception: OrderedDict[int, ReceptionStats] = OrderedDict()
+        self.stats = PipelineStats()
+        self.profiler = IngestProfiler()
+        # Optional, their hooks are skipped on the hot path when turned off
+        self.watchdog = (
+            CallbackWatchdog(stall_threshold_ms, STALL_TOP_N, STALL_WARN_INTERVAL)
+            if watchdog
+            else None
+        )
+        self.flight_recorder = (
+            FlightRecorder(FLIGHT_RECORDER_SLOTS, FLIGHT_RECORDER_SLOT_SIZE)
+            if flight_recorder
+            else None
+        )
+        self.sender = SendScheduler(hass, send_duty_cycle / 100, send_burst, SEND_QUEUE_MAX)
+        self.sender_id = sender_id
+        self.pki = PkiKeyring(PKI_MAX_PUBLIC_KEYS, PKI_MAX_SHARED_KEYS)
+        self.map_topic = map_topic
+        self._map_reports = MapReports(MAP_REPORT_MAX_NODES, MAP_REPORT_MIN_INTERVAL)
+        self._map_subs: Callable[[], None] | None = None
+        self.messages = TextMessages(
+            hass,
+            hass.config.path(storage.STORAGE_DIR, f"{DOMAIN}.messages"),
+            MESSAGE_LOG_SIZE,
+            MESSAGE_LOG_MAX_CHANNELS,
+            MESSAGE_SEGMENT_LINES,
+            MESSAGE_SEGMENTS,
+            MESSAGE_EVENT_WINDOW,
+        )
+        self.last_save: float | None = None
+
+    @property
+    def storage_path(self) -> str:
+        """Return path of the storage file."""
+        return self._storage.path
+
+    @property
+    def storage_keys(self) -> int:
+        """Return number of stored keys."""
+        return len(self._storage_data)
+
+    @property
+    def coordinators(self) -> list[Coordinator]:
+        """Return loaded coordinators."""
+        return list(self._coordinators.values())
+
+    @property
+    def reception_nodes(self) -> int:
+        """Return number of nodes with reception statistics."""
+        return len(self._reception)
+
+    @property
+    def nodes(self) -> NodeIndex:
+        """Return index of every heard node."""
+        return self._nodes
+
+    @property
+    def positions(self) -> SpatialIndex:
+        """Return spatial index of the latest position of every heard node."""
+        return self._positions
+
+    @property
+    def topology(self) -> MeshTopology:
+        """Return mesh topology graph built from neighbor info."""
+        return self._topology
+
+    @property
+    def routes(self) -> RouteCache:
+        """Return cache of observed routes."""
+        return self._routes
+
+    @property
+    def map_reports(self) -> MapReports:
+        """Return index of map reports."""
+        return self._map_reports
+
+    def reception(self, node_num: int) -> ReceptionStats | None:
+        """Get reception statistics of a node."""
+        return self._reception.get(node_num)
+
+    def fold_duplicate(self, envelope: mqtt_pb2.ServiceEnvelope) -> bool:
+        """Fold a copy of an already dispatched packet into its aggregate.
+
+        Returns True if the envelope is a duplicate and needs no processing.
+        """
+        packet = envelope.packet
+        if not packet.id:
+            return False
+        stats = self._reception.get(getattr(packet, "from"))
+        return stats is not None and stats.fold(
+            packet.id,
+            envelope.gateway_id,
+            packet.rx_snr,
+            packet.rx_rssi,
+            _hops_used(packet),
+            dt.utcnow().timestamp(),
+        )
+
+    def _record_reception(self, envelope: mqtt_pb2.ServiceEnvelope) -> None:
+        """Record the first copy of a packet."""
+        packet = envelope.packet
+        if not packet.id:
+            return
+        node = getattr(packet, "from")
+        if (stats := self._reception.get(node)) is None:
+            stats = self._reception[node] = ReceptionStats(RECEPTION_SLOTS, RECEPTION_WINDOW)
+            if len(self._reception) > RECEPTION_MAX_NODES:
+                self._reception.popitem(last=False)
+        else:
+            self._reception.move_to_end(node)
+        stats.add(
+            packet.id,
+            envelope.gateway_id,
+            packet.rx_snr,
+            packet.rx_rssi,
+            _hops_used(packet),
+            dt.utcnow().timestamp(),
+        )
+
+    async def async_ingest(
+        self,
+        message: ReceiveMessage,
+        stats: PipelineStats,
+        parse: Callable[[ReceiveMessage], tuple[Any, mqtt_pb2.ServiceEnvelope]],
+        convert: Callable[[Any, mqtt_pb2.ServiceEnvelope], dict[str, Any] | None],
+        decrypt: Callable[[mqtt_pb2.ServiceEnvelope], None] | None = None,
+    ) -> None:
+        """Parse, fold, decrypt, convert and dispatch a packet message.
+
+        Shared by the packet topic callbacks, with their instrumentation.
+        parse raises ValueError or DecodeError for malformed payloads,
+        decrypt raises for packets it can't decrypt and convert returns
+        None for packets to ignore.
+        """
+        sampled = stats.count_message()
+        if (recorder := self.flight_recorder) is not None:
+            recorder.record(message.topic, message.payload, time.time())
+        watchdog = self.watchdog
+        profiler = self.profiler if self.profiler.active else None
+        # Most messages are timed once, for the watchdog; stages only when sampled
+        timed = sampled or watchdog is not None
+        start = time.perf_counter_ns() if timed else 0
+        env: mqtt_pb2.ServiceEnvelope | None = None
+        waited = _storage_wait.get() if watchdog is not None else 0
+
+        try:
+            if profiler is not None:
+                profiler.enter()
+            try:
+                packet, env = parse(message)
+            except (DecodeError, ValueError) as err:
+                stats.parse_errors += 1
+                _LOGGER.warning("Failed to parse message on %s: %s", message.topic, err)
+                return
+            if sampled:
+                mark = time.perf_counter_ns()
+                stats.record(STAGE_PARSE, mark - start)
+
+            if self.fold_duplicate(env):
+                stats.duplicates += 1
+                _LOGGER.debug("Folded duplicate packet %d from %s", env.packet.id, env.gateway_id)
+                return
+
+            if decrypt is not None and env.packet.HasField("encrypted"):
+                try:
+                    decrypt(env)
+                    _LOGGER.debug("Decrypted packet successfully")
+                except Exception as err:
+                    stats.decrypt_failures += 1
+                    _LOGGER.warning("Failed to decrypt packet: %s", err)
+                    return
+                if sampled:
+                    now = time.perf_counter_ns()
+                    stats.record(STAGE_DECRYPT, now - mark)
+                    mark = now
+
+            if (obj := convert(packet, env)) is None:
+                return
+            if sampled:
+                stats.record(STAGE_CONVERT, time.perf_counter_ns() - mark)
+            _LOGGER.debug("Converted packet: %s", obj)
+            await self.async_dispatch(env, obj)
+
+        except Exception as err:
+            stats.errors += 1
+            _LOGGER.exception("Error processing message on %s: %s", message.topic, err)
+        finally:
+            if timed:
+                elapsed = time.perf_counter_ns() - start
+                if sampled:
+                    stats.record(STAGE_RECEIVE, elapsed)
+                if watchdog is not None:
+                    # Other tasks run while storage writes are awaited in the executor
+                    blocked = elapsed - (_storage_wait.get() - waited)
+                    if sampled or blocked > watchdog.floor_ns:
+                        watchdog.record_message(
+                            blocked, message.topic, len(message.payload), env, sampled
+                        )
+            if profiler is not None:
+                profiler.leave()
+
+    async def async_dispatch(self, envelope: mqtt_pb2.ServiceEnvelope, obj: dict[str, Any]) -> None:
+        """Dispatch the first decoded copy of a packet to indexes and its node."""
+        if "type" not in obj:
+            if _is_decoded(envelope.packet):
+                # Of a port not converted here; fold its copies all the same
+                self._record_reception(envelope)
+            # Otherwise undecodable with this key; leave it to other subscribers
+            return
+        self._record_reception(envelope)
+        self._nodes.seen(obj["from"], gateway_num(envelope.gateway_id), dt.utcnow().timestamp())
+        self._async_schedule_node_save()
+        if obj["type"] == "mapreport" and not self._accept_map_report(obj):
+            return
+        self.process_packet(obj)
+        if obj["type"] == "text_message":
+            self.messages.async_add(envelope.channel_id, obj, self._nodes.name(obj["from"]))
+        if coordinator := self._coordinators.get(obj["from"]):
+            await coordinator._async_process_message(obj)
+
+    def _accept_map_report(self, obj: dict[str, Any]) -> bool:
+        """Index a map report, return False if it repeats or comes too soon."""
+        node = obj["from"]
+        report = obj["payload"]
+        previous = self._map_reports.get(node)
+        if not self._map_reports.update(node, report, dt.utcnow().timestamp()):
+            _LOGGER.debug("Skipping repeated or early map report of !%08x", node)
+            return False
+        lat_i = report.get("latitude_i")
+        lon_i = report.get("longitude_i")
+        if lat_i and lon_i:
+            # Map positions are coarse; only fill in for nodes without position packets
+            indexed = self._positions.get(node)
+            if indexed is None or (
+                previous is not None
+                and indexed == (previous.get("latitude_i"), previous.get("longitude_i"))
+            ):
+                self._positions.update(node, lat_i, lon_i)
+        return True
+
+    def process_packet(self, obj: dict[str, Any]) -> None:
+        """Update platform-wide indexes from a decoded message of any node."""
+        type_ = obj.get("type")
+        if type_ == "nodeinfo":
+            payload = obj["payload"]
+            if payload.get("id") == f"!{obj['from']:08x}":
+                self._nodes.set_names(obj["from"], payload["longname"], payload["shortname"])
+                if key := payload.get("public_key"):
+                    self.pki.learn_public_key(obj["from"], base64.b64decode(key))
+        elif type_ == "mapreport":
+            payload = obj["payload"]
+            self._nodes.set_names(obj["from"], payload["longname"], payload["shortname"])
+        elif type_ == "position":
+            payload = obj["payload"]
+            lat_i = payload.get("latitude_i")
+            lon_i = payload.get("longitude_i")
+            if lat_i and lon_i:
+                self._positions.update(obj["from"], lat_i, lon_i)
+        elif type_ == "neighborinfo":
+            self._topology.update(
+                obj["from"],
+                ((n["node_id"], n["snr"]) for n in obj["payload"]["neighbors"]),
+                dt.utcnow().timestamp(),
+            )
+        elif type_ == "traceroute":
+            # Replies travel from the traced node back to the requester
+            payload = obj["payload"]
+            now = dt.utcnow().timestamp()
+            self._routes.put_route(
+                obj["to"], obj["from"], payload["route"], payload["snr_towards"], now
+            )
+            # Return routes of JSON replies may come without SNR
+            if payload["route_back"] or payload["snr_back"]:
+                self._routes.put_route(
+                    obj["from"], obj["to"], payload["route_back"], payload["snr_back"], now
+                )
+        elif type_ == "routing":
+            self._routes.put_result(
+                obj["to"], obj["from"], obj["payload"]["error"], dt.utcnow().timestamp()
+            )
+
+    def register_coordinator(self, node_num: int, coordinator: Coordinator) -> None:
+        """Register a loaded coordinator by its node number."""
+        self._coordinators[node_num] = coordinator
+
+    def unregister_coordinator(self, node_num: int, coordinator: Coordinator) -> None:
+        """Unregister a coordinator, unless another one took its place."""
+        if self._coordinators.get(node_num) is coordinator:
+            del self._coordinators[node_num]
+
+    def get_coordinator(self, node_num: int) -> Coordinator | None:
+        """Get coordinator for a node number."""
+        return self._coordinators.get(node_num)
+
+    async def async_subscribe_map(self) -> None:
+        """Subscribe to the map topic, shared by all entries, if configured."""
+        if not self.map_topic or self._map_subs is not None:
+            return
+        try:
+            self._map_subs = await mqtt_client.async_subscribe(
+                self.hass,
+                self.map_topic,
+                self._async_on_map_message,
+                encoding=None,
+            )
+        except Exception as err:
+            _LOGGER.warning("Failed to subscribe to map topic %s: %s", self.map_topic, err)
+            return
+        _LOGGER.info("Subscribed to map topic: %s", self.map_topic)
+
+    def release_map(self) -> None:
+        """Unsubscribe from the map topic once no coordinator is loaded."""
+        if self._map_subs is not None and not self._coordinators:
+            self._map_subs()
+            self._map_subs = None
+
+    async def _async_on_map_message(self, message: ReceiveMessage) -> None:
+        """Handle a map report packet, published unencrypted by gateways."""
+        await self.async_ingest(message, self.stats, _parse_envelope, _convert_map_report)
 
     async def async_load(self) -> None:
         """Load stored data."""
         data = await self._storage.async_load()
         _LOGGER.debug("Loaded stored data: %s", data)
         self._storage_data = data if data else {}
+        if nodes := await self._node_storage.async_load():
+            self._nodes.load_rows(nodes.get("nodes", []), dt.utcnow().timestamp())
+            _LOGGER.debug("Loaded %d heard nodes", len(self._nodes))
+        await self.messages.async_load()
+
+    @callback
+    def _async_schedule_node_save(self) -> None:
+        """Save the node index after a delay, once per batch of changes."""
+        if self._nodes.dirty and not self._node_save_pending:
+            self._node_save_pending = True
+            self._node_storage.async_delay_save(self._node_rows, NODE_INDEX_SAVE_DELAY)
+
+    def _node_rows(self) -> dict[str, Any]:
+        """Return node index data to save."""
+        self._node_save_pending = False
+        return {"nodes": self._nodes.as_rows()}
 
     def get_data(self, key: str, default: dict[str, Any] | None = None) -> dict[str, Any]:
         """Get data for a key."""
@@ -55,7 +517,32 @@ class Platform:
             }
         else:
             self._storage_data.pop(key, None)
+        start = time.perf_counter_ns()
         await self._storage.async_save(self._storage_data)
+        duration = time.perf_counter_ns() - start
+        self.stats.record(STAGE_STORAGE_SAVE, duration)
+        _storage_wait.set(_storage_wait.get() + duration)
+        self.last_save = time.time()
+
+
+def _parse_node_id(node_id: str) -> int:
+    """Return the number of a node ID like !aabbccdd."""
+    if not node_id:
+        raise HomeAssistantError("Node ID is required")
+    try:
+        return int(node_id[1:], 16)
+    except (ValueError, IndexError) as err:
+        raise HomeAssistantError(f"Invalid node ID format: {node_id}") from err
+
+
+def _private_key(config: dict[str, Any]) -> bytes | None:
+    """Return the PKI private key of entry options, if set."""
+    if not (key := config.get(CONF_PRIVATE_KEY, "").strip()):
+        return None
+    try:
+        return decode_key(key)
+    except ValueError as err:
+        raise HomeAssistantError(f"Invalid private key: {err}") from err
 
 
 class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -77,6 +564,51 @@ class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._id = 0
         self._data_subs: Callable[[], None] | None = None
         self._stat_subs: Callable[[], None] | None = None
+        self._track = PositionTrack(TRACK_MAX_POINTS)
+        self.stats = PipelineStats()
+        self.write_policy = WritePolicy.from_options({})
+        self._device_info: dr.DeviceInfo | None = None
+        self._device_key: tuple[Any, ...] | None = None
+
+    def _node_info_key(self) -> tuple[Any, ...]:
+        """Return node info fields shown in the device registry."""
+        # The short name isn't shown, a change of it alone needs no update
+        node_info = self.data.get("nodeinfo", {}) if self.data else {}
+        return (node_info.get("longname", ""), node_info.get("hw_model"))
+
+    @property
+    def device_info(self) -> dr.DeviceInfo:
+        """Return device information shared by all entities of the node."""
+        if self._device_info is None:
+            self._device_key = key = self._node_info_key()
+            longname, hw_model = key
+            self._device_info = dr.DeviceInfo(
+                identifiers={(DOMAIN, self._entry_id)},
+                name=self._entry.title,
+                manufacturer="Meshtastic",
+                model=hw_model or "MQTT Node",
+                sw_version=longname,
+            )
+        return self._device_info
+
+    @callback
+    def _async_update_device(self) -> None:
+        """Update the device registry if node info fields changed."""
+        if self._device_info is None or self._node_info_key() == self._device_key:
+            return
+        self._device_info = None
+        info = self.device_info
+        registry = dr.async_get(self.hass)
+        if device := registry.async_get_device(identifiers=info["identifiers"]):
+            registry.async_update_device(
+                device.id, model=info["model"], sw_version=info["sw_version"]
+            )
+            _LOGGER.debug("Updated device of node %s: %s", self._node_id, info)
+
+    @property
+    def track(self) -> PositionTrack:
+        """Return position track history."""
+        return self._track
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data from storage."""
@@ -84,23 +616,30 @@ class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _async_update_state(self, data: dict[str, Any]) -> None:
         """Update coordinator state."""
-        self.async_set_updated_data({
-            **self.data,
-            **data,
-        })
+        if self.stats.sample_update():
+            start = time.perf_counter_ns()
+            self.async_set_updated_data({
+                **self.data,
+                **data,
+            })
+            self.stats.record(STAGE_STATE_UPDATE, time.perf_counter_ns() - start)
+        else:
+            self.async_set_updated_data({
+                **self.data,
+                **data,
+            })
         await self._platform.async_put_data(self._entry_id, self.data)
 
     async def async_load(self) -> None:
         """Load coordinator configuration and subscribe to MQTT topics."""
         self._config = self._entry.as_dict()["options"]
         self._node_id = self._config.get("id", "")
-        if not self._node_id:
-            raise HomeAssistantError("Node ID is required")
-        
-        try:
-            self._id = int(self._node_id[1:], 16)
-        except (ValueError, IndexError) as err:
-            raise HomeAssistantError(f"Invalid node ID format: {self._node_id}") from err
+        self._id = _parse_node_id(self._node_id)
+        private_key = _private_key(self._config)
+        self._platform.register_coordinator(self._id, self)
+        self._platform.pki.set_private_key(self._id, private_key)
+        self.write_policy = WritePolicy.from_options(self._config)
+        await self._platform.async_subscribe_map()
 
         _LOGGER.debug(
             "Loading coordinator for node %s (ID: %d), config: %s",
@@ -112,34 +651,89 @@ class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         pb_topic = self._config.get("pb_topic")
         if not pb_topic:
             raise HomeAssistantError("Protobuf topic (pb_topic) is required")
+        self._data_subs = await self._async_subscribe_pb(pb_topic)
+
+        if stat_topic := self._config.get("stat_topic"):
+            self._stat_subs = await self._async_subscribe_stat(stat_topic)
+
+    async def async_update_options(self) -> None:
+        """Apply changed entry options without reloading.
+
+        The keys and write policy are swapped in place and data is kept.
+        A topic is only resubscribed if it changed, subscribing to the new
+        topic before dropping the old one; copies received on both are
+        folded as duplicates. The node ID can't be changed by options.
+        """
+        config = self._entry.as_dict()["options"]
+        private_key = _private_key(config)
+        pb_topic = config.get("pb_topic")
+        if not pb_topic:
+            raise HomeAssistantError("Protobuf topic (pb_topic) is required")
+
+        old_config = self._config
+        self._config = config
+        if pb_topic != old_config.get("pb_topic") or self._data_subs is None:
+            try:
+                data_subs = await self._async_subscribe_pb(pb_topic)
+            except HomeAssistantError:
+                self._config = old_config
+                raise
+            if self._data_subs:
+                self._data_subs()
+            self._data_subs = data_subs
+
+        stat_topic = config.get("stat_topic")
+        if stat_topic != old_config.get("stat_topic") or (stat_topic and self._stat_subs is None):
+            stat_subs = await self._async_subscribe_stat(stat_topic) if stat_topic else None
+            if self._stat_subs:
+                self._stat_subs()
+            self._stat_subs = stat_subs
+
+        if config.get(CONF_PRIVATE_KEY) != old_config.get(CONF_PRIVATE_KEY):
+            self._platform.pki.set_private_key(self._id, private_key)
+        self.write_policy = WritePolicy.from_options(config)
+        _LOGGER.debug(
+            "Applied changed options of node %s: %s",
+            self._node_id,
+            sorted(k for k in config.keys() | old_config.keys() if config.get(k) != old_config.get(k)),
+        )
 
+    async def _async_subscribe_pb(self, pb_topic: str) -> Callable[[], None]:
+        """Subscribe to the packet topic, protobuf or JSON by its path."""
+        json_topic = is_json_topic(pb_topic)
         try:
-            self._data_subs = await mqtt_client.async_subscribe(
+            unsubscribe = await mqtt_client.async_subscribe(
                 self.hass,
                 pb_topic,
-                self._async_on_pb_message,
+                self._async_on_json_message if json_topic else self._async_on_pb_message,
                 encoding=None,
             )
-            _LOGGER.info("Subscribed to protobuf topic: %s", pb_topic)
         except Exception as err:
-            _LOGGER.error("Failed to subscribe to protobuf topic %s: %s", pb_topic, err)
+            _LOGGER.error("Failed to subscribe to packet topic %s: %s", pb_topic, err)
             raise HomeAssistantError(f"Failed to subscribe to MQTT topic: {pb_topic}") from err
+        _LOGGER.info("Subscribed to %s topic: %s", "JSON" if json_topic else "protobuf", pb_topic)
+        return unsubscribe
 
-        stat_topic = self._config.get("stat_topic")
-        if stat_topic:
-            try:
-                self._stat_subs = await mqtt_client.async_subscribe(
-                    self.hass,
-                    stat_topic,
-                    self._async_on_stat_message,
-                )
-                _LOGGER.info("Subscribed to status topic: %s", stat_topic)
-            except Exception as err:
-                _LOGGER.warning("Failed to subscribe to status topic %s: %s", stat_topic, err)
+    async def _async_subscribe_stat(self, stat_topic: str) -> Callable[[], None] | None:
+        """Subscribe to the status topic, return None on failure."""
+        try:
+            unsubscribe = await mqtt_client.async_subscribe(
+                self.hass,
+                stat_topic,
+                self._async_on_stat_message,
+            )
+        except Exception as err:
+            _LOGGER.warning("Failed to subscribe to status topic %s: %s", stat_topic, err)
+            return None
+        _LOGGER.info("Subscribed to status topic: %s", stat_topic)
+        return unsubscribe
 
     async def async_unload(self) -> None:
         """Unload coordinator and unsubscribe from MQTT topics."""
         _LOGGER.debug("Unloading coordinator for node %s", self._node_id)
+        self._platform.unregister_coordinator(self._id, self)
+        self._platform.pki.set_private_key(self._id, None)
+        self._platform.release_map()
         
         if self._data_subs:
             self._data_subs()
@@ -162,46 +756,108 @@ class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
             return
 
         type_ = obj["type"]
+        if type_ == "routing":
+            _LOGGER.debug("Routing result is only kept in the route cache")
+            return
+        if type_ == "mapreport":
+            await self._async_apply_map_report(obj["payload"])
+            return
+
         payload = {
             **self.data.get(type_, {}),
             **obj["payload"],
         }
 
         # Ignore nodeinfo about other nodes
-        if type_ == "nodeinfo" and obj.get("sender") != payload.get("id"):
+        if type_ == "nodeinfo" and payload.get("id") != f"!{self._id:08x}":
             _LOGGER.debug("Ignoring nodeinfo about other node")
             return
 
+        if type_ == "position":
+            if payload.pop("source", None):
+                # A position packet replaces the map position, fields and all
+                payload = dict(obj["payload"])
+            if not self._track_position(payload):
+                # Keep the tracked coordinates, update the rest of the position
+                _LOGGER.debug("Position within deadband, keeping coordinates")
+                previous = self.data[type_]
+                payload["latitude_i"] = previous["latitude_i"]
+                payload["longitude_i"] = previous["longitude_i"]
+
         dt_now = dt.now()
         await self._async_update_state({
             type_: payload,
             "last_update": dt_now.timestamp(),
         })
+        if type_ == "nodeinfo":
+            self._async_update_device()
+
+    async def _async_apply_map_report(self, report: dict[str, Any]) -> None:
+        """Keep a map report, filling in node info and position not sent by the node."""
+        data: dict[str, Any] = {"mapreport": report, "last_update": dt.now().timestamp()}
+        node_info = self.data.get("nodeinfo", {})
+        if not node_info.get("longname") or not node_info.get("hw_model"):
+            # Fields of node info packets take precedence
+            data["nodeinfo"] = {
+                "id": f"!{self._id:08x}",
+                "longname": report["longname"],
+                "shortname": report["shortname"],
+                "hw_model": report["hw_model"],
+                **{key: value for key, value in node_info.items() if value},
+            }
+        position = self.data.get("position")
+        if (
+            (position is None or position.get("source") == "mapreport")
+            and report["latitude_i"]
+            and report["longitude_i"]
+        ):
+            # Newer map reports move map positions, position packets replace them
+            data["position"] = {
+                **{key: report[key] for key in ("latitude_i", "longitude_i", "altitude")},
+                "source": "mapreport",
+            }
+        await self._async_update_state(data)
+        if "nodeinfo" in data:
+            self._async_update_device()
+
+    def _track_position(self, payload: dict[str, Any]) -> bool:
+        """Record position in the track, return False if within the deadband.
+
+        The deadband only applies while there are stored coordinates to keep.
+        """
+        lat_i = payload.get("latitude_i")
+        lon_i = payload.get("longitude_i")
+        if not lat_i or not lon_i:
+            return True
+        previous = self.data.get("position", {})
+        distance = self._track.distance_to(lat_i, lon_i)
+        if (
+            distance is not None
+            and distance < POSITION_DEADBAND_M
+            and previous.get("latitude_i")
+            and previous.get("longitude_i")
+        ):
+            return False
+        self._track.append(lat_i, lon_i, dt.utcnow().timestamp())
+        return True
+
+    def _decrypt(self, env: mqtt_pb2.ServiceEnvelope) -> None:
+        """Decrypt a packet in place, raise if it can't be decrypted."""
+        # Direct messages to configured nodes may use PKI instead
+        if not self._platform.pki.try_decrypt(env.packet):
+            try_encrypt_envelope(env, self._config.get("key", "AQ=="))
 
     async def _async_on_pb_message(self, message: ReceiveMessage) -> None:
         """Handle protobuf MQTT message."""
         _LOGGER.debug("Received protobuf message on topic %s", message.topic)
-        
-        try:
-            env = mqtt_pb2.ServiceEnvelope()
-            env.ParseFromString(message.payload)
-            _LOGGER.debug("Parsed envelope: %s", env)
-            
-            if env.packet.HasField("encrypted"):
-                encryption_key = self._config.get("key", "AQ==")
-                try:
-                    try_encrypt_envelope(env, encryption_key)
-                    _LOGGER.debug("Decrypted packet successfully")
-                except Exception as err:
-                    _LOGGER.warning("Failed to decrypt packet: %s", err)
-                    return
+        await self._platform.async_ingest(
+            message, self.stats, _parse_envelope, _convert_envelope, self._decrypt
+        )
 
-            obj = convert_envelope_to_json(env)
-            _LOGGER.debug("Converted to JSON: %s", obj)
-            await self._async_process_message(obj)
-            
-        except Exception as err:
-            _LOGGER.exception("Error parsing protobuf message: %s", err)
+    async def _async_on_json_message(self, message: ReceiveMessage) -> None:
+        """Handle Meshtastic JSON MQTT message, decoded by the gateway."""
+        _LOGGER.debug("Received JSON message on topic %s", message.topic)
+        await self._platform.async_ingest(message, self.stats, _parse_json, convert_json_packet)
 
     async def _async_on_stat_message(self, message: ReceiveMessage) -> None:
         """Handle status MQTT message."""
@@ -215,6 +871,11 @@ class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
         except Exception as err:
             _LOGGER.exception("Error processing status message: %s", err)
 
+    @property
+    def subscriptions(self) -> int:
+        """Return number of active MQTT subscriptions."""
+        return (self._data_subs is not None) + (self._stat_subs is not None)
+
     @property
     def last_update(self) -> datetime | None:
         """Get last update timestamp."""
@@ -232,9 +893,94 @@ class Coordinator(DataUpdateCoordinator[dict[str, Any]]):
 class BaseEntity(CoordinatorEntity[Coordinator]):
     """Base entity for Meshtastic MQTT entities."""
 
+    # Changes of the numeric state within this deadband may be throttled by
+    # the entry's write policy; None opts the entity out of throttling
+    _write_deadband: float | None = None
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize base entity."""
         super().__init__(coordinator)
+        self._throttle = WriteThrottle()
+        self._deferred_write: Callable[[], None] | None = None
+        self._deferred_due = 0.0
+        self._attributes_source: Any = None
+        self._attributes: dict[str, Any] = {}
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a deferred state write."""
+        await super().async_will_remove_from_hass()
+        if self._deferred_write is not None:
+            self._deferred_write()
+            self._deferred_write = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state unless throttled by the write policy."""
+        policy = self.coordinator.write_policy
+        if self._write_deadband is None or not policy.enabled:
+            self._async_write_state()
+            return
+        value = getattr(self, "native_value", None)
+        now = time.monotonic()
+        delay = self._throttle.check(value, policy, self._write_deadband, now)
+        if delay == WRITE_NOW:
+            self._async_write_state(value, now)
+            return
+        if delay is SUPPRESS:
+            if value != self._throttle.value:
+                self.coordinator.stats.suppressed_writes += 1
+            return
+        due = now + delay
+        if self._deferred_write is not None:
+            # The pending write carries this value instead of the one it was set for
+            self.coordinator.stats.suppressed_writes += 1
+            if due >= self._deferred_due:
+                return
+            self._deferred_write()
+        self._deferred_due = due
+        self._deferred_write = async_call_later(self.hass, delay, self._async_deferred_write)
+
+    @callback
+    def _async_deferred_write(self, _now: Any) -> None:
+        """Write the latest state after the minimum or maximum interval."""
+        self._deferred_write = None
+        self._async_write_state(getattr(self, "native_value", None), time.monotonic())
+
+    @callback
+    def _async_write_state(self, value: Any = None, now: float = 0.0) -> None:
+        """Write state and report its duration to the watchdog."""
+        if self._deferred_write is not None:
+            self._deferred_write()
+            self._deferred_write = None
+        stats = self.coordinator.stats
+        if (watchdog := self.coordinator._platform.watchdog) is not None:
+            start = time.perf_counter_ns()
+            self.async_write_ha_state()
+            duration = time.perf_counter_ns() - start
+            sampled = not stats.state_writes % SAMPLE_INTERVAL
+            if sampled or duration > watchdog.floor_ns:
+                watchdog.record_entity(duration, self.entity_id, sampled)
+        else:
+            self.async_write_ha_state()
+        stats.state_writes += 1
+        if self._write_deadband is not None:
+            self._throttle.written(value, now)
+
+    def _cached_attributes(
+        self, source: Any, build: Callable[[Any], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Return attributes built from a coordinator data item.
+
+        Data items are replaced, not mutated, on updates, so attributes are
+        only rebuilt when the item changes; an equal result keeps the
+        previous dict.
+        """
+        if source is not self._attributes_source:
+            attributes = build(source) if source else {}
+            if attributes != self._attributes:
+                self._attributes = attributes
+            self._attributes_source = source
+        return self._attributes
 
     def with_name(self, entity_id: str, name: str) -> "BaseEntity":
         """Configure entity name and unique ID."""
@@ -244,13 +990,6 @@ class BaseEntity(CoordinatorEntity[Coordinator]):
         return self
 
     @property
-    def device_info(self) -> dict[str, Any]:
+    def device_info(self) -> dr.DeviceInfo:
         """Return device information."""
-        node_info = self.coordinator.data.get("nodeinfo", {})
-        return {
-            "identifiers": {(DOMAIN, self.coordinator._entry_id)},
-            "name": self.coordinator._entry.title,
-            "manufacturer": "Meshtastic",
-            "model": "MQTT Node",
-            "sw_version": node_info.get("longname", ""),
-        }
+        return self.coordinator.device_info
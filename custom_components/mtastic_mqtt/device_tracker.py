@@ -9,14 +9,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .coordinator import BaseEntity, Coordinator
 from .constants import DOMAIN
+from .geo import LAT_LON_SCALE
 
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
-# Conversion factor for latitude/longitude (degrees * 1e7)
-LAT_LON_SCALE = 10000000.0
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -32,6 +30,9 @@ async def async_setup_entry(
 class PositionTracker(BaseEntity, device_tracker.TrackerEntity):
     """Device tracker for position."""
 
+    # Change with nearly every fix without being useful in history
+    _unrecorded_attributes = frozenset({"ground_speed", "sats_in_view"})
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize device tracker."""
         super().__init__(coordinator)
@@ -79,12 +80,16 @@ class PositionTracker(BaseEntity, device_tracker.TrackerEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        result: dict[str, Any] = {}
-        if pos := self.coordinator.data.get("position"):
-            for attr in ("altitude", "ground_speed", "sats_in_view"):
-                if value := pos.get(attr):
-                    try:
-                        result[attr] = float(value) if attr in ("altitude", "ground_speed") else int(value)
-                    except (ValueError, TypeError):
-                        _LOGGER.debug("Invalid value for %s: %s", attr, value)
-        return result
+        return self._cached_attributes(self.coordinator.data.get("position"), _position_attributes)
+
+
+def _position_attributes(pos: dict[str, Any]) -> dict[str, Any]:
+    """Return tracker attributes of a position."""
+    result: dict[str, Any] = {}
+    for attr in ("altitude", "ground_speed", "sats_in_view"):
+        if value := pos.get(attr):
+            try:
+                result[attr] = float(value) if attr in ("altitude", "ground_speed") else int(value)
+            except (ValueError, TypeError):
+                _LOGGER.debug("Invalid value for %s: %s", attr, value)
+    return result
@@ -0,0 +1,111 @@
+"""Diagnostics support for the Meshtastic MQTT integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .constants import (
+    DOMAIN,
+    RECEPTION_MAX_NODES,
+    ROUTE_CACHE_SIZE,
+    TRACK_MAX_POINTS,
+)
+from .coordinator import Coordinator, Platform
+from .proto import protobuf_info
+
+import os
+
+TO_REDACT = {"key", "private_key"}
+
+
+def _file_size(path: str) -> int | None:
+    """Return size of a file, if it exists."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _hit_rate(hits: int, misses: int) -> float | None:
+    """Return hit rate of a cache."""
+    if total := hits + misses:
+        return round(hits / total, 3)
+    return None
+
+
+async def _async_platform_diagnostics(hass: HomeAssistant, platform: Platform) -> dict[str, Any]:
+    """Return diagnostics of the platform shared by all entries."""
+    coordinators = platform.coordinators
+    routes = platform.routes
+    topology = platform.topology
+    return {
+        "coordinators": len(coordinators),
+        "subscriptions": sum(c.subscriptions for c in coordinators),
+        "caches": {
+            "nodes": platform.nodes.as_dict(),
+            "positions": {"size": len(platform.positions)},
+            "topology": {
+                "nodes": len(topology),
+                "edges": topology.edge_count,
+                "components": topology.component_count,
+            },
+            "routes": {
+                "size": len(routes),
+                "max_size": ROUTE_CACHE_SIZE,
+                "hit_rate": _hit_rate(routes.hits, routes.misses),
+            },
+            "reception": {
+                "nodes": platform.reception_nodes,
+                "max_nodes": RECEPTION_MAX_NODES,
+            },
+            "map_reports": platform.map_reports.as_dict(),
+            "messages": platform.messages.as_dict(),
+        },
+        "watchdog": platform.watchdog.as_dict() if platform.watchdog else None,
+        "sender": {"sender_id": platform.sender_id, **platform.sender.as_dict()},
+        "pki": platform.pki.as_dict(),
+        "storage": {
+            "keys": platform.storage_keys,
+            "size": await hass.async_add_executor_job(_file_size, platform.storage_path),
+            "last_save": platform.last_save,
+            "save": platform.stats.stages["storage_save"].as_dict(),
+        },
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    platform: Platform = hass.data[DOMAIN]
+    result: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "runtime": {
+            "protobuf": protobuf_info(),
+        },
+        "platform": await _async_platform_diagnostics(hass, platform),
+    }
+    coordinator: Coordinator | None = entry.runtime_data
+    if coordinator is not None:
+        result["coordinator"] = {
+            "node_id": coordinator._node_id,
+            "subscriptions": coordinator.subscriptions,
+            "data_keys": sorted(coordinator.data or {}),
+            "last_update": coordinator.data.get("last_update") if coordinator.data else None,
+            "track": {"points": len(coordinator.track), "max_points": TRACK_MAX_POINTS},
+            "pipeline": coordinator.stats.as_dict(),
+            "write_policy": coordinator.write_policy._asdict(),
+            # Bulky lists kept out of entity attributes and the recorder
+            "neighbors": [
+                {"node_id": f"!{n['node_id']:08x}", "snr": n["snr"]}
+                for n in coordinator.data.get("neighborinfo", {}).get("neighbors", [])
+            ] if coordinator.data else [],
+            "traceroute": coordinator.data.get("traceroute") if coordinator.data else None,
+        }
+    return result
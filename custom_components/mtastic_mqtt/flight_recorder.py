@@ -0,0 +1,68 @@
+"""Ring buffer of the last raw MQTT messages."""
+from __future__ import annotations
+
+from array import array
+
+from .capture import CaptureRecord, write_capture
+
+
+class FlightRecorder:
+    """Fixed-size ring of the last raw payloads, topics and receive times.
+
+    Slots hold the received payload bytes themselves, which are immutable,
+    so recording neither copies nor allocates. Payloads larger than
+    slot_size are skipped, bounding the memory kept. The same payload
+    delivered to several subscriptions in a row is recorded once.
+    """
+
+    def __init__(self, slots: int, slot_size: int) -> None:
+        """Initialize an empty recorder."""
+        self._slots = slots
+        self._slot_size = slot_size
+        self._payloads: list[bytes | None] = [None] * slots
+        self._times = array("d", bytes(8 * slots))
+        self._topics: list[str | None] = [None] * slots
+        self._pos = 0
+        self._count = 0
+        self._last: bytes | None = None
+        self.oversized = 0
+
+    def __len__(self) -> int:
+        """Return number of recorded messages."""
+        return self._count
+
+    def record(self, topic: str, payload: bytes, timestamp: float) -> None:
+        """Record a raw message."""
+        if payload is self._last:
+            return
+        self._last = payload
+        if len(payload) > self._slot_size:
+            self.oversized += 1
+            return
+        pos = self._pos
+        self._payloads[pos] = payload
+        self._times[pos] = timestamp
+        self._topics[pos] = topic
+        pos += 1
+        if pos < self._slots:
+            self._pos = pos
+            if self._count < pos:
+                self._count = pos
+        else:
+            self._pos = 0
+            self._count = self._slots
+
+    def snapshot(self) -> list[CaptureRecord]:
+        """Return recorded messages, oldest first."""
+        slots = self._slots
+        result: list[CaptureRecord] = []
+        for step in range(self._count):
+            pos = (self._pos - self._count + step) % slots
+            result.append(CaptureRecord(self._times[pos], self._topics[pos], self._payloads[pos]))
+        return result
+
+
+def write_snapshot(records: list[CaptureRecord], path: str) -> int:
+    """Write a snapshot to a capture file (blocking)."""
+    with open(path, "wb") as file:
+        return write_capture(file, records)
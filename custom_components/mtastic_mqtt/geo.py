@@ -0,0 +1,180 @@
+"""Geographic helpers for Meshtastic positions."""
+from __future__ import annotations
+
+from typing import Sequence
+
+import math
+
+# Conversion factor for latitude/longitude (degrees * 1e7)
+LAT_LON_SCALE = 10000000.0
+
+EARTH_RADIUS_M = 6371008.8
+
+_RAD_PER_UNIT = math.pi / 180.0 / LAT_LON_SCALE
+
+
+def haversine_m(lat1_i: int, lon1_i: int, lat2_i: int, lon2_i: int) -> float:
+    """Return great-circle distance in meters between two scaled positions."""
+    lat1 = lat1_i * _RAD_PER_UNIT
+    lat2 = lat2_i * _RAD_PER_UNIT
+    dlat = lat2 - lat1
+    dlon = (lon2_i - lon1_i) * _RAD_PER_UNIT
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def simplify_track(lats: Sequence[int], lons: Sequence[int], tolerance_m: float) -> list[int]:
+    """Return indices of points kept by Douglas-Peucker simplification.
+
+    Points are projected onto a local equirectangular plane, which is accurate
+    enough for the short tracks a node produces.
+    """
+    count = len(lats)
+    if count <= 2 or tolerance_m <= 0:
+        return list(range(count))
+
+    kx = math.cos(lats[0] * _RAD_PER_UNIT) * EARTH_RADIUS_M * _RAD_PER_UNIT
+    ky = EARTH_RADIUS_M * _RAD_PER_UNIT
+    xs = [lon * kx for lon in lons]
+    ys = [lat * ky for lat in lats]
+
+    keep = bytearray(count)
+    keep[0] = keep[-1] = 1
+    tolerance_sq = tolerance_m * tolerance_m
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = xs[first], ys[first]
+        dx, dy = xs[last] - x1, ys[last] - y1
+        seg_sq = dx * dx + dy * dy
+        max_sq = 0.0
+        index = first
+        for i in range(first + 1, last):
+            px, py = xs[i] - x1, ys[i] - y1
+            if seg_sq > 0:
+                t = max(0.0, min(1.0, (px * dx + py * dy) / seg_sq))
+                px -= t * dx
+                py -= t * dy
+            dist_sq = px * px + py * py
+            if dist_sq > max_sq:
+                max_sq = dist_sq
+                index = i
+        if max_sq > tolerance_sq:
+            keep[index] = 1
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [i for i in range(count) if keep[i]]
+
+
+class SpatialIndex:
+    """Uniform grid index of the latest position of each node."""
+
+    def __init__(self, cell_deg: float = 0.05) -> None:
+        """Initialize an empty index with square cells of cell_deg degrees."""
+        self._cell = max(1, int(cell_deg * LAT_LON_SCALE))
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._nodes: dict[int, tuple[int, int, tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        """Return number of indexed nodes."""
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        """Return whether a node is indexed."""
+        return node in self._nodes
+
+    def get(self, node: int) -> tuple[int, int] | None:
+        """Return the indexed position of a node."""
+        if entry := self._nodes.get(node):
+            return entry[0], entry[1]
+        return None
+
+    def update(self, node: int, lat_i: int, lon_i: int) -> None:
+        """Insert or move a node."""
+        key = (lat_i // self._cell, lon_i // self._cell)
+        if old := self._nodes.get(node):
+            if old[2] != key:
+                self._discard(node, old[2])
+                self._cells.setdefault(key, set()).add(node)
+        else:
+            self._cells.setdefault(key, set()).add(node)
+        self._nodes[node] = (lat_i, lon_i, key)
+
+    def remove(self, node: int) -> None:
+        """Remove a node from the index."""
+        if old := self._nodes.pop(node, None):
+            self._discard(node, old[2])
+
+    def _discard(self, node: int, key: tuple[int, int]) -> None:
+        cell = self._cells[key]
+        cell.discard(node)
+        if not cell:
+            del self._cells[key]
+
+    def _candidates(self, min_lat_i: int, max_lat_i: int, min_lon_i: int, max_lon_i: int):
+        """Yield (node, lat_i, lon_i) for nodes in cells overlapping a box."""
+        lat_lo, lat_hi = min_lat_i // self._cell, max_lat_i // self._cell
+        lon_lo, lon_hi = min_lon_i // self._cell, max_lon_i // self._cell
+        span = (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1)
+        if span > len(self._cells):
+            keys = [
+                key for key in self._cells
+                if lat_lo <= key[0] <= lat_hi and lon_lo <= key[1] <= lon_hi
+            ]
+        else:
+            keys = [
+                (lat, lon)
+                for lat in range(lat_lo, lat_hi + 1)
+                for lon in range(lon_lo, lon_hi + 1)
+                if (lat, lon) in self._cells
+            ]
+        nodes = self._nodes
+        for key in keys:
+            for node in self._cells[key]:
+                lat_i, lon_i, _ = nodes[node]
+                yield node, lat_i, lon_i
+
+    def _boxes(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> list[tuple[int, int, int, int]]:
+        """Split a box in degrees into scaled boxes not crossing the antimeridian."""
+        min_lat_i = int(max(-90.0, min_lat) * LAT_LON_SCALE)
+        max_lat_i = int(min(90.0, max_lat) * LAT_LON_SCALE)
+        if max_lon - min_lon >= 360.0:
+            return [(min_lat_i, max_lat_i, int(-180 * LAT_LON_SCALE), int(180 * LAT_LON_SCALE))]
+        min_lon = (min_lon + 180.0) % 360.0 - 180.0
+        max_lon = (max_lon + 180.0) % 360.0 - 180.0
+        if min_lon <= max_lon:
+            return [(min_lat_i, max_lat_i, int(min_lon * LAT_LON_SCALE), int(max_lon * LAT_LON_SCALE))]
+        return [
+            (min_lat_i, max_lat_i, int(min_lon * LAT_LON_SCALE), int(180 * LAT_LON_SCALE)),
+            (min_lat_i, max_lat_i, int(-180 * LAT_LON_SCALE), int(max_lon * LAT_LON_SCALE)),
+        ]
+
+    def query_box(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> list[int]:
+        """Return nodes inside a box given in degrees.
+
+        A box with min_lon greater than max_lon crosses the antimeridian.
+        """
+        result: list[int] = []
+        for lat_lo, lat_hi, lon_lo, lon_hi in self._boxes(min_lat, max_lat, min_lon, max_lon):
+            for node, lat_i, lon_i in self._candidates(lat_lo, lat_hi, lon_lo, lon_hi):
+                if lat_lo <= lat_i <= lat_hi and lon_lo <= lon_i <= lon_hi:
+                    result.append(node)
+        return result
+
+    def query_radius(self, latitude: float, longitude: float, radius_m: float) -> list[tuple[int, float]]:
+        """Return (node, distance) pairs within radius_m, nearest first."""
+        dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        cos_lat = math.cos(math.radians(min(89.9, abs(latitude) + dlat)))
+        dlon = 360.0 if latitude + dlat >= 90.0 or latitude - dlat <= -90.0 else min(360.0, dlat / cos_lat)
+        lat_i = int(latitude * LAT_LON_SCALE)
+        lon_i = int(longitude * LAT_LON_SCALE)
+        result: list[tuple[int, float]] = []
+        boxes = self._boxes(latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon)
+        for lat_lo, lat_hi, lon_lo, lon_hi in boxes:
+            for node, node_lat_i, node_lon_i in self._candidates(lat_lo, lat_hi, lon_lo, lon_hi):
+                distance = haversine_m(lat_i, lon_i, node_lat_i, node_lon_i)
+                if distance <= radius_m:
+                    result.append((node, distance))
+        result.sort(key=lambda item: item[1])
+        return result
@@ -0,0 +1,63 @@
+"""Index of map reports published by gateways on the map topic."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+
+class MapReports:
+    """Latest map report of every reporting node, bounded in size.
+
+    Gateways report their metadata and coarse position periodically. A
+    report that repeats the last accepted one only refreshes the node's
+    place in the LRU, and a changed report is accepted at most once per
+    interval, so a misconfigured gateway can't flood entity updates.
+    """
+
+    def __init__(self, max_nodes: int, min_interval: float) -> None:
+        """Initialize an empty index."""
+        self._max_nodes = max_nodes
+        self._min_interval = min_interval
+        # node -> [report, time of acceptance]
+        self._reports: OrderedDict[int, list[Any]] = OrderedDict()
+        self.accepted = 0
+        self.repeated = 0
+        self.limited = 0
+
+    def __len__(self) -> int:
+        """Return number of reporting nodes."""
+        return len(self._reports)
+
+    def get(self, node: int) -> dict[str, Any] | None:
+        """Return the last accepted report of a node."""
+        if entry := self._reports.get(node):
+            return entry[0]
+        return None
+
+    def update(self, node: int, report: dict[str, Any], now: float) -> bool:
+        """Store a report, return False if it repeats or comes too soon."""
+        if (entry := self._reports.get(node)) is not None:
+            self._reports.move_to_end(node)
+            if entry[0] == report:
+                self.repeated += 1
+                return False
+            if now - entry[1] < self._min_interval:
+                self.limited += 1
+                return False
+            entry[0], entry[1] = report, now
+        else:
+            self._reports[node] = [report, now]
+            if len(self._reports) > self._max_nodes:
+                self._reports.popitem(last=False)
+        self.accepted += 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return index state for diagnostics."""
+        return {
+            "nodes": len(self._reports),
+            "max_nodes": self._max_nodes,
+            "accepted": self.accepted,
+            "repeated": self.repeated,
+            "limited": self.limited,
+        }
@@ -0,0 +1,190 @@
+"""Conversion of packets published on Meshtastic JSON topics."""
+from __future__ import annotations
+
+from typing import Any, Callable, Tuple
+
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .protobuf import mesh_pb2, mqtt_pb2
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fields of the internal payloads, zero when a JSON packet omits them like
+# unset protobuf fields
+_POSITION = ("latitude_i", "longitude_i", "altitude", "ground_speed", "sats_in_view")
+_DEVICE_METRICS = ("battery_level", "voltage", "channel_utilization", "air_util_tx")
+_ENVIRONMENT_METRICS = (
+    "temperature",
+    "relative_humidity",
+    "barometric_pressure",
+    "gas_resistance",
+    "radiation",
+)
+_POWER_METRICS = tuple(
+    f"ch{channel}_{quantity}" for channel in range(1, 9) for quantity in ("voltage", "current")
+)
+# Unknown hop SNR, INT8_MIN in quarter dB
+_SNR_UNKNOWN = -32.0
+# Device metrics share "voltage" with environment metrics of power sensors
+_DEVICE_ONLY = ("battery_level", "channel_utilization", "air_util_tx", "uptime_seconds")
+
+
+def is_json_topic(topic: str) -> bool:
+    """Return whether a topic carries JSON packets (msh/.../2/json/...)."""
+    return "/2/json/" in topic
+
+
+def json_channel(topic: str) -> str:
+    """Return the channel name of a JSON topic."""
+    return topic.partition("/2/json/")[2].split("/", 1)[0]
+
+
+def parse_json_packet(data: bytes | str) -> tuple[dict[str, Any], mqtt_pb2.ServiceEnvelope]:
+    """Decode a JSON packet and build an envelope of its header fields.
+
+    The envelope has no payload; it carries what duplicate folding,
+    reception statistics and the watchdog read from protobuf packets.
+    Raises ValueError for invalid JSON or header fields.
+    """
+    try:
+        packet = json_loads(data)
+    except JSON_DECODE_EXCEPTIONS as err:
+        raise ValueError(f"Invalid JSON: {err}") from err
+    if not isinstance(packet, dict):
+        raise ValueError("JSON packet is not an object")
+
+    envelope = mqtt_pb2.ServiceEnvelope()
+    header = envelope.packet
+    try:
+        setattr(header, "from", packet["from"])
+        header.to = packet.get("to", 0)
+        header.id = packet.get("id", 0)
+        header.channel = packet.get("channel", 0)
+        header.rx_time = packet.get("timestamp", 0)
+        header.rx_snr = packet.get("snr", 0)
+        header.rx_rssi = packet.get("rssi", 0)
+        if hop_start := packet.get("hop_start", 0):
+            header.hop_start = hop_start
+            header.hop_limit = max(0, hop_start - packet.get("hops_away", 0))
+        envelope.gateway_id = packet.get("sender", "")
+    except (KeyError, TypeError, ValueError) as err:
+        raise ValueError(f"Invalid JSON packet header: {err!r}") from err
+    return packet, envelope
+
+
+def _fields(payload: dict[str, Any], names: tuple[str, ...]) -> dict[str, Any]:
+    return {name: payload.get(name, 0) for name in names}
+
+
+def _as_position(payload: dict[str, Any], packet: dict[str, Any]) -> Tuple[str | None, dict[str, Any]]:
+    """Convert a JSON position to the internal payload."""
+    return ("position", _fields(payload, _POSITION))
+
+
+def _as_telemetry(payload: dict[str, Any], packet: dict[str, Any]) -> Tuple[str | None, dict[str, Any]]:
+    """Convert JSON telemetry, telling variants apart by their fields."""
+    if any(name in payload for name in _DEVICE_ONLY):
+        return ("device_metrics", _fields(payload, _DEVICE_METRICS))
+    if any(name in payload for name in _ENVIRONMENT_METRICS):
+        return ("environment_metrics", _fields(payload, _ENVIRONMENT_METRICS))
+    if any(name in payload for name in _POWER_METRICS):
+        return ("power_metrics", _fields(payload, _POWER_METRICS))
+    return (None, {})
+
+
+def _as_node_info(payload: dict[str, Any], packet: dict[str, Any]) -> Tuple[str | None, dict[str, Any]]:
+    """Convert JSON node info to the internal payload."""
+    result: dict[str, Any] = {
+        "id": payload.get("id", ""),
+        "shortname": payload.get("shortname", ""),
+        "longname": payload.get("longname", ""),
+    }
+    if hw_model := payload.get("hardware"):
+        try:
+            result["hw_model"] = mesh_pb2.HardwareModel.Name(hw_model)
+        except ValueError:
+            result["hw_model"] = str(hw_model)
+    return ("nodeinfo", result)
+
+
+def _as_neighbor_info(payload: dict[str, Any], packet: dict[str, Any]) -> Tuple[str | None, dict[str, Any]]:
+    """Convert JSON neighbor info to the internal payload."""
+    neighbors = [
+        {"node_id": n["node_id"], "snr": n.get("snr", 0)} for n in payload.get("neighbors", ())
+    ]
+    return ("neighborinfo", {"neighbors": neighbors, "neighbors_count": len(neighbors)})
+
+
+def _as_text_message(payload: Any, packet: dict[str, Any]) -> Tuple[str | None, dict[str, Any]]:
+    """Convert a JSON text message to the internal payload."""
+    text = payload.get("text") if isinstance(payload, dict) else payload
+    if not isinstance(text, str):
+        return (None, {})
+    return ("text_message", {"text": text, "rx_time": packet.get("timestamp", 0)})
+
+
+def _inner_route(route: list[int], first: int, last: int) -> list[int]:
+    """Return the intermediate nodes of a route that may list its endpoints."""
+    if len(route) >= 2 and route[0] == first and route[-1] == last:
+        return route[1:-1]
+    return route
+
+
+def _route_snr(values: Any) -> list[float | None]:
+    """Convert JSON route SNR values (dB, INT8_MIN / 4 if unknown)."""
+    return [None if value == _SNR_UNKNOWN else value for value in values]
+
+
+def _as_traceroute(payload: dict[str, Any], packet: dict[str, Any]) -> Tuple[str | None, dict[str, Any]]:
+    """Convert a JSON traceroute reply; older firmware sends no hop SNR."""
+    requester, target = packet.get("to", 0), packet["from"]
+    return ("traceroute", {
+        "route": _inner_route(list(payload.get("route", ())), requester, target),
+        "snr_towards": _route_snr(payload.get("snr_towards", ())),
+        "route_back": _inner_route(list(payload.get("route_back", ())), target, requester),
+        "snr_back": _route_snr(payload.get("snr_back", ())),
+        "rx_time": packet.get("timestamp", 0),
+    })
+
+
+_converters: dict[str, Callable[[Any, dict[str, Any]], Tuple[str | None, dict[str, Any]]]] = {
+    "position": _as_position,
+    "telemetry": _as_telemetry,
+    "nodeinfo": _as_node_info,
+    "neighborinfo": _as_neighbor_info,
+    "text": _as_text_message,
+    "traceroute": _as_traceroute,
+}
+
+
+def convert_json_packet(packet: dict[str, Any], envelope: mqtt_pb2.ServiceEnvelope) -> dict[str, Any]:
+    """Convert a JSON packet to the dict convert_envelope_to_json returns."""
+    header = envelope.packet
+    result: dict[str, Any] = {
+        "from": getattr(header, "from"),
+        "to": header.to,
+        "id": header.id,
+        "sender": envelope.gateway_id,
+        "rx_snr": header.rx_snr,
+        "rx_rssi": header.rx_rssi,
+        "hop_start": header.hop_start,
+        "hop_limit": header.hop_limit,
+    }
+
+    if (converter := _converters.get(packet.get("type", ""))) is None:
+        _LOGGER.debug("Unsupported JSON packet type: %s", packet.get("type"))
+        return result
+
+    try:
+        type_, payload = converter(packet.get("payload") or {}, packet)
+    except (AttributeError, KeyError, TypeError) as err:
+        _LOGGER.debug("Invalid %s JSON payload: %r", packet.get("type"), err)
+        return result
+    if type_ and payload:
+        result.update({
+            "type": type_,
+            "payload": payload,
+        })
+    return result
@@ -0,0 +1,273 @@
+"""Log of received text messages with batched events."""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from operator import itemgetter
+from typing import Any, Callable
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .constants import BROADCAST_NUM, EVENT_TEXT_MESSAGES
+
+import heapq
+import json
+import logging
+import os
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+_SEGMENT_SUFFIX = ".jsonl"
+
+
+class MessageLog:
+    """Ring of the latest text messages of every channel.
+
+    The least recently active channel is dropped once there are more than
+    max_channels. Messages are numbered across channels, so a page of
+    older messages continues before the number of the last one shown.
+    """
+
+    def __init__(self, size: int, max_channels: int) -> None:
+        """Initialize an empty log."""
+        self._size = size
+        self._max_channels = max_channels
+        self._channels: OrderedDict[str, deque[dict[str, Any]]] = OrderedDict()
+        self.seq = 0
+
+    def __len__(self) -> int:
+        """Return number of logged messages."""
+        return sum(len(ring) for ring in self._channels.values())
+
+    @property
+    def channels(self) -> list[str]:
+        """Return channels with messages, least recently active first."""
+        return list(self._channels)
+
+    def _ring(self, channel: str) -> deque[dict[str, Any]]:
+        if (ring := self._channels.get(channel)) is None:
+            ring = self._channels[channel] = deque(maxlen=self._size)
+            if len(self._channels) > self._max_channels:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(channel)
+        return ring
+
+    def add(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Number and log a message, return it."""
+        self.seq += 1
+        message["seq"] = self.seq
+        self._ring(message["channel"]).append(message)
+        return message
+
+    def restore(self, messages: Iterable[dict[str, Any]]) -> None:
+        """Log saved messages in the order they were received."""
+        for message in messages:
+            self._ring(message["channel"]).append(message)
+            self.seq = max(self.seq, message["seq"])
+
+    def page(
+        self, channel: str | None = None, before: int | None = None, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """Return up to limit messages numbered below before, newest first."""
+        if channel is not None:
+            ring = self._channels.get(channel)
+            newest: Iterator[dict[str, Any]] = reversed(ring) if ring else iter(())
+        else:
+            newest = heapq.merge(
+                *(reversed(ring) for ring in self._channels.values()),
+                key=itemgetter("seq"),
+                reverse=True,
+            )
+        result: list[dict[str, Any]] = []
+        for message in newest:
+            if before is not None and message["seq"] >= before:
+                continue
+            result.append(message)
+            if len(result) >= limit:
+                break
+        return result
+
+
+class MessageSegments:
+    """Append-only segment files of logged messages, one JSON line each.
+
+    A new segment is started every segment_lines messages and only the
+    newest max_segments are kept. Methods do blocking I/O.
+    """
+
+    def __init__(self, path: str, segment_lines: int, max_segments: int) -> None:
+        """Initialize for a directory of segments."""
+        self.path = path
+        self._segment_lines = segment_lines
+        self._max_segments = max_segments
+        self._index = 0
+        self._lines = 0
+
+    def _segments(self) -> list[int]:
+        """Return indexes of existing segments, oldest first."""
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in names
+            if name.endswith(_SEGMENT_SUFFIX) and name[: -len(_SEGMENT_SUFFIX)].isdigit()
+        )
+
+    def _file(self, index: int) -> str:
+        return os.path.join(self.path, f"{index:08d}{_SEGMENT_SUFFIX}")
+
+    def load(self) -> list[dict[str, Any]]:
+        """Return saved messages, oldest first, skipping damaged lines."""
+        messages: list[dict[str, Any]] = []
+        segments = self._segments()
+        for index in segments:
+            with open(self._file(index), encoding="utf-8") as file:
+                lines = 0
+                for line in file:
+                    lines += 1
+                    try:
+                        messages.append(json.loads(line))
+                    except ValueError:
+                        _LOGGER.debug("Skipping damaged line in message segment %d", index)
+            self._index, self._lines = index, lines
+        return messages
+
+    def append(self, messages: list[dict[str, Any]]) -> None:
+        """Append messages, starting new segments and dropping old ones."""
+        os.makedirs(self.path, exist_ok=True)
+        pending = list(messages)
+        while pending:
+            if self._lines >= self._segment_lines or not self._index:
+                self._index += 1
+                self._lines = 0
+                for index in self._segments():
+                    if index <= self._index - self._max_segments:
+                        os.remove(self._file(index))
+            count = min(len(pending), self._segment_lines - self._lines)
+            with open(self._file(self._index), "a", encoding="utf-8") as file:
+                file.writelines(
+                    json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n"
+                    for message in pending[:count]
+                )
+            self._lines += count
+            del pending[:count]
+
+
+class TextMessages:
+    """Received text messages, their events and their persistence.
+
+    The first message after a quiet window is fired as an event right
+    away; messages arriving within the window of an event are collected
+    and fired together at its end, so a burst costs one bus event per
+    window. Each batch is appended to the segments in the executor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        size: int,
+        max_channels: int,
+        segment_lines: int,
+        max_segments: int,
+        window: float,
+    ) -> None:
+        """Initialize an empty log."""
+        self.hass = hass
+        self.log = MessageLog(size, max_channels)
+        self._segments = MessageSegments(path, segment_lines, max_segments)
+        self._window = window
+        self._pending: list[dict[str, Any]] = []
+        self._unwritten: list[dict[str, Any]] = []
+        self._timer: Callable[[], None] | None = None
+        self._writing = False
+        self.received = 0
+        self.events = 0
+        self.write_failures = 0
+
+    async def async_load(self) -> None:
+        """Restore saved messages and save unwritten ones on shutdown."""
+        try:
+            messages = await self.hass.async_add_executor_job(self._segments.load)
+        except OSError as err:
+            _LOGGER.warning("Failed to load text messages from %s: %s", self._segments.path, err)
+        else:
+            self.log.restore(messages)
+            _LOGGER.debug("Loaded %d text messages", len(self.log))
+        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write)
+
+    @callback
+    def async_add(
+        self, channel: str, obj: dict[str, Any], name: str | None = None
+    ) -> dict[str, Any]:
+        """Log a decoded text message and schedule its event."""
+        to = obj["to"]
+        message = self.log.add({
+            "channel": channel,
+            "from": f"!{obj['from']:08x}",
+            "name": name,
+            "to": "^all" if to == BROADCAST_NUM else f"!{to:08x}",
+            "gateway": obj["sender"],
+            "rx_time": obj["payload"]["rx_time"] or int(time.time()),
+            "text": obj["payload"]["text"],
+        })
+        self.received += 1
+        self._pending.append(message)
+        self._unwritten.append(message)
+        if self._timer is None:
+            self._async_fire()
+        return message
+
+    @callback
+    def _async_fire(self, _now: Any = None) -> None:
+        """Fire pending messages as one event and start a new window."""
+        self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.hass.bus.async_fire(EVENT_TEXT_MESSAGES, {"messages": batch})
+        self.events += 1
+        self._timer = async_call_later(self.hass, self._window, self._async_fire)
+        if not self._writing:
+            self._writing = True
+            self.hass.async_create_task(self._async_write())
+
+    async def _async_write(self) -> None:
+        """Append unwritten messages to the segments, one batch at a time."""
+        try:
+            while self._unwritten:
+                batch, self._unwritten = self._unwritten, []
+                try:
+                    await self.hass.async_add_executor_job(self._segments.append, batch)
+                except OSError as err:
+                    self.write_failures += 1
+                    _LOGGER.warning("Failed to save text messages to %s: %s", self._segments.path, err)
+        finally:
+            self._writing = False
+
+    async def _async_final_write(self, _event: Event) -> None:
+        """Fire and save messages still waiting for their window."""
+        if self._timer is not None:
+            self._timer()
+        self._async_fire()
+        if self._timer is not None:
+            self._timer()
+            self._timer = None
+        if not self._writing:
+            await self._async_write()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return log state for diagnostics."""
+        return {
+            "channels": len(self.log.channels),
+            "messages": len(self.log),
+            "received": self.received,
+            "events": self.events,
+            "write_failures": self.write_failures,
+        }
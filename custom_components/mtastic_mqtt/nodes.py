@@ -0,0 +1,138 @@
+"""Index of every heard node, bounded in size and age."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class NodeInfo:
+    """Names and last reception of a heard node."""
+
+    __slots__ = ("longname", "shortname", "last_seen", "gateway")
+
+    def __init__(
+        self, longname: str, shortname: str, last_seen: float, gateway: int | None
+    ) -> None:
+        """Initialize a node entry."""
+        self.longname = longname
+        self.shortname = shortname
+        self.last_seen = last_seen
+        self.gateway = gateway
+
+    @property
+    def name(self) -> str | None:
+        """Return the long name, or the short name if there is none."""
+        return self.longname or self.shortname or None
+
+
+def gateway_num(gateway_id: str) -> int | None:
+    """Return the node number of a gateway ID like !aabbccdd."""
+    if len(gateway_id) == 9 and gateway_id[0] == "!":
+        try:
+            return int(gateway_id[1:], 16)
+        except ValueError:
+            pass
+    return None
+
+
+class NodeIndex:
+    """Every heard node by number, in least recently heard order.
+
+    A public mesh may have tens of thousands of nodes, so the index holds
+    at most max_nodes entries, evicting the least recently heard one, and
+    drops nodes not heard for max_age. Both are found at the front of the
+    order, keeping upkeep O(1) per packet. on_remove is called with each
+    evicted or expired node, so other per-node indexes stay bounded too.
+    Rows are saved without keys as [node, longname, shortname, last_seen,
+    gateway].
+    """
+
+    def __init__(
+        self, max_nodes: int, max_age: float, on_remove: Callable[[int], None] | None = None
+    ) -> None:
+        """Initialize an empty index."""
+        self._max_nodes = max_nodes
+        self._max_age = max_age
+        self._on_remove = on_remove
+        self._nodes: OrderedDict[int, NodeInfo] = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        """Return number of indexed nodes."""
+        return len(self._nodes)
+
+    def get(self, node: int) -> NodeInfo | None:
+        """Return the entry of a node."""
+        return self._nodes.get(node)
+
+    def name(self, node: int) -> str | None:
+        """Return the name of a node, if known."""
+        if info := self._nodes.get(node):
+            return info.name
+        return None
+
+    def seen(self, node: int, gateway: int | None, now: float) -> None:
+        """Record a packet from a node uplinked by a gateway."""
+        if (info := self._nodes.get(node)) is None:
+            self._nodes[node] = NodeInfo("", "", now, gateway)
+            if len(self._nodes) > self._max_nodes:
+                evicted, _ = self._nodes.popitem(last=False)
+                self.evicted += 1
+                if self._on_remove is not None:
+                    self._on_remove(evicted)
+        else:
+            self._nodes.move_to_end(node)
+            info.last_seen = now
+            info.gateway = gateway
+        self._expire(now)
+        self.dirty = True
+
+    def set_names(self, node: int, longname: str, shortname: str) -> None:
+        """Set the names of a heard node."""
+        if (info := self._nodes.get(node)) is None:
+            return
+        if longname and longname != info.longname:
+            info.longname = longname
+            self.dirty = True
+        if shortname and shortname != info.shortname:
+            info.shortname = shortname
+            self.dirty = True
+
+    def _expire(self, now: float) -> None:
+        """Drop nodes at the front of the order not heard for max_age."""
+        cutoff = now - self._max_age
+        while self._nodes:
+            node, info = next(iter(self._nodes.items()))
+            if info.last_seen >= cutoff:
+                break
+            del self._nodes[node]
+            self.expired += 1
+            if self._on_remove is not None:
+                self._on_remove(node)
+
+    def as_rows(self) -> list[list[Any]]:
+        """Return compact rows of all nodes in least recently heard order."""
+        self.dirty = False
+        return [
+            [node, info.longname, info.shortname, round(info.last_seen), info.gateway]
+            for node, info in self._nodes.items()
+        ]
+
+    def load_rows(self, rows: list[list[Any]], now: float) -> None:
+        """Add saved rows, skipping nodes that expired meanwhile."""
+        for node, longname, shortname, last_seen, gateway in rows[-self._max_nodes:]:
+            if node not in self._nodes:
+                self._nodes[node] = NodeInfo(longname, shortname, last_seen, gateway)
+        self._expire(now)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return index state for diagnostics."""
+        return {
+            "nodes": len(self._nodes),
+            "max_nodes": self._max_nodes,
+            "named": sum(1 for info in self._nodes.values() if info.name),
+            "evicted": self.evicted,
+            "expired": self.expired,
+        }
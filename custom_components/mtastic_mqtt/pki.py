@@ -0,0 +1,159 @@
+"""Decryption of Meshtastic public key (PKI) direct messages."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric.x25519 import (
+    X25519PrivateKey,
+    X25519PublicKey,
+)
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+
+from .constants import BROADCAST_NUM
+from .protobuf import mesh_pb2
+
+import base64
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Encrypted payloads end with an 8 byte CCM tag and a 4 byte extra nonce
+PKI_TAG_SIZE = 8
+PKI_OVERHEAD = PKI_TAG_SIZE + 4
+PKI_KEY_SIZE = 32
+
+
+def decode_key(key_b64: str) -> bytes:
+    """Decode a Base64 X25519 key as shown in the Meshtastic apps."""
+    key = base64.b64decode(key_b64.replace("_", "/").replace("-", "+").encode("ascii"))
+    if len(key) != PKI_KEY_SIZE:
+        raise ValueError(f"Invalid key length: {len(key)}, expected {PKI_KEY_SIZE} bytes")
+    return key
+
+
+def pki_nonce(packet_id: int, from_node: int, extra_nonce: int) -> bytes:
+    """Return the 13 byte CCM nonce of a PKI packet.
+
+    Packet ID (8 bytes) and source node (4 bytes), little endian, with the
+    extra nonce written over the upper half of the packet ID.
+    """
+    nonce = bytearray(packet_id.to_bytes(8, "little") + from_node.to_bytes(4, "little") + b"\0")
+    if extra_nonce:
+        nonce[4:8] = extra_nonce.to_bytes(4, "little")
+    return bytes(nonce)
+
+
+def shared_key(private_key: X25519PrivateKey, public_key: bytes) -> bytes:
+    """Return the AES-256 key of a node pair: SHA-256 of the X25519 secret."""
+    secret = private_key.exchange(X25519PublicKey.from_public_bytes(public_key))
+    digest = hashes.Hash(hashes.SHA256())
+    digest.update(secret)
+    return digest.finalize()
+
+
+class PkiKeyring:
+    """Keys for decrypting direct messages to configured nodes.
+
+    Private keys of configured nodes are added by their coordinators and
+    public keys are learned from node info of every heard node. The key
+    agreement is the expensive part of a decryption, so shared keys are
+    cached per (node, peer) pair in a bounded LRU and only derived again
+    after eviction or when the peer's public key changes.
+    """
+
+    def __init__(self, max_public_keys: int, max_shared_keys: int) -> None:
+        """Initialize without keys."""
+        self._max_public_keys = max_public_keys
+        self._max_shared_keys = max_shared_keys
+        self._private_keys: dict[int, X25519PrivateKey] = {}
+        self._public_keys: OrderedDict[int, bytes] = OrderedDict()
+        self._shared_keys: OrderedDict[tuple[int, int], tuple[bytes, AESCCM]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.decrypted = 0
+        self.failures = 0
+
+    def set_private_key(self, node: int, key: bytes | None) -> None:
+        """Set or remove the private key of a configured node."""
+        self._private_keys.pop(node, None)
+        for pair in [pair for pair in self._shared_keys if pair[0] == node]:
+            del self._shared_keys[pair]
+        if key is not None:
+            self._private_keys[node] = X25519PrivateKey.from_private_bytes(key)
+
+    def learn_public_key(self, node: int, key: bytes) -> None:
+        """Remember the public key of a node."""
+        if len(key) != PKI_KEY_SIZE:
+            return
+        self._public_keys[node] = key
+        self._public_keys.move_to_end(node)
+        if len(self._public_keys) > self._max_public_keys:
+            self._public_keys.popitem(last=False)
+
+    def _cipher(self, node: int, peer: int) -> AESCCM | None:
+        """Return the cipher of a node pair, deriving the shared key on a miss."""
+        if (public_key := self._public_keys.get(peer)) is None:
+            return None
+        pair = (node, peer)
+        if (cached := self._shared_keys.get(pair)) is not None and cached[0] == public_key:
+            self.hits += 1
+            self._shared_keys.move_to_end(pair)
+            return cached[1]
+        self.misses += 1
+        cipher = AESCCM(shared_key(self._private_keys[node], public_key), PKI_TAG_SIZE)
+        self._shared_keys[pair] = (public_key, cipher)
+        self._shared_keys.move_to_end(pair)
+        if len(self._shared_keys) > self._max_shared_keys:
+            self._shared_keys.popitem(last=False)
+        return cipher
+
+    def try_decrypt(self, packet: mesh_pb2.MeshPacket) -> bool:
+        """Decrypt a direct message to a configured node in place.
+
+        Returns False if the packet isn't a PKI packet to a configured node,
+        the sender's public key is unknown or authentication fails.
+        """
+        encrypted = packet.encrypted
+        if (
+            packet.channel != 0
+            or packet.to == BROADCAST_NUM
+            or packet.to not in self._private_keys
+            or len(encrypted) <= PKI_OVERHEAD
+        ):
+            return False
+        from_node = getattr(packet, "from")
+        if (cipher := self._cipher(packet.to, from_node)) is None:
+            _LOGGER.debug("No public key of !%08x to decrypt its direct message", from_node)
+            return False
+        extra_nonce = int.from_bytes(encrypted[-4:], "little")
+        try:
+            plain = cipher.decrypt(
+                pki_nonce(packet.id, from_node, extra_nonce), encrypted[:-4], None
+            )
+        except InvalidTag:
+            self.failures += 1
+            _LOGGER.debug("Direct message from !%08x failed authentication", from_node)
+            return False
+        data = mesh_pb2.Data()
+        data.ParseFromString(plain)
+        packet.decoded.CopyFrom(data)
+        packet.pki_encrypted = True
+        self.decrypted += 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return keyring state for diagnostics."""
+        return {
+            "private_keys": len(self._private_keys),
+            "public_keys": len(self._public_keys),
+            "max_public_keys": self._max_public_keys,
+            "shared_keys": len(self._shared_keys),
+            "max_shared_keys": self._max_shared_keys,
+            "hits": self.hits,
+            "misses": self.misses,
+            "decrypted": self.decrypted,
+            "failures": self.failures,
+        }
@@ -0,0 +1,91 @@
+"""On-demand profiling of the integration's ingest callbacks."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+import logging
+
+if TYPE_CHECKING:
+    import cProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IngestProfiler:
+    """cProfile collector enabled only while integration callbacks run.
+
+    Callbacks wrap their work in enter()/leave(); the profiler is enabled
+    while at least one callback is running, so the rest of the event loop
+    is not attributed to the integration (except for other tasks running
+    while a callback awaits).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an inactive profiler."""
+        self._profile: cProfile.Profile | None = None
+        self._depth = 0
+        self._cancel: Callable[[], None] | None = None
+        self.path: str | None = None
+        # Whether a profile is being collected, checked before the hooks
+        self.active = False
+
+    def start(self, path: str, cancel: Callable[[], None] | None = None) -> None:
+        """Start collecting a profile to be written to path."""
+        if self._profile is not None:
+            raise RuntimeError("Profiler is already running")
+        # Imported on demand, profiling is rare
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._cancel = cancel
+        self.path = path
+        self.active = True
+
+    def enter(self) -> None:
+        """Mark the start of an integration callback."""
+        if self._profile is not None:
+            if not self._depth:
+                try:
+                    self._profile.enable()
+                except ValueError as err:
+                    # Another profiler, e.g. of the profiler integration, is active
+                    _LOGGER.warning("Discarding profile %s: %s", self.path, err)
+                    self.stop()
+                    return
+            self._depth += 1
+
+    def leave(self) -> None:
+        """Mark the end of an integration callback."""
+        if self._profile is not None and self._depth:
+            self._depth -= 1
+            if not self._depth:
+                self._profile.disable()
+
+    def stop(self) -> tuple[cProfile.Profile, str] | None:
+        """Stop collecting and return the profile and its target path."""
+        if (profile := self._profile) is None:
+            return None
+        profile.disable()
+        if self._cancel is not None:
+            self._cancel()
+        path = self.path
+        self._profile = None
+        self.active = False
+        self._cancel = None
+        self._depth = 0
+        return profile, path
+
+
+def write_profile(profile: cProfile.Profile, path: str) -> None:
+    """Write a profile and a text summary next to it (blocking)."""
+    import io
+    import pstats
+
+    profile.dump_stats(path)
+    output = io.StringIO()
+    stats = pstats.Stats(profile, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+    with open(f"{path}.txt", "w", encoding="utf-8") as file:
+        file.write(output.getvalue())
+    _LOGGER.info("Wrote profile to %s", path)
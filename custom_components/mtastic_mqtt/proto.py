@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from typing import Any, Callable, Tuple
-from .protobuf import mesh_pb2, mqtt_pb2, portnums_pb2, telemetry_pb2
+from .protobuf import config_pb2, mesh_pb2, mqtt_pb2, portnums_pb2, telemetry_pb2
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
+from google.protobuf import __version__ as protobuf_version
+from google.protobuf.internal import api_implementation
 
 import base64
 import logging
@@ -14,6 +16,25 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_ENC_KEY = "1PG7OiApB1nwvP+rz05pAQ=="
 
+_SNR_UNKNOWN = -128
+
+# Backend of the protobuf runtime: upb, cpp or python (pure Python, much slower)
+PROTOBUF_BACKEND = api_implementation.Type()
+PROTOBUF_BACKEND_PYTHON = "python"
+
+
+def protobuf_info() -> dict[str, str]:
+    """Return version and backend of the protobuf runtime."""
+    return {"version": protobuf_version, "backend": PROTOBUF_BACKEND}
+
+
+def _enum_name(enum: Any, value: int) -> str:
+    """Return the name of an enum value, or the number if it is unknown."""
+    try:
+        return enum.Name(value)
+    except ValueError:
+        return str(value)
+
 
 def _as_position(obj: mesh_pb2.Position, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str, dict[str, Any]]:
     """Convert Position protobuf to dict."""
@@ -70,11 +91,16 @@ def _as_telemetry(obj: telemetry_pb2.Telemetry, envelope: mqtt_pb2.ServiceEnvelo
 
 def _as_node_info(obj: mesh_pb2.User, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str, dict[str, Any]]:
     """Convert User (node info) protobuf to dict."""
-    return ("nodeinfo", {
+    payload: dict[str, Any] = {
         "id": obj.id,
         "shortname": obj.short_name,
         "longname": obj.long_name,
-    })
+    }
+    if obj.hw_model:
+        payload["hw_model"] = _enum_name(mesh_pb2.HardwareModel, obj.hw_model)
+    if obj.public_key:
+        payload["public_key"] = base64.b64encode(obj.public_key).decode("ascii")
+    return ("nodeinfo", payload)
 
 
 def _as_neighbor_info(obj: mesh_pb2.NeighborInfo, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str, dict[str, Any]]:
@@ -94,12 +120,63 @@ def _as_text_message(obj: str, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str,
     })
 
 
+def _route_snr(values: Any) -> list[float | None]:
+    """Convert RouteDiscovery SNR values (dB * 4, INT8_MIN if unknown)."""
+    return [None if value == _SNR_UNKNOWN else value / 4 for value in values]
+
+
+def _as_traceroute(obj: mesh_pb2.RouteDiscovery, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str | None, dict[str, Any]]:
+    """Convert RouteDiscovery (traceroute reply) protobuf to dict."""
+    if not envelope.packet.decoded.request_id:
+        # Requests in flight only carry a partial route
+        return (None, {})
+    return ("traceroute", {
+        "route": list(obj.route),
+        "snr_towards": _route_snr(obj.snr_towards),
+        "route_back": list(obj.route_back),
+        "snr_back": _route_snr(obj.snr_back),
+        "rx_time": envelope.packet.rx_time,
+    })
+
+
+def _as_routing(obj: mesh_pb2.Routing, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str | None, dict[str, Any]]:
+    """Convert Routing (ACK/NAK) protobuf to dict."""
+    if obj.WhichOneof("variant") != "error_reason":
+        return (None, {})
+    return ("routing", {
+        "error": mesh_pb2.Routing.Error.Name(obj.error_reason),
+        "request_id": envelope.packet.decoded.request_id,
+    })
+
+
+def _as_map_report(obj: mqtt_pb2.MapReport, envelope: mqtt_pb2.ServiceEnvelope) -> Tuple[str, dict[str, Any]]:
+    """Convert MapReport protobuf to dict."""
+    return ("mapreport", {
+        "longname": obj.long_name,
+        "shortname": obj.short_name,
+        "role": _enum_name(config_pb2.Config.DeviceConfig.Role, obj.role),
+        "hw_model": _enum_name(mesh_pb2.HardwareModel, obj.hw_model),
+        "firmware_version": obj.firmware_version,
+        "region": _enum_name(config_pb2.Config.LoRaConfig.RegionCode, obj.region),
+        "modem_preset": _enum_name(config_pb2.Config.LoRaConfig.ModemPreset, obj.modem_preset),
+        "has_default_channel": obj.has_default_channel,
+        "latitude_i": obj.latitude_i,
+        "longitude_i": obj.longitude_i,
+        "altitude": obj.altitude,
+        "position_precision": obj.position_precision,
+        "num_online_local_nodes": obj.num_online_local_nodes,
+    })
+
+
 _converters: dict[int, Tuple[type | None, Callable[[Any, mqtt_pb2.ServiceEnvelope], Tuple[str | None, dict[str, Any]]]]] = {
     portnums_pb2.POSITION_APP: (mesh_pb2.Position, _as_position),
     portnums_pb2.TELEMETRY_APP: (telemetry_pb2.Telemetry, _as_telemetry),
     portnums_pb2.NODEINFO_APP: (mesh_pb2.User, _as_node_info),
     portnums_pb2.NEIGHBORINFO_APP: (mesh_pb2.NeighborInfo, _as_neighbor_info),
     portnums_pb2.TEXT_MESSAGE_APP: (None, _as_text_message),
+    portnums_pb2.TRACEROUTE_APP: (mesh_pb2.RouteDiscovery, _as_traceroute),
+    portnums_pb2.ROUTING_APP: (mesh_pb2.Routing, _as_routing),
+    portnums_pb2.MAP_REPORT_APP: (mqtt_pb2.MapReport, _as_map_report),
 }
 
 
@@ -107,7 +184,13 @@ def convert_envelope_to_json(envelope: mqtt_pb2.ServiceEnvelope) -> dict[str, An
     """Convert ServiceEnvelope protobuf to JSON-serializable dict."""
     result: dict[str, Any] = {
         "from": getattr(envelope.packet, "from"),
+        "to": envelope.packet.to,
+        "id": envelope.packet.id,
         "sender": envelope.gateway_id,
+        "rx_snr": envelope.packet.rx_snr,
+        "rx_rssi": envelope.packet.rx_rssi,
+        "hop_start": envelope.packet.hop_start,
+        "hop_limit": envelope.packet.hop_limit,
     }
     
     if not envelope.packet.HasField("decoded"):
@@ -144,37 +227,31 @@ def convert_envelope_to_json(envelope: mqtt_pb2.ServiceEnvelope) -> dict[str, An
     return result
 
 
+def channel_key(key_b64: str) -> bytes:
+    """Return AES key bytes of a Base64 channel key, expanding the default key."""
+    # Normalize base64 key format
+    key_b64_normalized = key_b64.replace("_", "/").replace("-", "+").encode("ascii")
+    key_bytes = base64.b64decode(key_b64_normalized)
+
+    # Check for default key indicator
+    if len(key_bytes) == 1 and key_bytes[0] == 0x01:
+        key_bytes = base64.b64decode(DEFAULT_ENC_KEY.encode("ascii"))
+
+    if len(key_bytes) != 16:
+        raise ValueError(f"Invalid key length: {len(key_bytes)}, expected 16 bytes")
+    return key_bytes
+
+
+def _packet_cipher(packet: mesh_pb2.MeshPacket, key_bytes: bytes) -> Cipher:
+    """Return the AES-CTR cipher of a packet, keyed by packet ID and source node."""
+    nonce = packet.id.to_bytes(8, "little") + getattr(packet, "from").to_bytes(8, "little")
+    return Cipher(algorithms.AES(key_bytes), modes.CTR(nonce), backend=default_backend())
+
+
 def try_encrypt_envelope(envelope: mqtt_pb2.ServiceEnvelope, key_b64: str) -> None:
     """Decrypt encrypted envelope packet."""
     try:
-        # Normalize base64 key format
-        key_b64_normalized = key_b64.replace("_", "/").replace("-", "+").encode("ascii")
-        key_bytes = base64.b64decode(key_b64_normalized)
-        
-        # Check for default key indicator
-        if len(key_bytes) == 1 and key_bytes[0] == 0x01:
-            key_bytes = base64.b64decode(DEFAULT_ENC_KEY.encode("ascii"))
-        
-        if len(key_bytes) != 16:
-            raise ValueError(f"Invalid key length: {len(key_bytes)}, expected 16 bytes")
-        
-        # Build nonce from packet ID and source node ID
-        packet_id = getattr(envelope.packet, "id")
-        from_node = getattr(envelope.packet, "from")
-        nonce_packet_id = packet_id.to_bytes(8, "little")
-        nonce_from_node = from_node.to_bytes(8, "little")
-        nonce = nonce_packet_id + nonce_from_node
-        
-        if len(nonce) != 16:
-            raise ValueError(f"Invalid nonce length: {len(nonce)}, expected 16 bytes")
-        
-        # Decrypt
-        cipher = Cipher(
-            algorithms.AES(key_bytes),
-            modes.CTR(nonce),
-            backend=default_backend(),
-        )
-        decryptor = cipher.decryptor()
+        decryptor = _packet_cipher(envelope.packet, channel_key(key_b64)).decryptor()
         encrypted_data = getattr(envelope.packet, "encrypted")
         decrypted_bytes = decryptor.update(encrypted_data) + decryptor.finalize()
         
@@ -188,3 +265,17 @@ def try_encrypt_envelope(envelope: mqtt_pb2.ServiceEnvelope, key_b64: str) -> No
     except Exception as err:
         _LOGGER.error("Failed to decrypt envelope: %s", err)
         raise
+
+
+def encrypt_packet(packet: mesh_pb2.MeshPacket, data: mesh_pb2.Data, key_bytes: bytes) -> None:
+    """Encrypt a Data message into a packet with ID and source already set."""
+    encryptor = _packet_cipher(packet, key_bytes).encryptor()
+    packet.encrypted = encryptor.update(data.SerializeToString()) + encryptor.finalize()
+
+
+def channel_hash(name: str, key_bytes: bytes) -> int:
+    """Return the channel hash sent in packets: XOR of name and key bytes."""
+    result = 0
+    for byte in name.encode("utf-8") + key_bytes:
+        result ^= byte
+    return result
@@ -0,0 +1,100 @@
+"""Per-node reception statistics aggregated across gateways."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+# Maximum number of distinct gateways tracked per node before resetting
+_MAX_GATEWAYS = 64
+_NO_HOPS = -1
+
+
+class ReceptionStats:
+    """Fixed-size ring of recently heard packets from one node.
+
+    Every copy of a packet uplinked by another gateway is folded into the
+    slot of the first copy, keeping the best SNR/RSSI, the fewest hops used
+    and the set of gateways as a bitmask.
+    """
+
+    __slots__ = (
+        "_ids", "_first", "_snr", "_rssi", "_hops", "_masks", "_pos",
+        "_window", "_gateways",
+    )
+
+    def __init__(self, size: int, window: float) -> None:
+        """Initialize an empty ring of size slots."""
+        self._ids = array("I", bytes(4 * size))
+        self._first = array("d", bytes(8 * size))
+        self._snr = array("f", bytes(4 * size))
+        self._rssi = array("i", bytes(4 * size))
+        self._hops = array("b", bytes(size))
+        self._masks = [0] * size
+        self._pos = -1
+        self._window = window
+        self._gateways: dict[str, int] = {}
+
+    def _gateway_bit(self, gateway: str) -> int:
+        if (index := self._gateways.get(gateway)) is None:
+            if len(self._gateways) >= _MAX_GATEWAYS:
+                self._gateways.clear()
+                self._masks = [0] * len(self._masks)
+            index = self._gateways[gateway] = len(self._gateways)
+        return 1 << index
+
+    def fold(self, packet_id: int, gateway: str, snr: float, rssi: int, hops: int, now: float) -> bool:
+        """Fold a copy into the slot of a recent packet with the same ID.
+
+        Returns False if the packet was not heard within the window.
+        """
+        try:
+            slot = self._ids.index(packet_id)
+        except ValueError:
+            return False
+        if self._pos < 0 or now - self._first[slot] > self._window:
+            return False
+        if snr > self._snr[slot]:
+            self._snr[slot] = snr
+        if rssi and (not self._rssi[slot] or rssi > self._rssi[slot]):
+            self._rssi[slot] = rssi
+        if hops != _NO_HOPS and (self._hops[slot] == _NO_HOPS or hops < self._hops[slot]):
+            self._hops[slot] = hops
+        # Resolved first, a reset at the gateway limit replaces the masks
+        bit = self._gateway_bit(gateway)
+        self._masks[slot] |= bit
+        return True
+
+    def add(self, packet_id: int, gateway: str, snr: float, rssi: int, hops: int, now: float) -> None:
+        """Record the first copy of a packet, overwriting the oldest slot."""
+        slot = self._pos = (self._pos + 1) % len(self._ids)
+        self._ids[slot] = packet_id
+        self._first[slot] = now
+        self._snr[slot] = snr
+        self._rssi[slot] = rssi
+        self._hops[slot] = hops
+        self._masks[slot] = self._gateway_bit(gateway)
+
+    def summary(self, now: float) -> dict[str, Any] | None:
+        """Return the aggregate of the latest packet whose window has closed.
+
+        Falls back to the newest packet if none has closed yet.
+        """
+        if self._pos < 0:
+            return None
+        size = len(self._ids)
+        slot = self._pos
+        for step in range(size):
+            candidate = (self._pos - step) % size
+            if not self._first[candidate]:
+                break
+            if now - self._first[candidate] > self._window:
+                slot = candidate
+                break
+        hops = self._hops[slot]
+        return {
+            "snr": self._snr[slot],
+            "rssi": self._rssi[slot] or None,
+            "hops": None if hops == _NO_HOPS else hops,
+            "gateways": self._masks[slot].bit_count(),
+            "time": self._first[slot],
+        }
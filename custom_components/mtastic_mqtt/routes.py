@@ -0,0 +1,73 @@
+"""Bounded cache of observed mesh routes."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Sequence
+
+
+class RouteCache:
+    """LRU cache of routes keyed by (from, to) node numbers.
+
+    Routes come from traceroute replies; routing ACK/NAK packets attach the
+    latest delivery result to the same key.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache holding at most max_size routes."""
+        self._max_size = max_size
+        self._routes: OrderedDict[tuple[int, int], dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return number of cached routes."""
+        return len(self._routes)
+
+    def _entry(self, src: int, dst: int) -> dict[str, Any]:
+        key = (src, dst)
+        if (entry := self._routes.get(key)) is not None:
+            self._routes.move_to_end(key)
+            return entry
+        entry = {"hops": [], "snr": [], "updated": None}
+        self._routes[key] = entry
+        if len(self._routes) > self._max_size:
+            self._routes.popitem(last=False)
+        return entry
+
+    def put_route(
+        self,
+        src: int,
+        dst: int,
+        route: Sequence[int],
+        snr: Sequence[float | None],
+        now: float,
+    ) -> None:
+        """Store a route from src to dst through the given intermediate nodes."""
+        entry = self._entry(src, dst)
+        entry["hops"] = [src, *route, dst]
+        entry["snr"] = list(snr)
+        entry["updated"] = now
+
+    def put_result(self, src: int, dst: int, error: str, now: float) -> None:
+        """Store the delivery result of a packet from src reported by dst."""
+        entry = self._entry(src, dst)
+        entry["result"] = error
+        entry["result_time"] = now
+
+    def get(self, src: int, dst: int) -> dict[str, Any] | None:
+        """Return the cached route from src to dst."""
+        key = (src, dst)
+        if (entry := self._routes.get(key)) is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._routes.move_to_end(key)
+        return entry
+
+    def items(self, node: int | None = None) -> list[tuple[tuple[int, int], dict[str, Any]]]:
+        """Return cached routes, optionally only those starting or ending at node."""
+        return [
+            (key, entry)
+            for key, entry in self._routes.items()
+            if node is None or node in key
+        ]
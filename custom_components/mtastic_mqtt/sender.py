@@ -0,0 +1,337 @@
+"""Outbound text messages paced by a LoRa airtime budget."""
+from __future__ import annotations
+
+from collections import deque
+from functools import partial
+from typing import Any, Callable, NamedTuple
+
+from homeassistant.components.mqtt import client as mqtt_client
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .constants import SEND_MAX_TEXT_BYTES
+from .protobuf import mesh_pb2, mqtt_pb2, portnums_pb2
+from .proto import channel_hash, encrypt_packet
+
+import logging
+import math
+import random
+import re
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Meshtastic radios send a 16 symbol preamble and a 16 byte packet header
+LORA_PREAMBLE = 16
+MESH_HEADER_BYTES = 16
+
+_TOPIC_RE = re.compile(r"^(?P<root>.+?)/2/(?:e|c|json|map)/(?P<channel>[^/]+)")
+
+
+class ModemPreset(NamedTuple):
+    """LoRa modulation of a Meshtastic modem preset."""
+
+    spreading_factor: int
+    bandwidth: float  # Hz
+    coding_rate: int  # denominator of 4/x
+
+
+MODEM_PRESETS: dict[str, ModemPreset] = {
+    "SHORT_TURBO": ModemPreset(7, 500e3, 5),
+    "SHORT_FAST": ModemPreset(7, 250e3, 5),
+    "SHORT_SLOW": ModemPreset(8, 250e3, 5),
+    "MEDIUM_FAST": ModemPreset(9, 250e3, 5),
+    "MEDIUM_SLOW": ModemPreset(10, 250e3, 5),
+    "LONG_FAST": ModemPreset(11, 250e3, 5),
+    "LONG_MODERATE": ModemPreset(11, 125e3, 8),
+    "LONG_SLOW": ModemPreset(12, 125e3, 8),
+    "VERY_LONG_SLOW": ModemPreset(12, 62.5e3, 8),
+}
+
+# Primary channels without a name are named after their preset
+_CHANNEL_PRESETS = {
+    "shortturbo": "SHORT_TURBO",
+    "shortfast": "SHORT_FAST",
+    "shortslow": "SHORT_SLOW",
+    "mediumfast": "MEDIUM_FAST",
+    "mediumslow": "MEDIUM_SLOW",
+    "longfast": "LONG_FAST",
+    "longmod": "LONG_MODERATE",
+    "longmoderate": "LONG_MODERATE",
+    "longslow": "LONG_SLOW",
+    "vlongslow": "VERY_LONG_SLOW",
+}
+
+
+def preset_name(channel: str) -> str:
+    """Return the modem preset of a channel, LONG_FAST for custom names."""
+    return _CHANNEL_PRESETS.get(channel.lower(), "LONG_FAST")
+
+
+def airtime(payload_len: int, preset: ModemPreset, preamble: int = LORA_PREAMBLE) -> float:
+    """Return time on air of a LoRa packet in seconds (Semtech AN1200.13).
+
+    Explicit header and CRC are on; low data rate optimization is used for
+    symbols longer than 16 ms.
+    """
+    sf, bandwidth, coding_rate = preset
+    symbol = (1 << sf) / bandwidth
+    low_rate = 1 if symbol > 0.016 else 0
+    bits = 8 * payload_len - 4 * sf + 28 + 16
+    payload_symbols = 8 + max(math.ceil(bits / (4 * (sf - 2 * low_rate))) * coding_rate, 0)
+    return (preamble + 4.25 + payload_symbols) * symbol
+
+
+def channel_path(pb_topic: str, channel: str | None = None) -> str:
+    """Return the encrypted topic path of a channel below a node's topic.
+
+    Raises ValueError if the topic has no Meshtastic root or channel.
+    """
+    if not (match := _TOPIC_RE.match(pb_topic)):
+        raise ValueError(f"Topic {pb_topic} has no Meshtastic root like msh/EU_868/2/e/")
+    channel = channel or match["channel"]
+    if channel in ("+", "#"):
+        raise ValueError(f"Topic {pb_topic} has no channel name")
+    return f"{match['root']}/2/e/{channel}"
+
+
+class AirtimeBudget:
+    """Token bucket of transmit airtime.
+
+    Airtime is replenished at the duty cycle up to a burst. A packet is sent
+    once the bucket holds its airtime, or is full for packets longer than
+    the burst.
+    """
+
+    __slots__ = ("duty_cycle", "burst", "available", "time")
+
+    def __init__(self, duty_cycle: float, burst: float, now: float) -> None:
+        """Initialize with a full bucket."""
+        self.duty_cycle = duty_cycle
+        self.burst = burst
+        self.available = burst
+        self.time = now
+
+    def level(self, now: float) -> float:
+        """Return airtime available now."""
+        return min(self.burst, self.available + (now - self.time) * self.duty_cycle)
+
+    def _refill(self, now: float) -> None:
+        self.available = self.level(now)
+        self.time = now
+
+    def delay(self, cost: float, now: float) -> float:
+        """Return seconds until a packet of some airtime may be sent."""
+        self._refill(now)
+        missing = min(cost, self.burst) - self.available
+        return missing / self.duty_cycle if missing > 0 else 0.0
+
+    def consume(self, cost: float, now: float) -> None:
+        """Take the airtime of a sent packet."""
+        self._refill(now)
+        self.available -= cost
+
+
+class OutboundText(NamedTuple):
+    """Text message waiting to be sent."""
+
+    text: str
+    to: int
+    sender: int
+    hop_limit: int
+    key: bytes
+
+
+def build_envelope(
+    message: OutboundText, channel: str, packet_id: int
+) -> mqtt_pb2.ServiceEnvelope:
+    """Build an encrypted ServiceEnvelope for a text message."""
+    data = mesh_pb2.Data()
+    data.portnum = portnums_pb2.TEXT_MESSAGE_APP
+    data.payload = message.text.encode("utf-8")
+
+    envelope = mqtt_pb2.ServiceEnvelope()
+    packet = envelope.packet
+    setattr(packet, "from", message.sender)
+    packet.to = message.to
+    packet.id = packet_id
+    packet.channel = channel_hash(channel, message.key)
+    packet.hop_limit = message.hop_limit
+    packet.hop_start = message.hop_limit
+    encrypt_packet(packet, data, message.key)
+    envelope.channel_id = channel
+    envelope.gateway_id = f"!{message.sender:08x}"
+    return envelope
+
+
+class _Batch(NamedTuple):
+    """Encrypted packet of the messages at the head of a channel's queue."""
+
+    count: int
+    to: int
+    topic: str
+    payload: bytes
+    cost: float
+
+
+class _Channel:
+    """Queue and airtime budget of one channel."""
+
+    __slots__ = ("path", "name", "preset", "budget", "queue", "batch", "timer")
+
+    def __init__(self, path: str, budget: AirtimeBudget) -> None:
+        """Initialize an empty queue."""
+        self.path = path
+        self.name = path.rsplit("/", 1)[1]
+        self.preset = preset_name(self.name)
+        self.budget = budget
+        self.queue: deque[OutboundText] = deque()
+        # Kept while waiting for airtime, so packet ID and payload are reused
+        self.batch: _Batch | None = None
+        self.timer: Callable[[], None] | None = None
+
+
+class SendScheduler:
+    """Paces outbound packets per channel to an airtime budget.
+
+    Messages wait in a bounded queue per channel and are published to the
+    downlink topic of their sender as the budget allows. Messages that
+    queued up while the budget was exhausted are merged into one packet per
+    sender and destination when they fit, saving header and preamble
+    airtime.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, duty_cycle: float, burst: float, max_queue: int
+    ) -> None:
+        """Initialize without channels."""
+        self.hass = hass
+        self.duty_cycle = duty_cycle
+        self.burst = burst
+        self.max_queue = max_queue
+        self._channels: dict[str, _Channel] = {}
+        self.messages = 0
+        self.packets = 0
+        self.airtime = 0.0
+        self.failures = 0
+
+    def queue_depth(self, path: str | None = None) -> int:
+        """Return number of queued messages of a channel or all channels."""
+        if path is not None:
+            return len(channel.queue) if (channel := self._channels.get(path)) else 0
+        return sum(len(channel.queue) for channel in self._channels.values())
+
+    @callback
+    def async_enqueue(self, path: str, message: OutboundText) -> float:
+        """Queue a message, return an upper bound of its delay, ignoring merging."""
+        if len(message.text.encode("utf-8")) > SEND_MAX_TEXT_BYTES:
+            raise HomeAssistantError(f"Text is longer than {SEND_MAX_TEXT_BYTES} bytes")
+        now = time.monotonic()
+        if (channel := self._channels.get(path)) is None:
+            budget = AirtimeBudget(self.duty_cycle, self.burst, now)
+            channel = self._channels[path] = _Channel(path, budget)
+        if len(channel.queue) >= self.max_queue:
+            raise HomeAssistantError(f"Send queue of {path} is full")
+        channel.queue.append(message)
+        if channel.timer is None:
+            self._async_drain(channel)
+
+        # Data header of a text message takes 4 bytes
+        preset = MODEM_PRESETS[channel.preset]
+        pending = sum(
+            airtime(MESH_HEADER_BYTES + 4 + len(queued.text.encode("utf-8")), preset)
+            for queued in channel.queue
+        )
+        return max(0.0, pending - channel.budget.level(now)) / self.duty_cycle
+
+    def _merge(self, queue: deque[OutboundText]) -> tuple[OutboundText, int]:
+        """Return the first queued message merged with following ones."""
+        first = queue[0]
+        lines = [first.text]
+        size = len(first.text.encode("utf-8"))
+        count = 1
+        for message in list(queue)[1:]:
+            if message._replace(text="") != first._replace(text=""):
+                break
+            size += 1 + len(message.text.encode("utf-8"))
+            if size > SEND_MAX_TEXT_BYTES:
+                break
+            lines.append(message.text)
+            count += 1
+        return first._replace(text="\n".join(lines)), count
+
+    def _build(self, channel: _Channel, message: OutboundText, count: int) -> _Batch:
+        """Build and encrypt the packet of merged messages."""
+        envelope = build_envelope(message, channel.name, random.getrandbits(32))
+        return _Batch(
+            count,
+            message.to,
+            f"{channel.path}/{envelope.gateway_id}",
+            envelope.SerializeToString(),
+            airtime(
+                MESH_HEADER_BYTES + len(envelope.packet.encrypted),
+                MODEM_PRESETS[channel.preset],
+            ),
+        )
+
+    @callback
+    def _async_drain(self, channel: _Channel) -> None:
+        """Send queued messages while the channel's budget allows."""
+        while channel.queue:
+            message, count = self._merge(channel.queue)
+            # Messages queued while waiting may merge into a new packet
+            if (batch := channel.batch) is None or batch.count != count:
+                batch = channel.batch = self._build(channel, message, count)
+            now = time.monotonic()
+            if delay := channel.budget.delay(batch.cost, now):
+                channel.timer = async_call_later(
+                    self.hass, delay, partial(self._async_resume, channel)
+                )
+                return
+            channel.budget.consume(batch.cost, now)
+            channel.batch = None
+            for _ in range(count):
+                channel.queue.popleft()
+            self.messages += count
+            self.packets += 1
+            self.airtime += batch.cost
+            self.hass.async_create_task(self._async_publish(batch.topic, batch.payload))
+            _LOGGER.debug(
+                "Sending %d message(s) to !%08x on %s, %.3f s airtime",
+                count, batch.to, batch.topic, batch.cost,
+            )
+
+    @callback
+    def _async_resume(self, channel: _Channel, _now: Any) -> None:
+        """Continue sending after waiting for airtime."""
+        channel.timer = None
+        self._async_drain(channel)
+
+    async def _async_publish(self, topic: str, payload: bytes) -> None:
+        """Publish a packet to a downlink topic."""
+        try:
+            await mqtt_client.async_publish(self.hass, topic, payload, 0, False, None)
+        except HomeAssistantError as err:
+            self.failures += 1
+            _LOGGER.warning("Failed to publish packet to %s: %s", topic, err)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return scheduler state for diagnostics."""
+        now = time.monotonic()
+        return {
+            "duty_cycle": self.duty_cycle,
+            "burst_airtime": self.burst,
+            "messages": self.messages,
+            "packets": self.packets,
+            "airtime": round(self.airtime, 3),
+            "failures": self.failures,
+            "channels": {
+                path: {
+                    "preset": channel.preset,
+                    "queued": len(channel.queue),
+                    "available_airtime": round(channel.budget.level(now), 3),
+                }
+                for path, channel in self._channels.items()
+            },
+        }
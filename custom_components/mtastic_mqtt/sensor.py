@@ -4,12 +4,17 @@ from __future__ import annotations
 from typing import Any
 from homeassistant.components import sensor
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt
 
 from .coordinator import BaseEntity, Coordinator
+from .nodes import NodeIndex
 from .constants import DOMAIN
+from .sender import channel_path
+from .stats import STAGES
 
 import logging
 
@@ -32,6 +37,18 @@ async def async_setup_entry(
         TelemetryAirtimeUtilSensor(coordinator),
         TelemetryChannelUtilSensor(coordinator),
         NeighborsSensor(coordinator),
+        MeshComponentSensor(coordinator),
+        RouteHopsSensor(coordinator),
+        ReceptionSnrSensor(coordinator),
+        ReceptionRssiSensor(coordinator),
+        ReceptionGatewaysSensor(coordinator),
+        ReceptionHopsSensor(coordinator),
+        PipelineMessagesSensor(coordinator),
+        PipelineRateSensor(coordinator),
+        PipelineDecryptFailuresSensor(coordinator),
+        PipelineParseErrorsSensor(coordinator),
+        PipelineLatencySensor(coordinator),
+        SendQueueSensor(coordinator),
         TelemetryTemperatureSensor(coordinator),
         TelemetryRelativeHumiditySensor(coordinator),
         TelemetryBarometricPressureSensor(coordinator),
@@ -59,6 +76,39 @@ async def async_setup_entry(
     _LOGGER.debug("Added %d sensor entities", len(entities))
 
 
+def _nodeinfo_attributes(nodeinfo: dict[str, Any]) -> dict[str, Any]:
+    """Return last update attributes of node info."""
+    return {
+        attr: value
+        for attr in ("id", "longname", "shortname")
+        if (value := nodeinfo.get(attr))
+    }
+
+
+def _neighbor_attributes(nodes: NodeIndex, nn: dict[str, Any]) -> dict[str, Any]:
+    """Return neighbors of neighbor info with names of heard nodes."""
+    return {
+        "neighbors": [
+            {
+                "node_id": f"!{n['node_id']:08x}",
+                **({"name": name} if (name := nodes.name(n["node_id"])) else {}),
+                "snr": n["snr"],
+            }
+            for n in nn.get("neighbors", [])
+        ],
+    }
+
+
+def _traceroute_attributes(tr: dict[str, Any]) -> dict[str, Any]:
+    """Return route attributes of a traceroute."""
+    result: dict[str, Any] = {}
+    for attr in ("route", "route_back"):
+        result[attr] = [f"!{node:08x}" for node in tr.get(attr, [])]
+    for attr in ("snr_towards", "snr_back"):
+        result[attr] = tr.get(attr, [])
+    return result
+
+
 class LastUpdateSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for last update timestamp."""
 
@@ -77,17 +127,14 @@ class LastUpdateSensor(BaseEntity, sensor.SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        result: dict[str, Any] = {}
-        if nodeinfo := self.coordinator.data.get("nodeinfo"):
-            for attr in ("id", "longname", "shortname"):
-                if value := nodeinfo.get(attr):
-                    result[attr] = value
-        return result
+        return self._cached_attributes(self.coordinator.data.get("nodeinfo"), _nodeinfo_attributes)
 
 
 class TelemetryBatterySensor(BaseEntity, sensor.SensorEntity):
     """Sensor for battery level."""
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -110,6 +157,8 @@ class TelemetryBatterySensor(BaseEntity, sensor.SensorEntity):
 class TelemetryVoltageSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for voltage."""
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -133,6 +182,8 @@ class TelemetryVoltageSensor(BaseEntity, sensor.SensorEntity):
 class TelemetryAirtimeUtilSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for TX airtime utilization."""
 
+    _write_deadband = 0.1
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -156,6 +207,8 @@ class TelemetryAirtimeUtilSensor(BaseEntity, sensor.SensorEntity):
 class TelemetryChannelUtilSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for channel utilization."""
 
+    _write_deadband = 0.5
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -179,6 +232,8 @@ class TelemetryChannelUtilSensor(BaseEntity, sensor.SensorEntity):
 class NeighborsSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for neighbors count."""
 
+    _unrecorded_attributes = frozenset({"neighbors"})
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -197,10 +252,328 @@ class NeighborsSensor(BaseEntity, sensor.SensorEntity):
                 return int(value)
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes."""
+        # Not cached, names of neighbors may be learned after their report
+        if nn := self.coordinator.data.get("neighborinfo"):
+            return _neighbor_attributes(self.coordinator._platform.nodes, nn)
+        return {}
+
+
+class MeshComponentSensor(BaseEntity, sensor.SensorEntity):
+    """Sensor for size of the mesh component containing the node."""
+
+    # Mesh-wide count, changes with neighbor info of any node
+    _unrecorded_attributes = frozenset({"components"})
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("mesh_component", "Mesh Component Size")
+        self._attr_state_class = sensor.SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 0
+        self._attr_entity_registry_enabled_default = False
+        self._attr_icon = "mdi:graph-outline"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the state of the sensor."""
+        topology = self.coordinator._platform.topology
+        if size := topology.component_size(self.coordinator._id):
+            return size
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes."""
+        topology = self.coordinator._platform.topology
+        return {
+            "degree": topology.degree(self.coordinator._id),
+            "components": topology.component_count,
+        }
+
+
+class RouteHopsSensor(BaseEntity, sensor.SensorEntity):
+    """Sensor for hops of the latest traced route to the node."""
+
+    # Full routes are served by the get_routes service
+    _unrecorded_attributes = frozenset({"route", "route_back", "snr_towards", "snr_back"})
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("route_hops", "Route Hops")
+        self._attr_state_class = sensor.SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 0
+        self._attr_entity_registry_enabled_default = False
+        self._attr_icon = "mdi:routes"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the state of the sensor."""
+        if tr := self.coordinator.data.get("traceroute"):
+            return len(tr.get("route", []))
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes."""
+        return self._cached_attributes(self.coordinator.data.get("traceroute"), _traceroute_attributes)
+
+
+class _PolledSensor(BaseEntity, sensor.SensorEntity):
+    """Base sensor for values that change without updates of this node.
+
+    Besides the node's updates, these sensors are written periodically,
+    throttled by the write policy the same way.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Start writing the value periodically."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._async_poll, sensor.SCAN_INTERVAL)
+        )
+
+    @callback
+    def _async_poll(self, _now: Any) -> None:
+        """Write the current value unless throttled."""
+        self._handle_coordinator_update()
+
+
+class _ReceptionSensor(_PolledSensor):
+    """Base sensor for link quality aggregated across gateways.
+
+    The aggregate shown is of a packet whose window for copies from other
+    gateways has closed, which happens after the packet was dispatched.
+    """
+
+    _summary_key = ""
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._attr_state_class = sensor.SensorStateClass.MEASUREMENT
+        self._attr_entity_registry_enabled_default = False
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        if stats := self.coordinator._platform.reception(self.coordinator._id):
+            if summary := stats.summary(dt.utcnow().timestamp()):
+                return summary[self._summary_key]
+        return None
+
+
+class ReceptionSnrSensor(_ReceptionSensor):
+    """Sensor for best SNR of the latest packet across gateways."""
+
+    _write_deadband = 0.5
+    _summary_key = "snr"
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("rx_snr", "SNR")
+        self._attr_native_unit_of_measurement = "dB"
+        self._attr_suggested_display_precision = 1
+        self._attr_icon = "mdi:signal"
+
+
+class ReceptionRssiSensor(_ReceptionSensor):
+    """Sensor for best RSSI of the latest packet across gateways."""
+
+    _write_deadband = 1.0
+    _summary_key = "rssi"
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("rx_rssi", "RSSI")
+        self._attr_device_class = sensor.SensorDeviceClass.SIGNAL_STRENGTH
+        self._attr_native_unit_of_measurement = "dBm"
+        self._attr_suggested_display_precision = 0
+
+
+class ReceptionGatewaysSensor(_ReceptionSensor):
+    """Sensor for number of gateways that heard the latest packet."""
+
+    _summary_key = "gateways"
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("rx_gateways", "Gateways")
+        self._attr_suggested_display_precision = 0
+        self._attr_icon = "mdi:access-point-network"
+
+
+class ReceptionHopsSensor(_ReceptionSensor):
+    """Sensor for fewest hops the latest packet took to a gateway."""
+
+    _summary_key = "hops"
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("rx_hops", "Hops Used")
+        self._attr_suggested_display_precision = 0
+        self._attr_icon = "mdi:debug-step-over"
+
+
+class _PipelineSensor(_PolledSensor):
+    """Base sensor for ingest pipeline statistics of the entry's subscription.
+
+    Statistics change with every message on the topic, not only with this
+    node's updates.
+    """
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._attr_entity_registry_enabled_default = False
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+
+class PipelineMessagesSensor(_PipelineSensor):
+    """Sensor for number of received messages."""
+
+    _unrecorded_attributes = frozenset({"duplicates", "errors"})
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("pipeline_messages", "Messages")
+        self._attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+        self._attr_icon = "mdi:message-processing-outline"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.stats.messages
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes."""
+        stats = self.coordinator.stats
+        return {
+            "duplicates": stats.duplicates,
+            "errors": stats.errors,
+        }
+
+
+class PipelineRateSensor(_PipelineSensor):
+    """Sensor for rate of received messages."""
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("pipeline_rate", "Message Rate")
+        self._attr_state_class = sensor.SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = "msg/s"
+        self._attr_suggested_display_precision = 2
+        self._attr_icon = "mdi:speedometer"
+
+    @property
+    def native_value(self) -> float:
+        """Return the state of the sensor."""
+        return round(self.coordinator.stats.rate, 3)
+
+
+class PipelineDecryptFailuresSensor(_PipelineSensor):
+    """Sensor for number of packets that failed to decrypt."""
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("pipeline_decrypt_failures", "Decrypt Failures")
+        self._attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+        self._attr_icon = "mdi:lock-alert-outline"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.stats.decrypt_failures
+
+
+class PipelineParseErrorsSensor(_PipelineSensor):
+    """Sensor for number of messages that failed to parse."""
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("pipeline_parse_errors", "Parse Errors")
+        self._attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+        self._attr_icon = "mdi:file-alert-outline"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.stats.parse_errors
+
+
+class PipelineLatencySensor(_PipelineSensor):
+    """Sensor for 95th percentile of message processing time."""
+
+    _unrecorded_attributes = frozenset(f"{stage}_p95_ms" for stage in STAGES)
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("pipeline_latency", "Processing Latency")
+        self._attr_device_class = sensor.SensorDeviceClass.DURATION
+        self._attr_state_class = sensor.SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_suggested_display_precision = 3
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.stats.stages["receive"].percentile(0.95)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes."""
+        stages = {
+            **self.coordinator.stats.stages,
+            "storage_save": self.coordinator._platform.stats.stages["storage_save"],
+        }
+        return {
+            f"{stage}_p95_ms": histogram.percentile(0.95)
+            for stage, histogram in stages.items()
+            if histogram.count
+        }
+
+
+class SendQueueSensor(_PipelineSensor):
+    """Sensor for messages waiting for airtime on the node's channel."""
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.with_name("send_queue", "Send Queue")
+        self._attr_state_class = sensor.SensorStateClass.MEASUREMENT
+        self._attr_icon = "mdi:tray-full"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the state of the sensor."""
+        try:
+            path = channel_path(self.coordinator._config.get("pb_topic", ""))
+        except ValueError:
+            return None
+        return self.coordinator._platform.sender.queue_depth(path)
+
 
 class TelemetryTemperatureSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for temperature."""
 
+    _write_deadband = 0.1
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -229,6 +602,8 @@ class TelemetryTemperatureSensor(BaseEntity, sensor.SensorEntity):
 class TelemetryRelativeHumiditySensor(BaseEntity, sensor.SensorEntity):
     """Sensor for relative humidity."""
 
+    _write_deadband = 0.5
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -251,6 +626,8 @@ class TelemetryRelativeHumiditySensor(BaseEntity, sensor.SensorEntity):
 class TelemetryBarometricPressureSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for barometric pressure."""
 
+    _write_deadband = 0.2
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -273,6 +650,8 @@ class TelemetryBarometricPressureSensor(BaseEntity, sensor.SensorEntity):
 class TelemetryGasResistanceSensor(BaseEntity, sensor.SensorEntity):
     """Sensor for gas resistance (AQI)."""
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator: Coordinator) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
@@ -292,6 +671,8 @@ class TelemetryGasResistanceSensor(BaseEntity, sensor.SensorEntity):
 
 class _TelemetryRadiation(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_radiation", "Radiation")
@@ -311,6 +692,8 @@ class _TelemetryRadiation(BaseEntity, sensor.SensorEntity):
 
 class _TelemetryCh1Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch1_voltage", "Voltage 1")
@@ -331,6 +714,8 @@ class _TelemetryCh1Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh1Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch1_current", "Current 1")
@@ -351,6 +736,8 @@ class _TelemetryCh1Current(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh2Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch2_voltage", "Voltage 2")
@@ -371,6 +758,8 @@ class _TelemetryCh2Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh2Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch2_current", "Current 2")
@@ -391,6 +780,8 @@ class _TelemetryCh2Current(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh3Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch3_voltage", "Voltage 3")
@@ -411,6 +802,8 @@ class _TelemetryCh3Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh3Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch3_current", "Current 3")
@@ -431,6 +824,8 @@ class _TelemetryCh3Current(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh4Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch4_voltage", "Voltage 4")
@@ -451,6 +846,8 @@ class _TelemetryCh4Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh4Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch4_current", "Current 4")
@@ -471,6 +868,8 @@ class _TelemetryCh4Current(BaseEntity, sensor.SensorEntity):
 
 class _TelemetryCh5Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch5_voltage", "Voltage 5")
@@ -491,6 +890,8 @@ class _TelemetryCh5Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh5Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch5_current", "Current 5")
@@ -511,6 +912,8 @@ class _TelemetryCh5Current(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh6Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch6_voltage", "Voltage 6")
@@ -531,6 +934,8 @@ class _TelemetryCh6Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh6Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch6_current", "Current 6")
@@ -551,6 +956,8 @@ class _TelemetryCh6Current(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh7Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch7_voltage", "Voltage 7")
@@ -571,6 +978,8 @@ class _TelemetryCh7Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh7Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch7_current", "Current 7")
@@ -591,6 +1000,8 @@ class _TelemetryCh7Current(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh8Voltage(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 0.02
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch8_voltage", "Voltage 8")
@@ -611,6 +1022,8 @@ class _TelemetryCh8Voltage(BaseEntity, sensor.SensorEntity):
     
 class _TelemetryCh8Current(BaseEntity, sensor.SensorEntity):
 
+    _write_deadband = 1.0
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self.with_name(f"tel_ch8_current", "Current 8")
@@ -0,0 +1,361 @@
+"""Services for the Meshtastic MQTT integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt
+
+from .constants import (
+    BROADCAST_NUM,
+    DOMAIN,
+    SEND_HOP_LIMIT,
+    SERVICE_DUMP_FLIGHT_RECORDER,
+    SERVICE_GET_MESSAGES,
+    SERVICE_GET_ROUTES,
+    SERVICE_GET_TOPOLOGY,
+    SERVICE_GET_TRACK,
+    SERVICE_QUERY_NODES,
+    SERVICE_SEND_TEXT,
+    SERVICE_START_PROFILE,
+    TRACK_TOLERANCE_M,
+)
+from .geo import LAT_LON_SCALE
+from .coordinator import Coordinator, Platform
+from .flight_recorder import write_snapshot
+from .profiler import write_profile
+from .proto import channel_key
+from .sender import OutboundText, channel_path
+
+import voluptuous as vol
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def node_num(value: Any) -> int:
+    """Validate a node ID (!aabbccdd) or node number."""
+    if isinstance(value, int):
+        return value
+    value = cv.string(value).strip()
+    try:
+        if value.startswith("!"):
+            return int(value[1:], 16)
+        return int(value)
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid node ID: {value}") from err
+
+
+def destination(value: Any) -> int:
+    """Validate a destination node ID, ^all for broadcast."""
+    if value == "^all":
+        return BROADCAST_NUM
+    return node_num(value)
+
+
+GET_TRACK_SCHEMA = vol.Schema(
+    {
+        vol.Required("node_id"): node_num,
+        vol.Optional("tolerance", default=TRACK_TOLERANCE_M): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+_BOX_KEYS = ("min_latitude", "max_latitude", "min_longitude", "max_longitude")
+
+
+def _is_radius_query(data: dict[str, Any]) -> bool:
+    """Return whether a query has a full center and radius."""
+    return all(key in data for key in ("latitude", "longitude", "radius"))
+
+
+def _radius_or_box(data: dict[str, Any]) -> dict[str, Any]:
+    """Require either a full radius query or a full box query."""
+    if _is_radius_query(data):
+        return data
+    if all(key in data for key in _BOX_KEYS):
+        return data
+    raise vol.Invalid("Either latitude, longitude and radius or a full bounding box is required")
+
+
+QUERY_NODES_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("latitude"): cv.latitude,
+            vol.Optional("longitude"): cv.longitude,
+            vol.Optional("radius"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("min_latitude"): cv.latitude,
+            vol.Optional("max_latitude"): cv.latitude,
+            vol.Optional("min_longitude"): cv.longitude,
+            vol.Optional("max_longitude"): cv.longitude,
+        }
+    ),
+    _radius_or_box,
+)
+
+GET_TOPOLOGY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("node_id"): node_num,
+        vol.Optional("root"): node_num,
+    }
+)
+
+GET_ROUTES_SCHEMA = vol.Schema(
+    {
+        vol.Optional("node_id"): node_num,
+    }
+)
+
+START_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+SEND_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required("node_id"): node_num,
+        vol.Required("text"): vol.All(cv.string, vol.Length(min=1)),
+        vol.Optional("to", default=BROADCAST_NUM): destination,
+        vol.Optional("sender"): node_num,
+        vol.Optional("channel"): cv.string,
+        vol.Optional("hop_limit", default=SEND_HOP_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=7)
+        ),
+    }
+)
+
+GET_MESSAGES_SCHEMA = vol.Schema(
+    {
+        vol.Optional("channel"): cv.string,
+        vol.Optional("before"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("limit", default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+def _get_coordinator(platform: Platform, node: int) -> Coordinator:
+    """Get the coordinator for a configured node or raise."""
+    if coordinator := platform.get_coordinator(node):
+        return coordinator
+    raise HomeAssistantError(f"Node !{node:08x} is not configured")
+
+
+async def async_setup_services(hass: HomeAssistant, platform: Platform) -> None:
+    """Register integration services."""
+
+    async def _async_get_track(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(platform, call.data["node_id"])
+        track = coordinator.track
+        points = track.as_points(call.data["tolerance"])
+        _LOGGER.debug(
+            "Track for node %s: %d of %d points",
+            coordinator._node_id,
+            len(points),
+            len(track),
+        )
+        return {
+            "node_id": coordinator._node_id,
+            "total_points": len(track),
+            "points": points,
+        }
+
+    async def _async_query_nodes(call: ServiceCall) -> ServiceResponse:
+        index = platform.positions
+        if _is_radius_query(call.data):
+            found = index.query_radius(
+                call.data["latitude"], call.data["longitude"], call.data["radius"]
+            )
+        else:
+            found = [
+                (node, None)
+                for node in index.query_box(*(call.data[key] for key in _BOX_KEYS))
+            ]
+        nodes: list[dict[str, Any]] = []
+        for node, distance in found:
+            lat_i, lon_i = index.get(node)
+            item: dict[str, Any] = {
+                "node_id": f"!{node:08x}",
+                "latitude": lat_i / LAT_LON_SCALE,
+                "longitude": lon_i / LAT_LON_SCALE,
+            }
+            if distance is not None:
+                item["distance"] = round(distance, 1)
+            if coordinator := platform.get_coordinator(node):
+                item["name"] = coordinator._entry.title
+            elif name := platform.nodes.name(node):
+                item["name"] = name
+            nodes.append(item)
+        return {"nodes": nodes}
+
+    async def _async_get_topology(call: ServiceCall) -> ServiceResponse:
+        topology = platform.topology
+        nodes = topology.nodes(call.data.get("node_id"))
+        hops = topology.hops(call.data["root"]) if "root" in call.data else {}
+        return {
+            "components": topology.component_count,
+            "nodes": [
+                {
+                    "node_id": f"!{node:08x}",
+                    **({"name": name} if (name := platform.nodes.name(node)) else {}),
+                    "degree": topology.degree(node),
+                    "component": topology.component(node),
+                    **({"hops": hops[node]} if node in hops else {}),
+                }
+                for node in nodes
+            ],
+            "edges": [
+                {**edge, "from": f"!{edge['from']:08x}", "to": f"!{edge['to']:08x}"}
+                for edge in topology.edges(nodes)
+            ],
+        }
+
+    async def _async_get_routes(call: ServiceCall) -> ServiceResponse:
+        return {
+            "routes": [
+                {
+                    **entry,
+                    "from": f"!{src:08x}",
+                    "to": f"!{dst:08x}",
+                    "hops": [f"!{hop:08x}" for hop in entry["hops"]],
+                }
+                for (src, dst), entry in platform.routes.items(call.data.get("node_id"))
+            ],
+        }
+
+    async def _async_start_profile(call: ServiceCall) -> ServiceResponse:
+        profiler = platform.profiler
+        if profiler.active:
+            raise HomeAssistantError(f"A profile is already running: {profiler.path}")
+        path = hass.config.path(f"{DOMAIN}_profile_{dt.utcnow():%Y%m%d_%H%M%S}.prof")
+
+        async def _async_finish(_now: Any) -> None:
+            if result := profiler.stop():
+                await hass.async_add_executor_job(write_profile, *result)
+
+        duration = call.data["duration"]
+        profiler.start(path, async_call_later(hass, duration, _async_finish))
+        _LOGGER.info("Profiling ingest callbacks for %.0f seconds to %s", duration, path)
+        return {"path": path}
+
+    async def _async_dump_flight_recorder(call: ServiceCall) -> ServiceResponse:
+        if (recorder := platform.flight_recorder) is None:
+            raise HomeAssistantError("The flight recorder is turned off")
+        records = recorder.snapshot()
+        path = hass.config.path(f"{DOMAIN}_flight_{dt.utcnow():%Y%m%d_%H%M%S}.mtcap")
+        try:
+            count = await hass.async_add_executor_job(write_snapshot, records, path)
+        except OSError as err:
+            raise HomeAssistantError(f"Failed to write {path}: {err}") from err
+        _LOGGER.info("Wrote %d raw messages to %s", count, path)
+        return {"path": path, "records": count, "oversized": recorder.oversized}
+
+    async def _async_send_text(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(platform, call.data["node_id"])
+        sender = call.data.get("sender", platform.sender_id)
+        if sender is None:
+            raise HomeAssistantError("A sender node ID is required, set sender or sender_id")
+        try:
+            path = channel_path(coordinator._config.get("pb_topic", ""), call.data.get("channel"))
+            key = channel_key(coordinator._config.get("key") or "AQ==")
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+        message = OutboundText(call.data["text"], call.data["to"], sender, call.data["hop_limit"], key)
+        delay = platform.sender.async_enqueue(path, message)
+        return {
+            "topic": f"{path}/!{sender:08x}",
+            "queued": platform.sender.queue_depth(path),
+            "delay": round(delay, 1),
+        }
+
+    async def _async_get_messages(call: ServiceCall) -> ServiceResponse:
+        limit = call.data["limit"]
+        # One more than a page tells whether older messages remain
+        page = platform.messages.log.page(
+            call.data.get("channel"), call.data.get("before"), limit + 1
+        )
+        messages = [
+            {**message, "name": message["name"] or platform.nodes.name(int(message["from"][1:], 16))}
+            for message in page[:limit]
+        ]
+        return {
+            "messages": messages,
+            "next_before": messages[-1]["seq"] if len(page) > limit else None,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRACK,
+        _async_get_track,
+        schema=GET_TRACK_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_NODES,
+        _async_query_nodes,
+        schema=QUERY_NODES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TOPOLOGY,
+        _async_get_topology,
+        schema=GET_TOPOLOGY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ROUTES,
+        _async_get_routes,
+        schema=GET_ROUTES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILE,
+        _async_start_profile,
+        schema=START_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_FLIGHT_RECORDER,
+        _async_dump_flight_recorder,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_TEXT,
+        _async_send_text,
+        schema=SEND_TEXT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MESSAGES,
+        _async_get_messages,
+        schema=GET_MESSAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,163 @@
+"""Lightweight instrumentation of the ingest pipeline."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+import time
+
+STAGE_RECEIVE = "receive"
+STAGE_PARSE = "parse"
+STAGE_DECRYPT = "decrypt"
+STAGE_CONVERT = "convert"
+STAGE_STATE_UPDATE = "state_update"
+STAGE_STORAGE_SAVE = "storage_save"
+
+STAGES = (
+    STAGE_RECEIVE,
+    STAGE_PARSE,
+    STAGE_DECRYPT,
+    STAGE_CONVERT,
+    STAGE_STATE_UPDATE,
+    STAGE_STORAGE_SAVE,
+)
+
+# Bucket k holds durations below 2**k microseconds (roughly), the last one is open
+_BUCKETS = 24
+# Window of the message rate, in seconds
+_RATE_WINDOW = 60.0
+# Stage latencies are recorded for one in this many messages and updates
+SAMPLE_INTERVAL = 16
+
+
+class LatencyHistogram:
+    """Histogram of durations with power-of-two buckets."""
+
+    __slots__ = ("_buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        """Record a duration in nanoseconds."""
+        index = (duration_ns >> 10).bit_length()
+        self._buckets[index if index < _BUCKETS else _BUCKETS - 1] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add durations recorded by another histogram."""
+        for index, count in enumerate(other._buckets):
+            self._buckets[index] += count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return an upper bound of the given percentile in milliseconds."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            seen += count
+            if seen >= target:
+                if index == _BUCKETS - 1:
+                    return self.max_ns / 1e6
+                return min(self.max_ns, (1 << index) << 10) / 1e6
+        return self.max_ns / 1e6
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 4) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class PipelineStats:
+    """Counters and per-stage latency histograms of the ingest pipeline.
+
+    Counters are exact. Stage latencies are only timed and recorded for a
+    sample of one in SAMPLE_INTERVAL messages and state updates, keeping
+    clock reads off most messages; the message rate is only computed when
+    read. Counters only grow until reset() and restart from zero with Home
+    Assistant, so sensors report them as total increasing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters and histograms."""
+        self.messages = 0
+        self.duplicates = 0
+        self.decrypt_failures = 0
+        self.parse_errors = 0
+        self.errors = 0
+        self.state_writes = 0
+        self.suppressed_writes = 0
+        self._updates = 0
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+        self.reset_time = time.time()
+        self._rate_samples = deque([(time.monotonic(), 0)])
+
+    def count_message(self) -> bool:
+        """Count a received message, return whether to time its stages."""
+        sampled = not self.messages % SAMPLE_INTERVAL
+        self.messages += 1
+        return sampled
+
+    def sample_update(self) -> bool:
+        """Return whether to time the next state update."""
+        self._updates += 1
+        return self._updates % SAMPLE_INTERVAL == 1
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """Record duration of a pipeline stage."""
+        self.stages[stage].record(duration_ns)
+
+    @property
+    def rate(self) -> float:
+        """Return received messages per second over roughly the last minute."""
+        now = time.monotonic()
+        samples = self._rate_samples
+        if now - samples[-1][0] >= 1.0:
+            samples.append((now, self.messages))
+        while len(samples) > 2 and now - samples[1][0] >= _RATE_WINDOW:
+            samples.popleft()
+        first_time, first_count = samples[0]
+        if now - first_time < 1.0:
+            return 0.0
+        return (self.messages - first_count) / (now - first_time)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of all statistics."""
+        return {
+            "messages": self.messages,
+            "rate": round(self.rate, 3),
+            "duplicates": self.duplicates,
+            "decrypt_failures": self.decrypt_failures,
+            "parse_errors": self.parse_errors,
+            "errors": self.errors,
+            "state_writes": self.state_writes,
+            "suppressed_writes": self.suppressed_writes,
+            "reset_time": self.reset_time,
+            "sample_interval": SAMPLE_INTERVAL,
+            "stages": {
+                stage: histogram.as_dict()
+                for stage, histogram in self.stages.items()
+                if histogram.count
+            },
+        }
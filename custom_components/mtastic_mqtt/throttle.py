@@ -0,0 +1,84 @@
+"""Throttling of entity state writes."""
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+from .constants import (
+    CONF_WRITE_DEADBAND,
+    CONF_WRITE_MAX_INTERVAL,
+    CONF_WRITE_MIN_INTERVAL,
+    CONF_WRITE_RELATIVE_DEADBAND,
+    WRITE_MAX_INTERVAL,
+)
+
+# Results of WriteThrottle.check besides a delay in seconds
+WRITE_NOW = 0.0
+SUPPRESS = None
+
+
+class WritePolicy(NamedTuple):
+    """State write policy of an entry's measurement sensors."""
+
+    deadband: bool
+    relative_deadband: float
+    min_interval: float
+    max_interval: float
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> WritePolicy:
+        """Create a policy from entry options."""
+        return cls(
+            bool(options.get(CONF_WRITE_DEADBAND, False)),
+            float(options.get(CONF_WRITE_RELATIVE_DEADBAND, 0)) / 100,
+            float(options.get(CONF_WRITE_MIN_INTERVAL, 0)),
+            float(options.get(CONF_WRITE_MAX_INTERVAL, WRITE_MAX_INTERVAL)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether any write is throttled."""
+        return self.deadband or self.relative_deadband > 0 or self.min_interval > 0
+
+
+class WriteThrottle:
+    """Decides whether a new numeric state of an entity is worth writing.
+
+    A value is significant if it moved more than the sensor's absolute
+    deadband or the relative deadband from the last written value. Writes
+    of significant values are delayed to keep the minimum interval; other
+    changes are deferred until the maximum interval passed.
+    """
+
+    __slots__ = ("value", "time")
+
+    def __init__(self) -> None:
+        """Initialize without a written value."""
+        self.value: float | None = None
+        self.time = 0.0
+
+    def written(self, value: Any, now: float) -> None:
+        """Record a written state."""
+        self.value = value if isinstance(value, (int, float)) else None
+        self.time = now
+
+    def check(
+        self, value: Any, policy: WritePolicy, deadband: float, now: float
+    ) -> float | None:
+        """Return WRITE_NOW, SUPPRESS or the delay of a deferred write."""
+        last = self.value
+        if last is None or not isinstance(value, (int, float)):
+            return WRITE_NOW
+        elapsed = now - self.time
+        if policy.max_interval and elapsed >= policy.max_interval:
+            return WRITE_NOW
+        threshold = max(
+            deadband if policy.deadband else 0.0,
+            policy.relative_deadband * abs(last),
+        )
+        if (abs(value - last) <= threshold) if threshold else (value == last):
+            if value == last or not policy.max_interval:
+                return SUPPRESS
+            return policy.max_interval - elapsed
+        if elapsed < policy.min_interval:
+            return policy.min_interval - elapsed
+        return WRITE_NOW
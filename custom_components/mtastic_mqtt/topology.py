@@ -0,0 +1,187 @@
+"""Mesh topology graph built from neighbor info reports."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Iterable
+
+# Minimum interval between scans for stale reports
+_EXPIRE_INTERVAL = 60.0
+
+
+class MeshTopology:
+    """Incrementally maintained mesh graph.
+
+    Each neighbor info report replaces the edges of its reporting node only.
+    Connected components and hop distances are derived lazily: an update
+    marks the touched nodes dirty and only their components are recomputed
+    on the next query.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        """Initialize an empty graph whose reports expire after max_age seconds."""
+        self._max_age = max_age
+        # reporter -> {neighbor: (snr, last_seen)}
+        self._edges: dict[int, dict[int, tuple[float, float]]] = {}
+        self._reported: dict[int, float] = {}
+        # undirected adjacency with a count of reports backing each link
+        self._adjacent: dict[int, dict[int, int]] = {}
+        self._component: dict[int, int] = {}
+        self._members: dict[int, set[int]] = {}
+        self._next_component = 0
+        self._dirty: set[int] = set()
+        self._hops_root: int | None = None
+        self._hops_component: int | None = None
+        self._hops: dict[int, int] = {}
+        self._last_expire = 0.0
+
+    def __len__(self) -> int:
+        """Return number of nodes in the graph."""
+        return len(self._adjacent)
+
+    @property
+    def edge_count(self) -> int:
+        """Return number of reported (directed) edges."""
+        return sum(len(edges) for edges in self._edges.values())
+
+    def update(self, node: int, neighbors: Iterable[tuple[int, float]], now: float) -> None:
+        """Replace the edges reported by a node."""
+        new = {neighbor: (snr, now) for neighbor, snr in neighbors if neighbor != node}
+        self._replace(node, new)
+        self._reported[node] = now
+        if now - self._last_expire >= _EXPIRE_INTERVAL:
+            self.expire(now)
+
+    def expire(self, now: float) -> int:
+        """Drop reports older than max_age, return number of dropped reporters."""
+        self._last_expire = now
+        stale = [node for node, seen in self._reported.items() if now - seen > self._max_age]
+        for node in stale:
+            self._replace(node, None)
+            del self._reported[node]
+        return len(stale)
+
+    def _replace(self, node: int, new: dict[int, tuple[float, float]] | None) -> None:
+        old = self._edges.pop(node, {})
+        if new is not None:
+            self._edges[node] = new
+            self._adjacent.setdefault(node, {})
+        else:
+            new = {}
+        for neighbor in old.keys() - new.keys():
+            self._unlink(node, neighbor)
+        for neighbor in new.keys() - old.keys():
+            self._link(node, neighbor)
+        self._dirty.add(node)
+        self._dirty.update(old)
+        self._dirty.update(new)
+        if node not in self._edges and not self._adjacent.get(node, True):
+            del self._adjacent[node]
+
+    def _link(self, a: int, b: int) -> None:
+        for x, y in ((a, b), (b, a)):
+            links = self._adjacent.setdefault(x, {})
+            links[y] = links.get(y, 0) + 1
+
+    def _unlink(self, a: int, b: int) -> None:
+        for x, y in ((a, b), (b, a)):
+            links = self._adjacent[x]
+            if links[y] > 1:
+                links[y] -= 1
+            else:
+                del links[y]
+                if not links and x not in self._edges:
+                    del self._adjacent[x]
+
+    def _refresh(self) -> None:
+        """Recompute components of dirty nodes."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        for node in dirty:
+            if (old := self._component.pop(node, None)) is not None:
+                members = self._members[old]
+                members.discard(node)
+                if not members:
+                    del self._members[old]
+        seen: set[int] = set()
+        for start in dirty:
+            if start in seen or start not in self._adjacent:
+                continue
+            component = self._next_component
+            self._next_component += 1
+            members: set[int] = set()
+            queue = deque([start])
+            seen.add(start)
+            while queue:
+                current = queue.popleft()
+                members.add(current)
+                if (old := self._component.get(current)) is not None:
+                    old_members = self._members[old]
+                    old_members.discard(current)
+                    if not old_members:
+                        del self._members[old]
+                self._component[current] = component
+                for neighbor in self._adjacent[current]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+            self._members[component] = members
+
+    def degree(self, node: int) -> int:
+        """Return number of distinct nodes linked to a node."""
+        return len(self._adjacent.get(node, ()))
+
+    def component(self, node: int) -> int | None:
+        """Return component ID of a node."""
+        self._refresh()
+        return self._component.get(node)
+
+    def component_size(self, node: int) -> int:
+        """Return size of the component containing a node."""
+        self._refresh()
+        if (component := self._component.get(node)) is None:
+            return 0
+        return len(self._members[component])
+
+    @property
+    def component_count(self) -> int:
+        """Return number of connected components."""
+        self._refresh()
+        return len(self._members)
+
+    def hops(self, root: int) -> dict[int, int]:
+        """Return hop distance from root to every node of its component."""
+        self._refresh()
+        component = self._component.get(root)
+        if component is None:
+            return {}
+        if root != self._hops_root or component != self._hops_component:
+            hops = {root: 0}
+            queue = deque([root])
+            while queue:
+                current = queue.popleft()
+                for neighbor in self._adjacent[current]:
+                    if neighbor not in hops:
+                        hops[neighbor] = hops[current] + 1
+                        queue.append(neighbor)
+            self._hops = hops
+            self._hops_root = root
+            self._hops_component = component
+        return self._hops
+
+    def nodes(self, node: int | None = None) -> list[int]:
+        """Return all nodes, or the nodes of the component containing node."""
+        self._refresh()
+        if node is None:
+            return list(self._adjacent)
+        if (component := self._component.get(node)) is None:
+            return []
+        return list(self._members[component])
+
+    def edges(self, nodes: Iterable[int]) -> list[dict[str, Any]]:
+        """Return edges reported by the given nodes."""
+        return [
+            {"from": reporter, "to": neighbor, "snr": snr, "last_seen": seen}
+            for reporter in nodes
+            for neighbor, (snr, seen) in self._edges.get(reporter, {}).items()
+        ]
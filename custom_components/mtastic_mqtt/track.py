@@ -0,0 +1,53 @@
+"""Compact position track history for Meshtastic nodes."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from .geo import LAT_LON_SCALE, haversine_m, simplify_track
+
+
+class PositionTrack:
+    """Array-backed track of scaled integer positions and timestamps."""
+
+    __slots__ = ("_lats", "_lons", "_times", "_max_points")
+
+    def __init__(self, max_points: int) -> None:
+        """Initialize an empty track."""
+        self._lats = array("i")
+        self._lons = array("i")
+        self._times = array("I")
+        self._max_points = max(2, max_points)
+
+    def __len__(self) -> int:
+        """Return number of stored points."""
+        return len(self._times)
+
+    def distance_to(self, lat_i: int, lon_i: int) -> float | None:
+        """Return distance in meters from the last point, if any."""
+        if not self._times:
+            return None
+        return haversine_m(self._lats[-1], self._lons[-1], lat_i, lon_i)
+
+    def append(self, lat_i: int, lon_i: int, timestamp: float) -> None:
+        """Append a point, dropping the oldest quarter when full."""
+        if len(self._times) >= self._max_points:
+            drop = self._max_points // 4 or 1
+            del self._lats[:drop]
+            del self._lons[:drop]
+            del self._times[:drop]
+        self._lats.append(lat_i)
+        self._lons.append(lon_i)
+        self._times.append(int(timestamp))
+
+    def as_points(self, tolerance_m: float = 0.0) -> list[dict[str, Any]]:
+        """Return the track as a list of points, optionally simplified."""
+        indices = simplify_track(self._lats, self._lons, tolerance_m)
+        return [
+            {
+                "latitude": self._lats[i] / LAT_LON_SCALE,
+                "longitude": self._lons[i] / LAT_LON_SCALE,
+                "time": self._times[i],
+            }
+            for i in indices
+        ]
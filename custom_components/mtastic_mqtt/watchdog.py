@@ -0,0 +1,132 @@
+"""Event loop stall watchdog for the integration's callbacks."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import heapq
+import itertools
+import logging
+import time
+
+from .stats import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .protobuf import mqtt_pb2
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_MQTT = "mqtt"
+KIND_ENTITY = "entity"
+
+
+class CallbackWatchdog:
+    """Tracks how long integration callbacks block the event loop.
+
+    Keeps a histogram per callback kind and the slowest invocations with
+    their metadata. Metadata is only built for invocations slow enough to
+    enter the top list or stall, keeping the common path to one comparison.
+    """
+
+    def __init__(self, threshold_ms: float, top_n: int, warn_interval: float) -> None:
+        """Initialize the watchdog."""
+        self._threshold_ns = int(threshold_ms * 1e6)
+        self._top_n = top_n
+        self._warn_interval = warn_interval
+        self._top: list[tuple[int, int, dict[str, Any]]] = []
+        self._seq = itertools.count()
+        self._last_warning = 0.0
+        self._suppressed = 0
+        self.stalls = 0
+        # Durations up to this neither stall nor enter the top list, -1 until it is full
+        self.floor_ns = -1
+        self.histograms = {KIND_MQTT: LatencyHistogram(), KIND_ENTITY: LatencyHistogram()}
+
+    def _is_top(self, duration_ns: int) -> bool:
+        return len(self._top) < self._top_n or duration_ns > self._top[0][0]
+
+    def _push(self, duration_ns: int, details: dict[str, Any]) -> None:
+        details["duration_ms"] = duration_ns / 1e6
+        details["time"] = time.time()
+        item = (duration_ns, next(self._seq), details)
+        if len(self._top) < self._top_n:
+            heapq.heappush(self._top, item)
+        else:
+            heapq.heapreplace(self._top, item)
+        if len(self._top) >= self._top_n:
+            self.floor_ns = min(self._threshold_ns, self._top[0][0])
+
+    def _stall(self, duration_ns: int, details: dict[str, Any]) -> None:
+        self.stalls += 1
+        now = time.monotonic()
+        if now - self._last_warning < self._warn_interval:
+            self._suppressed += 1
+            return
+        _LOGGER.warning(
+            "Callback blocked the event loop for %.1f ms (threshold %.1f ms): %s; "
+            "%d similar warnings suppressed",
+            duration_ns / 1e6,
+            self._threshold_ns / 1e6,
+            details,
+            self._suppressed,
+        )
+        self._last_warning = now
+        self._suppressed = 0
+
+    def record_message(
+        self,
+        duration_ns: int,
+        topic: str,
+        size: int,
+        envelope: mqtt_pb2.ServiceEnvelope | None,
+        sampled: bool = True,
+    ) -> None:
+        """Record how long an MQTT message callback blocked the event loop.
+
+        Only sampled messages are added to the histogram; callers may skip
+        unsampled messages up to floor_ns.
+        """
+        if sampled:
+            self.histograms[KIND_MQTT].record(duration_ns)
+        if duration_ns <= self.floor_ns:
+            return
+        stalled = duration_ns > self._threshold_ns
+        if not stalled and not self._is_top(duration_ns):
+            return
+        details: dict[str, Any] = {"kind": KIND_MQTT, "topic": topic, "size": size}
+        if envelope is not None:
+            packet = envelope.packet
+            details["node"] = f"!{getattr(packet, 'from'):08x}"
+            if packet.HasField("decoded"):
+                details["port"] = packet.decoded.portnum
+        if self._is_top(duration_ns):
+            self._push(duration_ns, details)
+        if stalled:
+            self._stall(duration_ns, details)
+
+    def record_entity(self, duration_ns: int, entity_id: str | None, sampled: bool = True) -> None:
+        """Record duration of an entity state write, like record_message."""
+        if sampled:
+            self.histograms[KIND_ENTITY].record(duration_ns)
+        if duration_ns <= self.floor_ns:
+            return
+        stalled = duration_ns > self._threshold_ns
+        if not stalled and not self._is_top(duration_ns):
+            return
+        details: dict[str, Any] = {"kind": KIND_ENTITY, "entity_id": entity_id}
+        if self._is_top(duration_ns):
+            self._push(duration_ns, details)
+        if stalled:
+            self._stall(duration_ns, details)
+
+    def slowest(self) -> list[dict[str, Any]]:
+        """Return the slowest invocations, slowest first."""
+        return [dict(details) for _, _, details in sorted(self._top, reverse=True)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the watchdog."""
+        return {
+            "threshold_ms": self._threshold_ns / 1e6,
+            "stalls": self.stalls,
+            "callbacks": {kind: histogram.as_dict() for kind, histogram in self.histograms.items()},
+            "slowest": self.slowest(),
+        }
@@ -0,0 +1,8 @@
+"""Shared setup of the integration's tests."""
+from __future__ import annotations
+
+import os
+import sys
+
+# Import custom_components from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,132 @@
+"""Tests of converting JSON packets to the data of protobuf packets."""
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.mtastic_mqtt.meshjson import (
+    convert_json_packet,
+    is_json_topic,
+    json_channel,
+    parse_json_packet,
+)
+from custom_components.mtastic_mqtt.proto import convert_envelope_to_json
+from custom_components.mtastic_mqtt.protobuf import mesh_pb2, mqtt_pb2, portnums_pb2
+
+import json
+
+import pytest
+
+NODE = 0x11111111
+REQUESTER = 0x22222222
+HOPS = (0x33333333, 0x44444444)
+
+
+def _envelope(portnum: int, payload: bytes, to: int = 0xFFFFFFFF) -> mqtt_pb2.ServiceEnvelope:
+    """Return a decoded protobuf packet with the header of _document."""
+    envelope = mqtt_pb2.ServiceEnvelope()
+    packet = envelope.packet
+    setattr(packet, "from", NODE)
+    packet.to = to
+    packet.id = 1234
+    packet.rx_time = 1700000000
+    packet.rx_snr = 6.25
+    packet.rx_rssi = -97
+    packet.hop_start = 3
+    packet.hop_limit = 2
+    packet.decoded.portnum = portnum
+    packet.decoded.payload = payload
+    envelope.gateway_id = "!aabbccdd"
+    return envelope
+
+
+def _document(type_: str, payload: Any, to: int = 0xFFFFFFFF) -> bytes:
+    """Return a packet like the firmware's JSON output."""
+    return json.dumps({
+        "from": NODE,
+        "to": to,
+        "id": 1234,
+        "channel": 0,
+        "timestamp": 1700000000,
+        "snr": 6.25,
+        "rssi": -97,
+        "hop_start": 3,
+        "hops_away": 1,
+        "sender": "!aabbccdd",
+        "type": type_,
+        "payload": payload,
+    }).encode("utf-8")
+
+
+def _convert(data: bytes) -> dict[str, Any]:
+    return convert_json_packet(*parse_json_packet(data))
+
+
+def test_text_message() -> None:
+    envelope = _envelope(portnums_pb2.TEXT_MESSAGE_APP, "Hello mesh".encode("utf-8"))
+    expected = convert_envelope_to_json(envelope)
+    assert expected["payload"] == {"text": "Hello mesh", "rx_time": 1700000000}
+    assert _convert(_document("text", {"text": "Hello mesh"})) == expected
+    # Older firmware sends the text as the payload
+    assert _convert(_document("text", "Hello mesh")) == expected
+
+
+def test_position() -> None:
+    position = mesh_pb2.Position(
+        latitude_i=515000000, longitude_i=-1000000, altitude=35, sats_in_view=7
+    )
+    envelope = _envelope(portnums_pb2.POSITION_APP, position.SerializeToString())
+    # Unset fields are left out of JSON like they are zero in protobuf
+    document = _document(
+        "position",
+        {"latitude_i": 515000000, "longitude_i": -1000000, "altitude": 35, "sats_in_view": 7},
+    )
+    assert _convert(document) == convert_envelope_to_json(envelope)
+
+
+def test_traceroute() -> None:
+    route = mesh_pb2.RouteDiscovery()
+    route.route.extend(HOPS)
+    route.snr_towards.extend([24, -8, -128])
+    route.route_back.append(HOPS[1])
+    route.snr_back.extend([12, 40])
+    envelope = _envelope(portnums_pb2.TRACEROUTE_APP, route.SerializeToString(), REQUESTER)
+    envelope.packet.decoded.request_id = 99
+    expected = convert_envelope_to_json(envelope)
+    assert expected["payload"]["snr_towards"] == [6.0, -2.0, None]
+
+    # JSON routes list their endpoints, SNR is in dB
+    document = _document("traceroute", {
+        "route": [REQUESTER, *HOPS, NODE],
+        "snr_towards": [6.0, -2.0, -32.0],
+        "route_back": [NODE, HOPS[1], REQUESTER],
+        "snr_back": [3.0, 10.0],
+    }, REQUESTER)
+    assert _convert(document) == expected
+
+
+def test_traceroute_without_snr() -> None:
+    document = _document("traceroute", {
+        "route": [REQUESTER, *HOPS, NODE],
+        "route_back": [NODE, HOPS[1], REQUESTER],
+    }, REQUESTER)
+    payload = _convert(document)["payload"]
+    assert payload["route"] == list(HOPS)
+    assert payload["route_back"] == [HOPS[1]]
+    assert payload["snr_towards"] == payload["snr_back"] == []
+
+
+def test_invalid_packets() -> None:
+    with pytest.raises(ValueError):
+        parse_json_packet(b"{")
+    with pytest.raises(ValueError):
+        parse_json_packet(b"[]")
+    with pytest.raises(ValueError):
+        parse_json_packet(b'{"to": 1}')
+    # Unknown types keep the header only
+    assert "type" not in _convert(_document("unknown", {}))
+
+
+def test_topics() -> None:
+    assert is_json_topic("msh/EU_868/2/json/LongFast/!aabbccdd")
+    assert not is_json_topic("msh/EU_868/2/e/LongFast/!aabbccdd")
+    assert json_channel("msh/EU_868/2/json/LongFast/!aabbccdd") == "LongFast"
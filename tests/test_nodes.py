@@ -0,0 +1,71 @@
+"""Tests of the bounded index of heard nodes."""
+from __future__ import annotations
+
+from custom_components.mtastic_mqtt.nodes import NodeIndex, gateway_num
+
+DAY = 86400.0
+
+
+def test_least_recently_heard_is_evicted() -> None:
+    removed: list[int] = []
+    index = NodeIndex(3, 7 * DAY, removed.append)
+    for node in (1, 2, 3):
+        index.seen(node, None, 1000.0 + node)
+    # Hearing node 1 again makes node 2 the least recently heard
+    index.seen(1, 0xAABBCCDD, 1010.0)
+    index.seen(4, None, 1011.0)
+    assert removed == [2]
+    assert index.get(2) is None
+    assert [row[0] for row in index.as_rows()] == [3, 1, 4]
+    assert index.get(1).gateway == 0xAABBCCDD
+    assert (index.evicted, index.expired) == (1, 0)
+
+
+def test_old_nodes_expire() -> None:
+    removed: list[int] = []
+    index = NodeIndex(10, DAY, removed.append)
+    index.seen(1, None, 1000.0)
+    index.seen(2, None, 2000.0)
+    index.seen(3, None, 1000.0 + DAY + 500)
+    assert removed == [1]
+    assert len(index) == 2
+    assert (index.evicted, index.expired) == (0, 1)
+
+
+def test_names() -> None:
+    index = NodeIndex(10, DAY)
+    # Names of nodes not heard are not kept
+    index.set_names(1, "Long", "L")
+    assert index.get(1) is None
+    index.seen(1, None, 1000.0)
+    assert index.name(1) is None
+    index.set_names(1, "", "L")
+    assert index.name(1) == "L"
+    index.set_names(1, "Long", "")
+    assert index.name(1) == "Long"
+    assert index.get(1).shortname == "L"
+
+
+def test_rows_round_trip() -> None:
+    index = NodeIndex(10, DAY)
+    index.seen(1, 5, 1000.0)
+    index.set_names(1, "Long", "L")
+    index.seen(2, None, 1200.0)
+    rows = index.as_rows()
+    assert not index.dirty
+    assert rows == [[1, "Long", "L", 1000, 5], [2, "", "", 1200, None]]
+
+    # Only the newest rows fit, nodes expired meanwhile are dropped
+    loaded = NodeIndex(1, DAY)
+    loaded.load_rows(rows, 1100.0 + DAY)
+    assert [row[0] for row in loaded.as_rows()] == [2]
+    loaded = NodeIndex(10, DAY)
+    loaded.load_rows(rows, 1100.0 + DAY)
+    assert loaded.as_rows() == rows[1:]
+
+
+def test_gateway_num() -> None:
+    assert gateway_num("!aabbccdd") == 0xAABBCCDD
+    assert gateway_num("aabbccdd") is None
+    assert gateway_num("!xyz") is None
+    assert gateway_num("!zzzzzzzz") is None
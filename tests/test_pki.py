@@ -0,0 +1,130 @@
+"""Tests of decrypting direct messages with the PKI keyring."""
+from __future__ import annotations
+
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from custom_components.mtastic_mqtt.constants import BROADCAST_NUM
+from custom_components.mtastic_mqtt.pki import (
+    PKI_TAG_SIZE,
+    PkiKeyring,
+    decode_key,
+    pki_nonce,
+    shared_key,
+)
+from custom_components.mtastic_mqtt.protobuf import mesh_pb2, portnums_pb2
+
+import base64
+
+import pytest
+
+NODE = 0x11111111
+PEER = 0x22222222
+
+
+def _raw(key: X25519PrivateKey) -> bytes:
+    return key.private_bytes_raw()
+
+
+def _public(key: X25519PrivateKey) -> bytes:
+    return key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+
+
+def _packet(
+    text: str, sender: X25519PrivateKey, receiver: bytes, packet_id: int = 1234, to: int = NODE
+) -> mesh_pb2.MeshPacket:
+    """Return a direct message encrypted like the firmware does."""
+    data = mesh_pb2.Data()
+    data.portnum = portnums_pb2.TEXT_MESSAGE_APP
+    data.payload = text.encode("utf-8")
+    extra_nonce = 0x5A5A5A5A
+    cipher = AESCCM(shared_key(sender, receiver), PKI_TAG_SIZE)
+    packet = mesh_pb2.MeshPacket()
+    setattr(packet, "from", PEER)
+    packet.to = to
+    packet.id = packet_id
+    packet.encrypted = cipher.encrypt(
+        pki_nonce(packet_id, PEER, extra_nonce), data.SerializeToString(), None
+    ) + extra_nonce.to_bytes(4, "little")
+    return packet
+
+
+@pytest.fixture
+def keys() -> tuple[X25519PrivateKey, X25519PrivateKey]:
+    return X25519PrivateKey.generate(), X25519PrivateKey.generate()
+
+
+@pytest.fixture
+def keyring(keys: tuple[X25519PrivateKey, X25519PrivateKey]) -> PkiKeyring:
+    node_key, peer_key = keys
+    keyring = PkiKeyring(max_public_keys=10, max_shared_keys=10)
+    keyring.set_private_key(NODE, _raw(node_key))
+    keyring.learn_public_key(PEER, _public(peer_key))
+    return keyring
+
+
+def test_round_trip(keys, keyring: PkiKeyring) -> None:
+    node_key, peer_key = keys
+    packet = _packet("Secret hello", peer_key, _public(node_key))
+    assert keyring.try_decrypt(packet)
+    assert packet.pki_encrypted
+    assert packet.decoded.portnum == portnums_pb2.TEXT_MESSAGE_APP
+    assert packet.decoded.payload == b"Secret hello"
+    assert keyring.decrypted == 1
+
+
+def test_shared_key_is_cached(keys, keyring: PkiKeyring) -> None:
+    node_key, peer_key = keys
+    for packet_id in (1, 2, 3):
+        assert keyring.try_decrypt(_packet("hi", peer_key, _public(node_key), packet_id))
+    assert (keyring.misses, keyring.hits) == (1, 2)
+
+    # A new public key of the peer derives the shared key again
+    new_peer_key = X25519PrivateKey.generate()
+    keyring.learn_public_key(PEER, _public(new_peer_key))
+    assert keyring.try_decrypt(_packet("hi", new_peer_key, _public(node_key), 4))
+    assert (keyring.misses, keyring.hits) == (2, 2)
+
+
+def test_bad_tag_fails(keys, keyring: PkiKeyring) -> None:
+    node_key, peer_key = keys
+    packet = _packet("hi", peer_key, _public(node_key))
+    encrypted = bytearray(packet.encrypted)
+    # Last byte of the tag, before the extra nonce
+    encrypted[-5] ^= 0x01
+    packet.encrypted = bytes(encrypted)
+    assert not keyring.try_decrypt(packet)
+    assert keyring.failures == 1
+    assert not packet.HasField("decoded")
+
+
+def test_wrong_key_fails(keys, keyring: PkiKeyring) -> None:
+    _node_key, peer_key = keys
+    packet = _packet("hi", peer_key, _public(X25519PrivateKey.generate()))
+    assert not keyring.try_decrypt(packet)
+    assert keyring.failures == 1
+
+
+def test_not_decryptable_packets_are_skipped(keys, keyring: PkiKeyring) -> None:
+    node_key, peer_key = keys
+    assert not keyring.try_decrypt(_packet("hi", peer_key, _public(node_key), to=BROADCAST_NUM))
+    assert not keyring.try_decrypt(_packet("hi", peer_key, _public(node_key), to=0x33333333))
+    channel_packet = _packet("hi", peer_key, _public(node_key))
+    channel_packet.channel = 8
+    assert not keyring.try_decrypt(channel_packet)
+    assert (keyring.misses, keyring.failures) == (0, 0)
+
+    # Unknown public key of the sender
+    keyring = PkiKeyring(max_public_keys=10, max_shared_keys=10)
+    keyring.set_private_key(NODE, _raw(node_key))
+    assert not keyring.try_decrypt(_packet("hi", peer_key, _public(node_key)))
+    assert keyring.misses == 0
+
+
+def test_decode_key() -> None:
+    key = bytes(range(32))
+    assert decode_key(base64.b64encode(key).decode()) == key
+    assert decode_key(base64.urlsafe_b64encode(key).decode()) == key
+    with pytest.raises(ValueError):
+        decode_key(base64.b64encode(b"short").decode())
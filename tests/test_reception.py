@@ -0,0 +1,67 @@
+"""Tests of folding packet copies into reception statistics."""
+from __future__ import annotations
+
+from custom_components.mtastic_mqtt.reception import ReceptionStats
+
+WINDOW = 5.0
+
+
+def test_second_gateway_folds_into_first_slot() -> None:
+    stats = ReceptionStats(4, WINDOW)
+    stats.add(100, "!gw1", 2.0, -110, 3, 1000.0)
+    assert stats.fold(100, "!gw2", 6.5, -90, 1, 1001.0)
+    # A worse copy keeps the best values
+    assert stats.fold(100, "!gw3", -3.0, -120, 4, 1002.0)
+    summary = stats.summary(1010.0)
+    assert summary == {"snr": 6.5, "rssi": -90, "hops": 1, "gateways": 3, "time": 1000.0}
+
+
+def test_fold_needs_recent_packet() -> None:
+    stats = ReceptionStats(4, WINDOW)
+    assert not stats.fold(100, "!gw1", 0.0, -100, 0, 1000.0)
+    stats.add(100, "!gw1", 0.0, -100, 0, 1000.0)
+    assert not stats.fold(101, "!gw2", 0.0, -100, 0, 1001.0)
+    assert not stats.fold(100, "!gw2", 0.0, -100, 0, 1000.0 + WINDOW + 1)
+
+
+def test_same_gateway_counts_once() -> None:
+    stats = ReceptionStats(4, WINDOW)
+    stats.add(100, "!gw1", 0.0, -100, 0, 1000.0)
+    assert stats.fold(100, "!gw1", 1.0, -95, 0, 1001.0)
+    assert stats.summary(1010.0)["gateways"] == 1
+
+
+def test_ring_overwrites_oldest_slot() -> None:
+    stats = ReceptionStats(2, WINDOW)
+    stats.add(100, "!gw1", 1.0, -100, 0, 1000.0)
+    stats.add(101, "!gw1", 2.0, -100, 0, 1001.0)
+    stats.add(102, "!gw1", 3.0, -100, 0, 1002.0)
+    assert not stats.fold(100, "!gw2", 0.0, -100, 0, 1002.5)
+    assert stats.fold(101, "!gw2", 0.0, -100, 0, 1002.5)
+
+
+def test_summary_prefers_closed_window() -> None:
+    stats = ReceptionStats(4, WINDOW)
+    assert stats.summary(1000.0) is None
+    stats.add(100, "!gw1", 1.0, -100, 2, 1000.0)
+    # Newest packet while no window has closed
+    assert stats.summary(1001.0)["snr"] == 1.0
+    stats.add(101, "!gw1", 2.0, 0, -1, 1008.0)
+    summary = stats.summary(1009.0)
+    assert (summary["snr"], summary["time"]) == (1.0, 1000.0)
+    summary = stats.summary(1020.0)
+    # Unknown RSSI and hops
+    assert (summary["snr"], summary["rssi"], summary["hops"]) == (2.0, None, None)
+
+
+def test_gateways_reset_at_limit() -> None:
+    stats = ReceptionStats(4, WINDOW)
+    stats.add(100, "!gw0", 0.0, -100, 0, 1000.0)
+    for index in range(1, 64):
+        assert stats.fold(100, f"!gw{index}", 0.0, -100, 0, 1001.0)
+    assert stats.summary(1010.0)["gateways"] == 64
+    # A 65th gateway clears the bitmasks of all slots
+    assert stats.fold(100, "!gw64", 0.0, -100, 0, 1001.0)
+    assert stats.summary(1010.0)["gateways"] == 1
+    assert stats.fold(100, "!gw0", 0.0, -100, 0, 1001.0)
+    assert stats.summary(1010.0)["gateways"] == 2
@@ -0,0 +1,220 @@
+"""Tests of airtime pacing and the send queue."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.mtastic_mqtt import sender
+from custom_components.mtastic_mqtt.constants import SEND_MAX_TEXT_BYTES
+from custom_components.mtastic_mqtt.protobuf import mqtt_pb2
+from custom_components.mtastic_mqtt.proto import channel_key, try_encrypt_envelope
+from custom_components.mtastic_mqtt.sender import (
+    AirtimeBudget,
+    OutboundText,
+    SendScheduler,
+    channel_path,
+)
+
+import asyncio
+
+import pytest
+
+PATH = "msh/EU_868/2/e/LongFast"
+KEY = "AQ=="
+
+
+class FakeLoop:
+    """Clock, timers and MQTT client standing in for Home Assistant's."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.timers: list[tuple[float, object]] = []
+        self.published: list[tuple[str, bytes]] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def call_later(self, _hass, delay, action):
+        self.timers.append((delay, action))
+        return lambda: None
+
+    async def async_publish(self, _hass, topic, payload, _qos, _retain, _encoding) -> None:
+        self.published.append((topic, payload))
+
+    def fire(self) -> None:
+        """Advance the clock to the next timer and run it."""
+        delay, action = self.timers.pop(0)
+        # Timers run late, never early
+        self.now += delay + 1e-6
+        action(self.now)
+
+    def texts(self) -> list[tuple[int, str]]:
+        """Return destination and text of published packets."""
+        result = []
+        for _topic, payload in self.published:
+            envelope = mqtt_pb2.ServiceEnvelope()
+            envelope.ParseFromString(payload)
+            try_encrypt_envelope(envelope, KEY)
+            result.append((envelope.packet.to, envelope.packet.decoded.payload.decode("utf-8")))
+        return result
+
+
+@pytest.fixture
+def fake(monkeypatch: pytest.MonkeyPatch) -> FakeLoop:
+    fake = FakeLoop()
+    monkeypatch.setattr(sender, "time", SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(sender, "async_call_later", fake.call_later)
+    monkeypatch.setattr(sender, "mqtt_client", SimpleNamespace(async_publish=fake.async_publish))
+    return fake
+
+
+def _text(text: str, to: int = 0xFFFFFFFF) -> OutboundText:
+    return OutboundText(text, to, 0x12345678, 3, channel_key(KEY))
+
+
+def _run(test) -> None:
+    """Run a test coroutine with a Home Assistant instance."""
+
+    async def _async_run() -> None:
+        hass = HomeAssistant("/tmp")
+        try:
+            await test(hass)
+        finally:
+            await hass.async_stop(force=True)
+
+    asyncio.run(_async_run())
+
+
+def test_budget_full_bucket_sends_at_once() -> None:
+    budget = AirtimeBudget(0.01, 5.0, now=0.0)
+    assert budget.delay(1.0, 0.0) == 0.0
+    # Packets longer than the burst wait for a full bucket only
+    assert budget.delay(8.0, 0.0) == 0.0
+
+
+def test_budget_paces_to_duty_cycle() -> None:
+    budget = AirtimeBudget(0.01, 1.0, now=0.0)
+    budget.consume(1.0, 0.0)
+    assert budget.delay(0.5, 0.0) == pytest.approx(50.0)
+    assert budget.delay(0.5, 30.0) == pytest.approx(20.0)
+    assert budget.delay(0.5, 50.0) == 0.0
+
+
+def test_budget_refill_caps_at_burst() -> None:
+    budget = AirtimeBudget(0.01, 1.0, now=0.0)
+    budget.consume(0.2, 0.0)
+    assert budget.level(10_000.0) == 1.0
+    budget.consume(1.0, 10_000.0)
+    assert budget.level(10_000.0) == pytest.approx(0.0)
+
+
+def test_channel_path() -> None:
+    assert channel_path("msh/EU_868/2/e/LongFast/#") == PATH
+    assert channel_path("msh/EU_868/2/e/LongFast/#", "Other") == "msh/EU_868/2/e/Other"
+    with pytest.raises(ValueError):
+        channel_path("foo/bar")
+
+
+def test_queued_messages_merge_per_destination(fake: FakeLoop) -> None:
+    async def _test(hass: HomeAssistant) -> None:
+        scheduler = SendScheduler(hass, 0.01, 0.001, 10)
+        scheduler.async_enqueue(PATH, _text("first"))
+        # Budget is exhausted, the next messages wait and merge
+        long = "x" * 120
+        for text in ("a", "b", long, "c"):
+            scheduler.async_enqueue(PATH, _text(text))
+        scheduler.async_enqueue(PATH, _text("direct", to=0x87654321))
+        assert scheduler.queue_depth(PATH) == 5
+        assert len(fake.timers) == 1
+
+        while fake.timers:
+            fake.fire()
+        await hass.async_block_till_done()
+        # A message to another destination ends the merge
+        assert fake.texts() == [
+            (0xFFFFFFFF, "first"),
+            (0xFFFFFFFF, f"a\nb\n{long}\nc"),
+            (0x87654321, "direct"),
+        ]
+        assert scheduler.messages == 6
+        assert scheduler.packets == 3
+        assert scheduler.queue_depth() == 0
+        assert all(topic == f"{PATH}/!12345678" for topic, _ in fake.published)
+
+    _run(_test)
+
+
+def test_merge_stops_at_text_limit(fake: FakeLoop) -> None:
+    async def _test(hass: HomeAssistant) -> None:
+        scheduler = SendScheduler(hass, 0.01, 0.001, 10)
+        scheduler.async_enqueue(PATH, _text("first"))
+        half = "y" * (SEND_MAX_TEXT_BYTES // 2)
+        scheduler.async_enqueue(PATH, _text(half))
+        scheduler.async_enqueue(PATH, _text(half))
+        while fake.timers:
+            fake.fire()
+        await hass.async_block_till_done()
+        texts = [text for _to, text in fake.texts()]
+        assert texts == ["first", half, half]
+        assert all(len(text.encode("utf-8")) <= SEND_MAX_TEXT_BYTES for text in texts)
+
+    _run(_test)
+
+
+def test_full_queue_is_rejected(fake: FakeLoop) -> None:
+    async def _test(hass: HomeAssistant) -> None:
+        scheduler = SendScheduler(hass, 0.01, 0.001, 2)
+        scheduler.async_enqueue(PATH, _text("sent"))
+        scheduler.async_enqueue(PATH, _text("one"))
+        scheduler.async_enqueue(PATH, _text("two"))
+        with pytest.raises(HomeAssistantError):
+            scheduler.async_enqueue(PATH, _text("three"))
+        assert scheduler.queue_depth(PATH) == 2
+        # Other channels have their own queue
+        scheduler.async_enqueue("msh/EU_868/2/e/Other", _text("other"))
+        await hass.async_block_till_done()
+        assert len(fake.published) == 2
+
+    _run(_test)
+
+
+def test_long_text_is_rejected(fake: FakeLoop) -> None:
+    async def _test(hass: HomeAssistant) -> None:
+        scheduler = SendScheduler(hass, 0.01, 10.0, 2)
+        with pytest.raises(HomeAssistantError):
+            scheduler.async_enqueue(PATH, _text("é" * (SEND_MAX_TEXT_BYTES // 2 + 1)))
+        assert scheduler.queue_depth() == 0
+        assert not fake.published
+
+    _run(_test)
+
+
+def test_waiting_packet_is_built_once(fake: FakeLoop, monkeypatch: pytest.MonkeyPatch) -> None:
+    built = []
+    build_envelope = sender.build_envelope
+
+    def _build_envelope(message, channel, packet_id):
+        built.append(packet_id)
+        return build_envelope(message, channel, packet_id)
+
+    async def _test(hass: HomeAssistant) -> None:
+        monkeypatch.setattr(sender, "build_envelope", _build_envelope)
+        scheduler = SendScheduler(hass, 0.01, 0.001, 10)
+        scheduler.async_enqueue(PATH, _text("first"))
+        scheduler.async_enqueue(PATH, _text("second"))
+        while fake.timers:
+            fake.fire()
+        await hass.async_block_till_done()
+        assert [text for _to, text in fake.texts()] == ["first", "second"]
+        assert len(built) == 2
+        # The waiting packet keeps its ID
+        ids = []
+        for _topic, payload in fake.published:
+            envelope = mqtt_pb2.ServiceEnvelope()
+            envelope.ParseFromString(payload)
+            ids.append(envelope.packet.id)
+        assert ids == built
+
+    _run(_test)
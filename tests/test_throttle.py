@@ -0,0 +1,65 @@
+"""Tests of state write throttling decisions."""
+from __future__ import annotations
+
+from custom_components.mtastic_mqtt.throttle import (
+    SUPPRESS,
+    WRITE_NOW,
+    WritePolicy,
+    WriteThrottle,
+)
+
+import pytest
+
+POLICY = WritePolicy(deadband=True, relative_deadband=0.0, min_interval=60.0, max_interval=3600.0)
+
+
+def _throttle(value: float, now: float = 1000.0) -> WriteThrottle:
+    throttle = WriteThrottle()
+    throttle.written(value, now)
+    return throttle
+
+
+def test_first_and_non_numeric_values_are_written() -> None:
+    assert WriteThrottle().check(3.7, POLICY, 0.1, 1000.0) == WRITE_NOW
+    assert _throttle(3.7).check(None, POLICY, 0.1, 1001.0) == WRITE_NOW
+    # Non-numeric written values leave nothing to compare with
+    assert _throttle("on").check(3.7, POLICY, 0.1, 1001.0) == WRITE_NOW
+
+
+def test_deadband() -> None:
+    throttle = _throttle(3.7)
+    assert throttle.check(3.7, POLICY, 0.1, 2000.0) is SUPPRESS
+    # Changes within the deadband wait for the maximum interval
+    assert throttle.check(3.75, POLICY, 0.1, 2000.0) == pytest.approx(2600.0)
+    assert throttle.check(3.85, POLICY, 0.1, 2000.0) == WRITE_NOW
+    assert throttle.check(3.75, POLICY._replace(deadband=False), 0.1, 2000.0) == WRITE_NOW
+
+
+def test_relative_deadband() -> None:
+    policy = POLICY._replace(deadband=False, relative_deadband=0.05)
+    throttle = _throttle(-100.0)
+    assert throttle.check(-104.0, policy, 1.0, 2000.0) == pytest.approx(2600.0)
+    assert throttle.check(-106.0, policy, 1.0, 2000.0) == WRITE_NOW
+
+
+def test_min_interval() -> None:
+    throttle = _throttle(3.7)
+    assert throttle.check(4.0, POLICY, 0.1, 1020.0) == pytest.approx(40.0)
+    assert throttle.check(4.0, POLICY, 0.1, 1060.0) == WRITE_NOW
+
+
+def test_max_interval() -> None:
+    throttle = _throttle(3.7)
+    assert throttle.check(3.7, POLICY, 0.1, 4599.0) is SUPPRESS
+    # Written after the maximum interval, changed or not
+    assert throttle.check(3.7, POLICY, 0.1, 4600.0) == WRITE_NOW
+    # Without a maximum interval changes within the deadband are dropped
+    policy = POLICY._replace(max_interval=0.0)
+    assert throttle.check(3.75, policy, 0.1, 100_000.0) is SUPPRESS
+
+
+def test_policy_from_options() -> None:
+    assert not WritePolicy.from_options({}).enabled
+    policy = WritePolicy.from_options({"write_relative_deadband": 5, "write_max_interval": 600})
+    assert policy.enabled
+    assert policy == WritePolicy(False, 0.05, 0.0, 600.0)